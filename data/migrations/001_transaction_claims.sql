@@ -0,0 +1,9 @@
+--
+-- Migrasi: klaim transaksi untuk banyak instance admin
+-- Untuk database yang dibuat dari perpustakaan_db.sql versi lama.
+--
+
+ALTER TABLE `transactions`
+  ADD COLUMN `claimed_by` varchar(64) DEFAULT NULL,
+  ADD COLUMN `claim_expires` datetime DEFAULT NULL,
+  ADD KEY `idx_transactions_status` (`status`,`transaction_id`);
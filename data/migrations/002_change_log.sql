@@ -0,0 +1,16 @@
+--
+-- Migrasi: change_log untuk sinkronisasi cache antar instance
+-- Setiap write Library mencatat satu baris; instance lain membaca entri
+-- setelah change_id terakhir yang sudah dilihat (Library.poll_changes).
+--
+
+CREATE TABLE `change_log` (
+  `change_id` bigint(20) NOT NULL AUTO_INCREMENT,
+  `entity` varchar(32) NOT NULL,
+  `entity_id` int(11) NOT NULL,
+  `action` varchar(16) NOT NULL,
+  `origin` varchar(64) DEFAULT NULL,
+  `created_at` datetime DEFAULT current_timestamp(),
+  PRIMARY KEY (`change_id`),
+  KEY `idx_change_log_created` (`created_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
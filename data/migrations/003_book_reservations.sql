@@ -0,0 +1,15 @@
+--
+-- Migrasi: reservasi stock untuk permintaan pinjam pending
+-- Permintaan pinjam memesan satu salinan secara atomik
+-- (stock - reserved > 0); disetujui/ditolak melepas pesanannya.
+--
+
+ALTER TABLE `books`
+  ADD COLUMN `reserved` int(11) NOT NULL DEFAULT 0;
+
+-- Permintaan pinjam yang sudah pending sebelum migrasi ikut memesan
+UPDATE `books` b
+  SET b.`reserved` = (
+    SELECT COUNT(*) FROM `transactions` t
+    WHERE t.`book_id` = b.`books_id` AND t.`type` = 'borrow' AND t.`status` = 'pending'
+  );
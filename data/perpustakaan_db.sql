@@ -35,7 +35,23 @@ CREATE TABLE `books` (
   `genre` varchar(128) DEFAULT NULL,
   `year` int(11) DEFAULT NULL,
   `stock` int(11) DEFAULT 1,
-  `description` text DEFAULT NULL
+  `description` text DEFAULT NULL,
+  `reserved` int(11) NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- --------------------------------------------------------
+
+--
+-- Struktur dari tabel `change_log`
+--
+
+CREATE TABLE `change_log` (
+  `change_id` bigint(20) NOT NULL,
+  `entity` varchar(32) NOT NULL,
+  `entity_id` int(11) NOT NULL,
+  `action` varchar(16) NOT NULL,
+  `origin` varchar(64) DEFAULT NULL,
+  `created_at` datetime DEFAULT current_timestamp()
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
 -- --------------------------------------------------------
@@ -64,7 +80,9 @@ CREATE TABLE `transactions` (
   `book_id` int(11) NOT NULL,
   `type` enum('borrow','return') NOT NULL,
   `status` varchar(32) DEFAULT 'pending',
-  `timestamp` datetime DEFAULT current_timestamp()
+  `timestamp` datetime DEFAULT current_timestamp(),
+  `claimed_by` varchar(64) DEFAULT NULL,
+  `claim_expires` datetime DEFAULT NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
 -- --------------------------------------------------------
@@ -104,6 +122,13 @@ ALTER TABLE `books`
   ADD KEY `idx_books_author` (`author`),
   ADD KEY `idx_books_genre` (`genre`);
 
+--
+-- Indeks untuk tabel `change_log`
+--
+ALTER TABLE `change_log`
+  ADD PRIMARY KEY (`change_id`),
+  ADD KEY `idx_change_log_created` (`created_at`);
+
 --
 -- Indeks untuk tabel `history`
 --
@@ -118,7 +143,8 @@ ALTER TABLE `history`
 ALTER TABLE `transactions`
   ADD PRIMARY KEY (`transaction_id`),
   ADD KEY `idx_transactions_user` (`user_id`),
-  ADD KEY `idx_transactions_book` (`book_id`);
+  ADD KEY `idx_transactions_book` (`book_id`),
+  ADD KEY `idx_transactions_status` (`status`,`transaction_id`);
 
 --
 -- Indeks untuk tabel `users`
@@ -138,6 +164,12 @@ ALTER TABLE `users`
 ALTER TABLE `books`
   MODIFY `books_id` int(11) NOT NULL AUTO_INCREMENT;
 
+--
+-- AUTO_INCREMENT untuk tabel `change_log`
+--
+ALTER TABLE `change_log`
+  MODIFY `change_id` bigint(20) NOT NULL AUTO_INCREMENT;
+
 --
 -- AUTO_INCREMENT untuk tabel `history`
 --
@@ -0,0 +1,76 @@
+"""
+Benchmark throughput sesi bersamaan: AsyncLibrary vs Library (blocking)
+
+Setiap "request" = search + get_statistics untuk satu sesi yang sudah login.
+Library dijalankan berurutan (satu current_user per proses), AsyncLibrary
+menjalankan semua sesi bersamaan lewat connection pool. Kedua sisi mencari
+lewat query LIKE di database: catalog index Library sengaja tidak dipakai
+agar yang dibandingkan hanya cara menjalankan query (blocking vs pool).
+
+Membutuhkan MySQL perpustakaan_db yang berjalan dan paket aiomysql.
+Jalankan: python benchmarks/bench_async_library.py [sesi] [request_per_sesi]
+"""
+
+import sys
+import os
+import time
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.library import Library
+from models.async_library import AsyncLibrary
+from models.catalog_index import CatalogIndex
+
+USERNAME = "user"
+PASSWORD = "user123"
+QUERIES = ["a", "the", "novel", "sejarah", "1"]
+
+def run_sync(sessions, requests_per_session):
+    """Baseline: Library blocking, sesi dilayani satu per satu"""
+    library = Library()
+    # Index kosong (belum dimuat): search_books & get_book memakai database
+    # seperti AsyncLibrary
+    library.catalog_index = CatalogIndex()
+    start = time.perf_counter()
+    for _ in range(sessions):
+        library.login(USERNAME, PASSWORD)
+        for i in range(requests_per_session):
+            library.search_books(QUERIES[i % len(QUERIES)])
+            library.get_statistics()
+        library.logout()
+    return time.perf_counter() - start
+
+async def run_async(sessions, requests_per_session, pool_size):
+    """AsyncLibrary: semua sesi berjalan bersamaan"""
+    async with AsyncLibrary(maxsize=pool_size) as library:
+        async def one_session():
+            success, _, session = await library.login(USERNAME, PASSWORD)
+            assert success and session
+            for i in range(requests_per_session):
+                await library.search_books(QUERIES[i % len(QUERIES)])
+                await library.get_statistics()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_session() for _ in range(sessions)))
+        return time.perf_counter() - start
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    requests_per_session = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    total = sessions * requests_per_session
+
+    print("\n" + "="*60)
+    print(f"BENCHMARK SESI BERSAMAAN ({sessions} sesi x {requests_per_session} request)")
+    print("="*60)
+
+    sync_seconds = run_sync(sessions, requests_per_session)
+    print(f"Library (blocking)   : {sync_seconds:8.2f} s  {total / sync_seconds:8.1f} req/s")
+
+    for pool_size in (5, 20, 50):
+        async_seconds = asyncio.run(run_async(sessions, requests_per_session, pool_size))
+        print(f"AsyncLibrary pool={pool_size:<3}: {async_seconds:8.2f} s  {total / async_seconds:8.1f} req/s")
+
+    print("="*60 + "\n")
+
+if __name__ == "__main__":
+    main()
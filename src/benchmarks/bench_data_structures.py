@@ -0,0 +1,510 @@
+"""
+Benchmark struktur data (BST, HashTable, Queue, Stack, LinkedList, Graph)
+
+Setiap struktur diukur untuk insert, search, delete, iterasi dan memori
+pada beberapa ukuran, dibandingkan dengan padanan builtin (dict, list,
+deque, bisect, heapq). Data dibuat dari seed tetap sehingga hasil bisa
+diulang, dan disimpan sebagai JSON agar versi lama/baru bisa dibandingkan.
+
+Operasi yang kompleksitasnya O(n^2) pada implementasi sekarang
+(mis. LinkedList.append, Graph.dijkstra, bisect.insort) dibatasi ukurannya
+dan dicatat sebagai "skipped" di atas batas.
+
+Jalankan:
+    python benchmarks/bench_data_structures.py                 # 1e3..1e6
+    python benchmarks/bench_data_structures.py --quick         # 1e3, 1e4
+    python benchmarks/bench_data_structures.py --structures BST HashTable
+    python benchmarks/bench_data_structures.py --compare lama.json
+"""
+
+import sys
+import os
+import gc
+import json
+import time
+import random
+import platform
+import argparse
+import tracemalloc
+import heapq
+from bisect import bisect_left, insort
+from collections import deque
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_structures.bst import BST
+from data_structures.hash_table import HashTable
+from data_structures.queue import Queue
+from data_structures.stack import Stack
+from data_structures.linked_list import LinkedList
+from data_structures.graph import Graph
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+QUICK_SIZES = (1_000, 10_000)
+SEED = 20251207
+SAMPLE = 10_000             # Jumlah key untuk search/delete
+LINEAR_SAMPLE = 100         # Search/delete O(n) per operasi (LinkedList)
+QUADRATIC_LIMIT = 10_000    # Batas ukuran untuk operasi O(n^2)
+INSORT_LIMIT = 100_000
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# ==================== HELPER ====================
+
+class Recorder:
+    """Kumpulkan hasil per (struktur, ukuran, operasi, implementasi)"""
+
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.results = []
+
+    def time(self, structure, size, operation, implementation, func, setup=None, ops=None):
+        """
+        Catat waktu terbaik dari beberapa kali ulang.
+        :param setup: Fungsi tanpa timing yang menyiapkan argumen func
+            (dipanggil ulang setiap repeat, mis. untuk delete).
+        """
+        repeat = self.repeat if size <= 100_000 else 1
+        best = None
+        for _ in range(repeat):
+            state = setup() if setup else None
+            gc.collect()
+            gc.disable()
+            try:
+                started = time.perf_counter()
+                func(state) if setup else func()
+                elapsed = time.perf_counter() - started
+            finally:
+                gc.enable()
+            best = elapsed if best is None else min(best, elapsed)
+
+        ops = ops or size
+        self.results.append({
+            'structure': structure, 'size': size, 'operation': operation,
+            'implementation': implementation, 'seconds': best, 'ops': ops,
+            'ns_per_op': best / ops * 1e9,
+        })
+
+    def memory(self, structure, size, implementation, build):
+        """Catat byte yang dialokasikan untuk membangun struktur"""
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        built = build()
+        allocated = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        del built
+        self.results.append({
+            'structure': structure, 'size': size, 'operation': 'memory',
+            'implementation': implementation, 'bytes': allocated,
+            'bytes_per_item': allocated / size,
+        })
+
+    def skip(self, structure, size, operation, implementation, reason):
+        self.results.append({
+            'structure': structure, 'size': size, 'operation': operation,
+            'implementation': implementation, 'skipped': reason,
+        })
+
+def make_keys(size):
+    """Key unik acak (deterministik) dan sampel key untuk lookup/delete"""
+    rng = random.Random(SEED + size)
+    keys = rng.sample(range(size * 10), size)
+    sample = rng.sample(keys, min(size, SAMPLE))
+    return keys, sample
+
+# ==================== STRUKTUR ====================
+
+def bench_bst(rec, size):
+    keys, sample = make_keys(size)
+
+    def build_bst():
+        tree = BST()
+        for key in keys:
+            tree.insert(key, key)
+        return tree
+
+    def build_dict():
+        return {key: key for key in keys}
+
+    def build_insort():
+        items = []
+        for key in keys:
+            insort(items, key)
+        return items
+
+    rec.time('BST', size, 'insert', 'BST', build_bst)
+    rec.time('BST', size, 'insert', 'dict', build_dict)
+    rec.time('BST', size, 'insert', 'list+sort', lambda: sorted(keys))
+    if size <= INSORT_LIMIT:
+        rec.time('BST', size, 'insert', 'bisect.insort', build_insort)
+    else:
+        rec.skip('BST', size, 'insert', 'bisect.insort', f"O(n^2), size > {INSORT_LIMIT}")
+
+    tree, table, ordered = build_bst(), build_dict(), sorted(keys)
+    rec.time('BST', size, 'search', 'BST', lambda: [tree.search(k) for k in sample], ops=len(sample))
+    rec.time('BST', size, 'search', 'dict', lambda: [table.get(k) for k in sample], ops=len(sample))
+    rec.time('BST', size, 'search', 'bisect', lambda: [bisect_left(ordered, k) for k in sample], ops=len(sample))
+
+    ranges = [(k, k + size // 100) for k in sample[:100]]
+    rec.time('BST', size, 'range', 'BST', lambda: [tree.range_search(lo, hi) for lo, hi in ranges], ops=len(ranges))
+    rec.time('BST', size, 'range', 'bisect',
+             lambda: [ordered[bisect_left(ordered, lo):bisect_left(ordered, hi + 1)] for lo, hi in ranges],
+             ops=len(ranges))
+
+    rec.time('BST', size, 'iterate', 'BST', lambda: tree.inorder_traversal())
+    rec.time('BST', size, 'iterate', 'sorted(dict)', lambda: sorted(table))
+    rec.time('BST', size, 'iterate', 'sorted list', lambda: list(ordered))
+
+    def delete_bst(t):
+        for k in sample:
+            t.delete(k)
+
+    def delete_dict(d):
+        for k in sample:
+            del d[k]
+
+    def delete_sorted(items):
+        for k in sample:
+            del items[bisect_left(items, k)]
+
+    rec.time('BST', size, 'delete', 'BST', delete_bst, setup=build_bst, ops=len(sample))
+    rec.time('BST', size, 'delete', 'dict', delete_dict, setup=build_dict, ops=len(sample))
+    rec.time('BST', size, 'delete', 'bisect', delete_sorted, setup=lambda: sorted(keys), ops=len(sample))
+
+    rec.memory('BST', size, 'BST', build_bst)
+    rec.memory('BST', size, 'dict', build_dict)
+    rec.memory('BST', size, 'sorted list', lambda: sorted(keys))
+
+def bench_hash_table(rec, size):
+    keys, sample = make_keys(size)
+
+    def build_table():
+        table = HashTable()
+        for key in keys:
+            table.insert(key, key)
+        return table
+
+    def build_dict():
+        return {key: key for key in keys}
+
+    rec.time('HashTable', size, 'insert', 'HashTable', build_table)
+    rec.time('HashTable', size, 'insert', 'dict', build_dict)
+
+    table, mapping = build_table(), build_dict()
+    rec.time('HashTable', size, 'search', 'HashTable', lambda: [table.search(k) for k in sample], ops=len(sample))
+    rec.time('HashTable', size, 'search', 'dict', lambda: [mapping.get(k) for k in sample], ops=len(sample))
+    rec.time('HashTable', size, 'iterate', 'HashTable', lambda: table.get_all())
+    rec.time('HashTable', size, 'iterate', 'dict', lambda: list(mapping.items()))
+
+    def delete_table(t):
+        for k in sample:
+            t.delete(k)
+
+    def delete_dict(d):
+        for k in sample:
+            del d[k]
+
+    rec.time('HashTable', size, 'delete', 'HashTable', delete_table, setup=build_table, ops=len(sample))
+    rec.time('HashTable', size, 'delete', 'dict', delete_dict, setup=build_dict, ops=len(sample))
+
+    rec.memory('HashTable', size, 'HashTable', build_table)
+    rec.memory('HashTable', size, 'dict', build_dict)
+
+def bench_queue(rec, size):
+    items = list(range(size))
+
+    def build_queue():
+        queue = Queue()
+        for item in items:
+            queue.enqueue(item)
+        return queue
+
+    def build_deque():
+        queue = deque()
+        for item in items:
+            queue.append(item)
+        return queue
+
+    rec.time('Queue', size, 'insert', 'Queue', build_queue)
+    rec.time('Queue', size, 'insert', 'deque', build_deque)
+
+    queue, baseline = build_queue(), build_deque()
+    rec.time('Queue', size, 'iterate', 'Queue', lambda: queue.get_all())
+    rec.time('Queue', size, 'iterate', 'deque', lambda: list(baseline))
+
+    def drain_queue(q):
+        while not q.is_empty():
+            q.dequeue()
+
+    def drain_deque(q):
+        while q:
+            q.popleft()
+
+    rec.time('Queue', size, 'delete', 'Queue', drain_queue, setup=build_queue)
+    rec.time('Queue', size, 'delete', 'deque', drain_deque, setup=build_deque)
+
+    rec.memory('Queue', size, 'Queue', build_queue)
+    rec.memory('Queue', size, 'deque', build_deque)
+
+def bench_stack(rec, size):
+    items = list(range(size))
+
+    def build_stack():
+        stack = Stack()
+        for item in items:
+            stack.push(item)
+        return stack
+
+    def build_list():
+        stack = []
+        for item in items:
+            stack.append(item)
+        return stack
+
+    rec.time('Stack', size, 'insert', 'Stack', build_stack)
+    rec.time('Stack', size, 'insert', 'list', build_list)
+
+    stack, baseline = build_stack(), build_list()
+    rec.time('Stack', size, 'iterate', 'Stack', lambda: stack.get_all())
+    rec.time('Stack', size, 'iterate', 'list', lambda: baseline[::-1])
+
+    def drain_stack(s):
+        while not s.is_empty():
+            s.pop()
+
+    def drain_list(s):
+        while s:
+            s.pop()
+
+    rec.time('Stack', size, 'delete', 'Stack', drain_stack, setup=build_stack)
+    rec.time('Stack', size, 'delete', 'list', drain_list, setup=build_list)
+
+    rec.memory('Stack', size, 'Stack', build_stack)
+    rec.memory('Stack', size, 'list', build_list)
+
+def bench_linked_list(rec, size):
+    keys, _ = make_keys(size)
+    sample = random.Random(SEED).sample(keys, min(size, LINEAR_SAMPLE))
+
+    def build_linked():
+        # prepend O(1); append berjalan ke ekor setiap kali (O(n))
+        linked = LinkedList()
+        for key in reversed(keys):
+            linked.prepend(key)
+        return linked
+
+    def append_linked():
+        linked = LinkedList()
+        for key in keys:
+            linked.append(key)
+        return linked
+
+    def build_deque():
+        items = deque()
+        for key in reversed(keys):
+            items.appendleft(key)
+        return items
+
+    rec.time('LinkedList', size, 'insert', 'LinkedList.prepend', build_linked)
+    rec.time('LinkedList', size, 'insert', 'deque.appendleft', build_deque)
+    rec.time('LinkedList', size, 'insert', 'list.append', lambda: list(keys))
+    if size <= QUADRATIC_LIMIT:
+        rec.time('LinkedList', size, 'append', 'LinkedList.append', append_linked)
+    else:
+        rec.skip('LinkedList', size, 'append', 'LinkedList.append', f"O(n^2), size > {QUADRATIC_LIMIT}")
+
+    linked, items = build_linked(), list(keys)
+    rec.time('LinkedList', size, 'search', 'LinkedList', lambda: [linked.search(k) for k in sample], ops=len(sample))
+    rec.time('LinkedList', size, 'search', 'list.index', lambda: [items.index(k) for k in sample], ops=len(sample))
+    rec.time('LinkedList', size, 'iterate', 'LinkedList', lambda: linked.get_all())
+    rec.time('LinkedList', size, 'iterate', 'list', lambda: list(items))
+
+    def delete_linked(l):
+        for k in sample:
+            l.delete(k)
+
+    def delete_list(l):
+        for k in sample:
+            l.remove(k)
+
+    rec.time('LinkedList', size, 'delete', 'LinkedList', delete_linked, setup=build_linked, ops=len(sample))
+    rec.time('LinkedList', size, 'delete', 'list.remove', delete_list, setup=lambda: list(keys), ops=len(sample))
+
+    rec.memory('LinkedList', size, 'LinkedList', build_linked)
+    rec.memory('LinkedList', size, 'list', lambda: list(keys))
+
+def make_edges(size, degree=4):
+    """Graph acak berbobot: size vertex, ~degree edge keluar per vertex"""
+    rng = random.Random(SEED + size)
+    return [(f"v{u}", f"v{rng.randrange(size)}", rng.randint(1, 10))
+            for u in range(size) for _ in range(degree)]
+
+def dijkstra_heapq(adjacency, start):
+    """Baseline Dijkstra dengan heapq (O((V + E) log V))"""
+    distances = {start: 0}
+    heap = [(0, start)]
+    while heap:
+        distance, vertex = heapq.heappop(heap)
+        if distance > distances.get(vertex, float('inf')):
+            continue
+        for neighbor, weight in adjacency[vertex].items():
+            candidate = distance + weight
+            if candidate < distances.get(neighbor, float('inf')):
+                distances[neighbor] = candidate
+                heapq.heappush(heap, (candidate, neighbor))
+    return distances
+
+def bfs_dict(adjacency, start, max_depth=3):
+    """Baseline BFS di atas dict of dict"""
+    visited = {start}
+    frontier = [start]
+    result = []
+    for depth in range(1, max_depth + 1):
+        next_frontier = []
+        for vertex in frontier:
+            for neighbor in adjacency[vertex]:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    result.append((neighbor, depth))
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return result
+
+def bench_graph(rec, size):
+    edges = make_edges(size)
+    starts = [f"v{i}" for i in random.Random(SEED).sample(range(size), min(size, 100))]
+
+    def build_graph():
+        graph = Graph()
+        for u, v, w in edges:
+            graph.add_edge(u, v, w)
+        return graph
+
+    def build_dict():
+        adjacency = {f"v{i}": {} for i in range(size)}
+        for u, v, w in edges:
+            adjacency[u][v] = w
+        return adjacency
+
+    rec.time('Graph', size, 'insert', 'Graph', build_graph, ops=len(edges))
+    rec.time('Graph', size, 'insert', 'dict of dict', build_dict, ops=len(edges))
+
+    graph, adjacency = build_graph(), build_dict()
+    rec.time('Graph', size, 'search', 'Graph.get_weight',
+             lambda: [graph.get_weight(u, v) for u, v, _ in edges[:SAMPLE]], ops=min(len(edges), SAMPLE))
+    rec.time('Graph', size, 'search', 'dict of dict',
+             lambda: [adjacency[u].get(v, 0) for u, v, _ in edges[:SAMPLE]], ops=min(len(edges), SAMPLE))
+    rec.time('Graph', size, 'iterate', 'Graph.bfs', lambda: [graph.bfs(s) for s in starts], ops=len(starts))
+    rec.time('Graph', size, 'iterate', 'dict bfs', lambda: [bfs_dict(adjacency, s) for s in starts], ops=len(starts))
+
+    if size <= QUADRATIC_LIMIT:
+        rec.time('Graph', size, 'shortest_path', 'Graph.dijkstra', lambda: graph.dijkstra(starts[0]), ops=1)
+    else:
+        rec.skip('Graph', size, 'shortest_path', 'Graph.dijkstra', f"O(V^2), size > {QUADRATIC_LIMIT}")
+    rec.time('Graph', size, 'shortest_path', 'heapq dijkstra', lambda: dijkstra_heapq(adjacency, starts[0]), ops=1)
+
+    rec.memory('Graph', size, 'Graph', build_graph)
+    rec.memory('Graph', size, 'dict of dict', build_dict)
+
+STRUCTURES = {
+    'BST': bench_bst,
+    'HashTable': bench_hash_table,
+    'Queue': bench_queue,
+    'Stack': bench_stack,
+    'LinkedList': bench_linked_list,
+    'Graph': bench_graph,
+}
+
+# ==================== OUTPUT ====================
+
+def result_key(result):
+    return (result['structure'], result['size'], result['operation'], result['implementation'])
+
+def print_results(results):
+    """Tabel ringkas: ns/op untuk waktu, B/item untuk memori"""
+    print(f"\n{'Struktur':<12}{'n':>9}  {'Operasi':<14}{'Implementasi':<22}{'Hasil':>16}")
+    print("-" * 75)
+    for r in results:
+        if 'skipped' in r:
+            value = f"skip ({r['skipped']})"
+        elif r['operation'] == 'memory':
+            value = f"{r['bytes_per_item']:.1f} B/item"
+        else:
+            value = f"{r['ns_per_op']:.0f} ns/op"
+        print(f"{r['structure']:<12}{r['size']:>9}  {r['operation']:<14}{r['implementation']:<22}{value:>16}")
+
+def compare(results, baseline_path, threshold=0.10):
+    """Bandingkan dengan file hasil sebelumnya, tandai yang lebih lambat/boros"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        previous = {result_key(r): r for r in json.load(f)['results']}
+
+    print(f"\nPerbandingan dengan {baseline_path} (ambang {threshold:.0%}):")
+    regressions = 0
+    for r in results:
+        old = previous.get(result_key(r))
+        if not old or 'skipped' in r or 'skipped' in old:
+            continue
+        metric = 'bytes' if r['operation'] == 'memory' else 'ns_per_op'
+        ratio = r[metric] / old[metric] if old[metric] else 1.0
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  <-- REGRESI"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            flag = "  (lebih baik)"
+        if flag:
+            print(f"  {r['structure']:<12}{r['size']:>9} {r['operation']:<14}{r['implementation']:<22}{ratio:6.2f}x{flag}")
+    print(f"{regressions} regresi ditemukan")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark struktur data perpustakaan")
+    parser.add_argument('--sizes', type=int, nargs='+', default=None, help="Ukuran data (default 1e3..1e6)")
+    parser.add_argument('--quick', action='store_true', help="Hanya ukuran 1e3 dan 1e4")
+    parser.add_argument('--structures', nargs='+', choices=sorted(STRUCTURES), default=list(STRUCTURES))
+    parser.add_argument('--repeat', type=int, default=3, help="Ulangan per operasi (ambil tercepat)")
+    parser.add_argument('--output', default=None, help="Path file JSON hasil")
+    parser.add_argument('--compare', default=None, help="File JSON hasil sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    recorder = Recorder(args.repeat)
+
+    print("\n" + "="*75)
+    print(f"BENCHMARK STRUKTUR DATA (ukuran {', '.join(map(str, sizes))})")
+    print("="*75)
+    for name in args.structures:
+        for size in sizes:
+            started = time.perf_counter()
+            STRUCTURES[name](recorder, size)
+            print(f"  {name} n={size}: {time.perf_counter() - started:.1f} s")
+
+    print_results(recorder.results)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"data_structures_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    report = {
+        'meta': {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'seed': SEED,
+            'sizes': list(sizes),
+            'repeat': args.repeat,
+        },
+        'results': recorder.results,
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nHasil disimpan ke {output}")
+
+    if args.compare:
+        compare(recorder.results, args.compare)
+    print("="*75 + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark throughput XOR DataEncryption (MB/s)
+
+Membandingkan loop per byte lama dengan XOR per blok (int.from_bytes atau
+NumPy jika terpasang), plus xor_file yang membaca per chunk.
+
+Jalankan: python benchmarks/bench_encryption.py [ukuran_MB]
+"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.encryption import DataEncryption, _load_numpy
+
+KEY = "kunci-rahasia-perpustakaan"
+
+def xor_per_byte(data, key_bytes):
+    """Replika implementasi lama: loop Python per byte"""
+    encrypted = bytearray()
+    key_length = len(key_bytes)
+    for i, byte in enumerate(data):
+        encrypted.append(byte ^ key_bytes[i % key_length])
+    return bytes(encrypted)
+
+def throughput(func, size):
+    """MB/s satu kali pemanggilan func"""
+    start = time.perf_counter()
+    func()
+    return size / (1024 * 1024) / (time.perf_counter() - start)
+
+def run_benchmark(size_mb=16):
+    """Jalankan benchmark untuk data size_mb MB"""
+    size = size_mb * 1024 * 1024
+    data = os.urandom(size)
+    key_bytes = KEY.encode('utf-8')
+
+    # Loop per byte terlalu lambat untuk data penuh, ukur dari sampel 2 MB
+    sample = data[:2 * 1024 * 1024]
+    old = throughput(lambda: xor_per_byte(sample, key_bytes), len(sample))
+    assert xor_per_byte(sample, key_bytes) == DataEncryption.xor_bytes(sample, key_bytes)
+
+    new = throughput(lambda: DataEncryption.xor_bytes(data, key_bytes), size)
+
+    with tempfile.TemporaryDirectory() as folder:
+        source = os.path.join(folder, "plain.bin")
+        target = os.path.join(folder, "encrypted.bin")
+        with open(source, 'wb') as f:
+            f.write(data)
+        streamed = throughput(lambda: DataEncryption.xor_file(source, target, KEY), size)
+
+    print("\n" + "="*60)
+    print(f"BENCHMARK XOR ({size_mb} MB, backend: {'numpy' if _load_numpy() else 'int.from_bytes'})")
+    print("="*60)
+    print(f"{'Loop per byte (lama)':<30}{old:>12.1f} MB/s")
+    print(f"{'xor_bytes (blok)':<30}{new:>12.1f} MB/s  ({new / old:.0f}x)")
+    print(f"{'xor_file (chunk 1 MB)':<30}{streamed:>12.1f} MB/s")
+    print("="*60 + "\n")
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 16)
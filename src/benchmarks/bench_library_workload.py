@@ -0,0 +1,293 @@
+"""
+Benchmark workload end-to-end Library (login, search, pinjam, approval, statistik, rekomendasi)
+
+Database lokal diisi katalog, user dan history sintetis, lalu campuran
+operasi dijalankan ulang dengan seed tetap. Hasil per operasi: jumlah,
+ops/detik, latency p50/p95/p99 dan rata-rata query per operasi.
+
+Default memakai SQLite (tanpa server); --backend mysql memakai database
+MySQL lokal terpisah (default perpustakaan_bench, ganti lewat --database)
+yang harus sudah dibuat dengan skema data/perpustakaan_db.sql beserta
+migrasinya. Tabelnya akan diisi data sintetis, jadi jangan arahkan ke
+perpustakaan_db yang dipakai aplikasi.
+
+Jalankan:
+    python benchmarks/bench_library_workload.py
+    python benchmarks/bench_library_workload.py --ops 20000 --books 50000 --users 2000
+    python benchmarks/bench_library_workload.py --mix search=60,borrow=20,approve=20
+    python benchmarks/bench_library_workload.py --output hasil.json
+    python benchmarks/bench_library_workload.py --backend mysql --database perpustakaan_bench
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.library import Library
+from models.user import User
+from models.session import Session
+from utils.database_connector import create_connector
+from utils.encryption import PasswordEncryption
+from utils.query_stats import LatencyHistogram
+
+PASSWORD = "bench123"
+GENRES = ["Novel", "Sejarah", "Sains", "Komputer", "Biografi", "Agama", "Anak", "Puisi"]
+WORDS = ["laskar", "pelangi", "bumi", "manusia", "ronggeng", "hujan", "senja", "negeri",
+         "cinta", "perahu", "kertas", "gadis", "pantai", "ayat", "matahari", "hujan", "sang",
+         "pemimpi", "data", "python", "sejarah", "nusantara", "kopi", "laut"]
+
+DEFAULT_MIX = {
+    'login': 2,
+    'search': 30,
+    'get_book': 15,
+    'borrow': 15,
+    'approve': 12,
+    'return': 8,
+    'history': 3,
+    'statistics': 5,
+    'recommendations': 10,
+}
+
+# ==================== SEED ====================
+
+def seed_database(db, rng, books, users, history, batch_size=5000):
+    """Isi books, users (1 admin + member) dan history sintetis lewat bulk insert"""
+    # Satu entry KDF dipakai semua user sintetis: seeding tidak perlu
+    # menghitung ribuan KDF, login tetap membayar biaya verifikasi penuh
+    entry = PasswordEncryption.create_password_entry(PASSWORD)
+    db.execute_many(
+        "INSERT INTO users (username, password_hash, role) VALUES (%s, %s, %s)",
+        [("bench_admin", entry, 'admin')] + [(f"member{i:06d}", entry, 'member') for i in range(users)]
+    )
+
+    rows = []
+    for i in range(books):
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).title()
+        rows.append((f"978{i:010d}", f"{title} {i}", f"Penulis {rng.randrange(books // 10 + 1)}",
+                     rng.choice(GENRES), rng.randint(1950, 2025), rng.randint(0, 5)))
+        if len(rows) >= batch_size:
+            db.execute_many("INSERT INTO books (isbn, title, author, genre, year, stock) VALUES (%s, %s, %s, %s, %s, %s)", rows)
+            rows = []
+    if rows:
+        db.execute_many("INSERT INTO books (isbn, title, author, genre, year, stock) VALUES (%s, %s, %s, %s, %s, %s)", rows)
+
+    user_ids = [r[0] for r in db.execute_query("SELECT user_id FROM users WHERE role = 'member'", fetch='all', row_factory=tuple)]
+    book_ids = [r[0] for r in db.execute_query("SELECT books_id FROM books", fetch='all', row_factory=tuple)]
+    start = datetime.now() - timedelta(days=365)
+    rows = []
+    for _ in range(history):
+        borrowed = start + timedelta(minutes=rng.randrange(365 * 24 * 60))
+        # 10% belum dikembalikan -> bahan operasi 'return'
+        returned = None if rng.random() < 0.1 else borrowed + timedelta(days=rng.randint(1, 21))
+        rows.append((rng.choice(user_ids), rng.choice(book_ids), borrowed, returned))
+        if len(rows) >= batch_size:
+            db.execute_many("INSERT INTO history (user_id, book_id, borrow_date, return_date) VALUES (%s, %s, %s, %s)", rows)
+            rows = []
+    if rows:
+        db.execute_many("INSERT INTO history (user_id, book_id, borrow_date, return_date) VALUES (%s, %s, %s, %s)", rows)
+
+# ==================== WORKLOAD ====================
+
+class Workload:
+    """State workload: sesi member, admin dan pinjaman yang masih terbuka"""
+
+    def __init__(self, library, rng):
+        self.library = library
+        self.rng = rng
+        members = library.db.execute_query("SELECT * FROM users WHERE role = 'member'", fetch='all', row_factory=User)
+        admin = library.db.execute_query("SELECT * FROM users WHERE username = 'bench_admin'", fetch='one', row_factory=User)
+        # Sesi dibuat langsung; biaya login diukur terpisah oleh operasi 'login'
+        self.sessions = {user.user_id: Session(user) for user in members}
+        self.member_ids = list(self.sessions)
+        self.admin = Session(admin)
+        self.book_ids = [r[0] for r in library.db.execute_query("SELECT books_id FROM books", fetch='all', row_factory=tuple)]
+        self.open_loans = library.db.execute_query(
+            "SELECT user_id, book_id FROM history WHERE return_date IS NULL", fetch='all', row_factory=tuple
+        )
+
+    def member(self):
+        return self.sessions[self.rng.choice(self.member_ids)]
+
+    def op_login(self):
+        return self.library.create_session(self.member().user.username, PASSWORD)[0]
+
+    def op_search(self):
+        return self.library.search_books(self.rng.choice(WORDS))
+
+    def op_get_book(self):
+        return self.library.get_book(self.rng.choice(self.book_ids))
+
+    def op_borrow(self):
+        return self.library.request_borrow(self.rng.choice(self.book_ids), session=self.member())[0]
+
+    def op_approve(self):
+        return self.library.process_transaction(session=self.admin)[0]
+
+    def op_return(self):
+        if not self.open_loans:
+            return False
+        user_id, book_id = self.open_loans.pop(self.rng.randrange(len(self.open_loans)))
+        return self.library.request_return(book_id, session=self.sessions[user_id])[0]
+
+    def op_history(self):
+        return self.library.get_user_history(session=self.member())
+
+    def op_statistics(self):
+        return self.library.get_statistics()
+
+    def op_recommendations(self):
+        return self.library.get_recommendations(session=self.member())
+
+def parse_mix(text):
+    """'search=60,borrow=20' -> {'search': 60, 'borrow': 20}"""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Operasi tidak dikenal: {name} (pilihan: {', '.join(DEFAULT_MIX)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+def total_queries(stats):
+    with stats._lock:
+        return sum(entry['calls'] for entry in stats.queries.values())
+
+def run_workload(workload, mix, ops, rng):
+    """Jalankan ops operasi acak sesuai bobot mix, catat latency per operasi"""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    plan = rng.choices(names, weights, k=ops)
+    handlers = {name: getattr(workload, f"op_{name}") for name in names}
+    stats = workload.library.db.stats
+
+    results = {name: {'histogram': LatencyHistogram(), 'queries': 0, 'ok': 0} for name in names}
+    started = time.perf_counter()
+    for name in plan:
+        before = total_queries(stats)
+        op_started = time.perf_counter()
+        ok = handlers[name]()
+        elapsed = time.perf_counter() - op_started
+        result = results[name]
+        result['histogram'].record(elapsed * 1_000_000)
+        result['queries'] += total_queries(stats) - before
+        result['ok'] += 1 if ok else 0
+    return results, time.perf_counter() - started
+
+def summarize(results, wall_seconds):
+    summary = {}
+    for name, result in results.items():
+        histogram = result['histogram']
+        if not histogram.count:
+            continue
+        busy = histogram.total / 1_000_000
+        summary[name] = {
+            'count': histogram.count,
+            'ok': result['ok'],
+            'ops_per_sec': histogram.count / busy if busy else 0.0,
+            'p50_ms': histogram.percentile(50) / 1000,
+            'p95_ms': histogram.percentile(95) / 1000,
+            'p99_ms': histogram.percentile(99) / 1000,
+            'max_ms': (histogram.max or 0) / 1000,
+            'queries_per_op': result['queries'] / histogram.count,
+        }
+    total = sum(item['count'] for item in summary.values())
+    return summary, {'ops': total, 'seconds': wall_seconds, 'ops_per_sec': total / wall_seconds if wall_seconds else 0.0}
+
+def print_summary(summary, overall):
+    print(f"\n{'Operasi':<17}{'n':>7}{'ok':>7}{'ops/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'q/op':>7}")
+    print("-" * 84)
+    for name, item in summary.items():
+        print(f"{name:<17}{item['count']:>7}{item['ok']:>7}{item['ops_per_sec']:>10.1f}"
+              f"{item['p50_ms']:>9.2f}{item['p95_ms']:>9.2f}{item['p99_ms']:>9.2f}"
+              f"{item['max_ms']:>9.1f}{item['queries_per_op']:>7.1f}")
+    print("-" * 84)
+    print(f"Total {overall['ops']} operasi dalam {overall['seconds']:.2f} s = {overall['ops_per_sec']:.1f} ops/s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark workload Library end-to-end")
+    parser.add_argument('--backend', choices=('sqlite', 'mysql'), default='sqlite')
+    parser.add_argument('--db', default=None, help="File SQLite (default file sementara, dihapus setelah selesai)")
+    parser.add_argument('--database', default='perpustakaan_bench',
+                        help="Database MySQL khusus benchmark (diisi data sintetis)")
+    parser.add_argument('--books', type=int, default=5000)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--history', type=int, default=20000)
+    parser.add_argument('--ops', type=int, default=5000)
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help="Bobot operasi, mis. search=60,borrow=20,approve=20")
+    parser.add_argument('--seed', type=int, default=20251207)
+    parser.add_argument('--output', default=None, help="Simpan hasil sebagai JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    temp_dir = None
+    if args.backend == 'sqlite':
+        path = args.db
+        if path is None:
+            temp_dir = tempfile.TemporaryDirectory()
+            path = os.path.join(temp_dir.name, "workload.db")
+        db = create_connector('sqlite', database=path)
+    else:
+        db = create_connector('mysql', host="localhost", user="root", password="", database=args.database)
+
+    print("\n" + "="*84)
+    target = args.database if args.backend == 'mysql' else args.backend
+    print(f"BENCHMARK WORKLOAD LIBRARY ({target}, {args.ops} operasi)")
+    print("="*84)
+    try:
+        if not db.connect():
+            print("Gagal terhubung ke database")
+            return
+
+        seeded = db.execute_query("SELECT COUNT(*) FROM users WHERE username = 'bench_admin'", fetch='one', row_factory=tuple)
+        if not seeded or not seeded[0]:
+            phase = time.perf_counter()
+            seed_database(db, rng, args.books, args.users, args.history)
+            print(f"Seed {args.books} buku, {args.users} user, {args.history} history: "
+                  f"{time.perf_counter() - phase:.1f} s")
+
+        phase = time.perf_counter()
+        library = Library(db=db)
+        print(f"Startup Library: {time.perf_counter() - phase:.2f} s")
+
+        # History hasil seed tidak lewat process_transaction, jadi graph
+        # rekomendasi dibangun dulu darinya (seperti instance yang sudah lama jalan)
+        phase = time.perf_counter()
+        history_rows = library.load_recommendation_graph()
+        print(f"Graph rekomendasi dari {history_rows} history: {time.perf_counter() - phase:.2f} s")
+
+        workload = Workload(library, rng)
+        db.stats.reset()
+        results, wall_seconds = run_workload(workload, args.mix, args.ops, rng)
+        summary, overall = summarize(results, wall_seconds)
+        print_summary(summary, overall)
+
+        if args.output:
+            report = {
+                'meta': {
+                    'generated_at': datetime.now().isoformat(timespec='seconds'),
+                    'backend': args.backend, 'seed': args.seed, 'books': args.books,
+                    'users': args.users, 'history': args.history, 'mix': args.mix,
+                },
+                'overall': overall,
+                'operations': summary,
+                'queries': db.stats.to_dict()['queries'],
+            }
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"Hasil disimpan ke {args.output}")
+    finally:
+        db.disconnect()
+        if temp_dir:
+            temp_dir.cleanup()
+    print("="*84 + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark memori & konstruksi model (Book, User, Transaction, BorrowHistory)
+
+Membandingkan model __slots__ + from_row dengan layout lama
+(atribut di __dict__ per instance, dibuat lewat from_dict).
+
+Jalankan: python benchmarks/bench_models.py [jumlah_objek]
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.book import Book
+from models.user import User
+from models.transaction import Transaction, BorrowHistory
+
+class DictRecord:
+    """Replika layout model lama: satu __dict__ per instance"""
+
+    def __init__(self, columns, row):
+        for name, value in zip(columns, row):
+            setattr(self, name, value)
+
+SAMPLE_ROWS = {
+    Book: (1, "9789793062792", "Laskar Pelangi", "Andrea Hirata", "Novel", 2005, 3, "Novel tentang sekolah di Belitong", 0),
+    User: (1, "member01", "a" * 64 + "$" + "b" * 64, "member", "2025-12-07T23:34:05"),
+    Transaction: (1, 1, 1, "borrow", "pending", "2025-12-07T23:34:05"),
+    BorrowHistory: (1, 1, 1, "2025-12-07T23:34:05", None),
+}
+
+def measure_bytes(factory, rows):
+    """Rata-rata byte yang dialokasikan per objek"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(row) for row in rows]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    # Kurangi alokasi list penampung agar hanya objek yang dihitung
+    container = sys.getsizeof(objects)
+    total = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return (total - container) / len(objects)
+
+def measure_seconds(factory, rows):
+    """Waktu konstruksi seluruh objek"""
+    start = time.perf_counter()
+    for row in rows:
+        factory(row)
+    return time.perf_counter() - start
+
+def run_benchmark(n=100000):
+    """Jalankan benchmark untuk semua model"""
+    print("\n" + "="*70)
+    print(f"BENCHMARK MODEL ({n} objek per model)")
+    print("="*70)
+    print(f"{'Model':<15}{'dict B/obj':>12}{'slots B/obj':>13}{'from_dict s':>14}{'from_row s':>13}")
+    print("-"*70)
+
+    results = {}
+    for model, sample in SAMPLE_ROWS.items():
+        # Nilai id berbeda per baris supaya int tidak di-cache interpreter
+        rows = [(i + 100000,) + sample[1:] for i in range(n)]
+        dicts = [dict(zip(model.COLUMNS, row)) for row in rows]
+
+        dict_bytes = measure_bytes(lambda row: DictRecord(model.COLUMNS, row), rows)
+        slot_bytes = measure_bytes(model.from_row, rows)
+        dict_seconds = measure_seconds(model.from_dict, dicts)
+        row_seconds = measure_seconds(model.from_row, rows)
+
+        results[model.__name__] = {
+            'dict_bytes_per_object': dict_bytes,
+            'slots_bytes_per_object': slot_bytes,
+            'from_dict_seconds': dict_seconds,
+            'from_row_seconds': row_seconds,
+        }
+        print(f"{model.__name__:<15}{dict_bytes:>12.1f}{slot_bytes:>13.1f}"
+              f"{dict_seconds:>14.4f}{row_seconds:>13.4f}")
+
+    print("="*70 + "\n")
+    return results
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    run_benchmark(count)
@@ -0,0 +1,130 @@
+from collections import deque
+
+class IndexedQueue:
+    """Queue FIFO (deque) dengan index key -> item untuk lookup O(1)
+
+    - peek, dequeue, lookup dan remove by key O(1) (amortized)
+    - view per group (mis. per user/type) tanpa scan seluruh queue
+    - max_key menyimpan key terbesar yang pernah masuk, dipakai sebagai
+      cursor reload dari database
+
+    Remove by key memakai lazy deletion: entry di deque ditandai basi lewat
+    nomor urut dan dibuang saat mencapai depan queue.
+    """
+
+    def __init__(self, key_func, groups=None):
+        """
+        :param key_func: Fungsi item -> key unik (mis. transaction_id).
+        :param groups: Dict nama_group -> fungsi item -> nilai group.
+        """
+        self.key_func = key_func
+        self.group_funcs = dict(groups or {})
+        self.clear()
+
+    def clear(self):
+        """Kosongkan queue"""
+        self.order = deque()        # (seq, key) dalam urutan FIFO
+        self.items = {}             # key -> (seq, item)
+        self.groups = {name: {} for name in self.group_funcs}
+        self.max_key = None
+        self._seq = 0
+
+    def enqueue(self, data):
+        """Tambah data ke belakang queue (key yang sudah ada diganti dan pindah ke belakang)"""
+        key = self.key_func(data)
+        if key in self.items:
+            self.remove(key)
+
+        self._seq += 1
+        self.order.append((self._seq, key))
+        self.items[key] = (self._seq, data)
+        for name, func in self.group_funcs.items():
+            self.groups[name].setdefault(func(data), {})[key] = None
+
+        if self.max_key is None or key > self.max_key:
+            self.max_key = key
+
+    def _discard_stale_front(self):
+        """Buang entry basi (sudah di-remove) di depan deque"""
+        order = self.order
+        items = self.items
+        while order:
+            seq, key = order[0]
+            entry = items.get(key)
+            if entry is not None and entry[0] == seq:
+                return
+            order.popleft()
+
+    def dequeue(self):
+        """Ambil dan hapus data dari depan queue"""
+        self._discard_stale_front()
+        if not self.order:
+            return None
+
+        _, key = self.order.popleft()
+        _, data = self.items.pop(key)
+        self._remove_from_groups(key, data)
+        return data
+
+    def peek(self):
+        """Lihat data di depan tanpa menghapus"""
+        self._discard_stale_front()
+        if not self.order:
+            return None
+        return self.items[self.order[0][1]][1]
+
+    def get(self, key):
+        """Lookup data berdasarkan key"""
+        entry = self.items.get(key)
+        return entry[1] if entry else None
+
+    def contains(self, key):
+        """Cek apakah key ada di queue"""
+        return key in self.items
+
+    def remove(self, key):
+        """Hapus data berdasarkan key (di posisi mana pun)"""
+        entry = self.items.pop(key, None)
+        if entry is None:
+            return None
+
+        self._remove_from_groups(key, entry[1])
+        # Compact deque jika entry basi jauh lebih banyak dari data aktif
+        if len(self.order) > 2 * len(self.items) + 32:
+            self.order = deque(pair for pair in self.order
+                               if self.items.get(pair[1], (None,))[0] == pair[0])
+        return entry[1]
+
+    def _remove_from_groups(self, key, data):
+        for name, func in self.group_funcs.items():
+            value = func(data)
+            members = self.groups[name].get(value)
+            if members is not None:
+                members.pop(key, None)
+                if not members:
+                    del self.groups[name][value]
+
+    def view(self, group, value):
+        """Data dalam satu group (urutan FIFO)"""
+        members = self.groups[group].get(value, {})
+        return [self.items[key][1] for key in members]
+
+    def is_empty(self):
+        """Cek apakah queue kosong"""
+        return not self.items
+
+    def get_size(self):
+        """Dapatkan ukuran queue"""
+        return len(self.items)
+
+    def get_all(self):
+        """Dapatkan semua data dalam queue (urutan FIFO)"""
+        items = self.items
+        return [items[key][1] for seq, key in self.order
+                if key in items and items[key][0] == seq]
+
+    def __len__(self):
+        return len(self.items)
+
+    def __str__(self):
+        return str(self.get_all())
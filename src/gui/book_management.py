@@ -4,7 +4,9 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils import event_bus
 from utils.validator import Validator
+from gui.live_view import tk_dispatcher, upsert_row, delete_row, sync_rows
 
 class BookManagementWindow:
     """Window untuk manajemen buku (admin only)"""
@@ -23,6 +25,15 @@ class BookManagementWindow:
         
         self.create_widgets()
         self.refresh_book_list()
+        
+        # Perubahan buku (dari window mana pun) diterapkan per baris
+        self.subscription = self.library.events.subscribe(
+            self.on_library_event,
+            kinds=(event_bus.BOOK_ADDED, event_bus.BOOK_UPDATED, event_bus.BOOK_DELETED,
+                   event_bus.STOCK_CHANGED, event_bus.RELOADED),
+            dispatch=tk_dispatcher(self.window)
+        )
+        self.window.bind('<Destroy>', self.on_destroy)
     
     def create_widgets(self):
         """Buat komponen UI"""
@@ -130,18 +141,30 @@ class BookManagementWindow:
             command=self.clear_form
         ).pack(fill=tk.X, pady=2)
     
+    @staticmethod
+    def book_values(book):
+        return (book.books_id, book.title, book.author, book.stock)
+    
     def refresh_book_list(self):
-        """Refresh daftar buku"""
-        self.tree.delete(*self.tree.get_children())
-        
+        """Refresh daftar buku (diff terhadap isi tree)"""
         books = self.library.get_all_books()
-        for book in books:
-            self.tree.insert('', tk.END, values=(
-                book.books_id,
-                book.title,
-                book.author,
-                book.stock
-            ))
+        sync_rows(self.tree, [(book.books_id, self.book_values(book)) for book in books])
+    
+    def on_library_event(self, event):
+        """Terapkan ChangeEvent buku ke tree"""
+        if not self.window.winfo_exists():
+            return
+        if event.kind == event_bus.RELOADED:
+            if event.key == 'books':
+                self.refresh_book_list()
+        elif event.kind == event_bus.BOOK_DELETED:
+            delete_row(self.tree, event.key)
+        else:
+            upsert_row(self.tree, event.key, self.book_values(event.item))
+    
+    def on_destroy(self, event):
+        if event.widget is self.window:
+            self.library.events.unsubscribe(self.subscription)
     
     def on_book_select(self, event):
         """Handle pemilihan buku dari tree"""
@@ -226,7 +249,6 @@ class BookManagementWindow:
         
         if success:
             messagebox.showinfo("Success", message)
-            self.refresh_book_list()
             self.clear_form()
             if self.on_update:
                 self.on_update()
@@ -287,7 +309,6 @@ class BookManagementWindow:
         
         if success:
             messagebox.showinfo("Success", message)
-            self.refresh_book_list()
             if self.on_update:
                 self.on_update()
         else:
@@ -310,7 +331,6 @@ class BookManagementWindow:
         
         if success:
             messagebox.showinfo("Success", message)
-            self.refresh_book_list()
             self.clear_form()
             if self.on_update:
                 self.on_update()
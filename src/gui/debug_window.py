@@ -0,0 +1,149 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, scrolledtext
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class DebugWindow:
+    """Panel debug: agregat tracing method Library secara live (admin only)"""
+
+    REFRESH_MS = 1000
+    COLUMNS = (
+        ("method", "Method", 190),
+        ("calls", "Calls", 60),
+        ("avg_ms", "Avg ms", 70),
+        ("p95_ms", "p95 ms", 70),
+        ("max_ms", "Max ms", 70),
+        ("db_ms", "DB ms", 80),
+        ("queries_per_call", "Query/call", 80),
+        ("allocated_per_call", "Alloc/call", 80),
+    )
+
+    def __init__(self, library_system):
+        self.library = library_system
+        self.tracer = library_system.tracer
+
+        if not self.library.is_admin():
+            messagebox.showerror("Error", "Hanya admin yang dapat mengakses fitur ini!")
+            return
+
+        self.window = tk.Toplevel()
+        self.window.title("Debug - Tracing Library")
+        self.window.geometry("820x640")
+        self.refresh_job = None
+
+        self.create_widgets()
+        self.refresh()
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+    def create_widgets(self):
+        """Buat komponen UI"""
+        ttk.Label(
+            self.window,
+            text="🐞 Tracing Library",
+            font=("Arial", 16, "bold")
+        ).pack(pady=10)
+
+        control_frame = ttk.Frame(self.window)
+        control_frame.pack(fill=tk.X, padx=10)
+
+        self.enabled_var = tk.BooleanVar(value=self.tracer.enabled)
+        ttk.Checkbutton(
+            control_frame,
+            text="Tracing aktif",
+            variable=self.enabled_var,
+            command=self.toggle_tracing
+        ).pack(side=tk.LEFT)
+
+        ttk.Button(control_frame, text="Reset", command=self.reset).pack(side=tk.LEFT, padx=10)
+
+        # Agregat per method
+        tree_frame = ttk.Frame(self.window)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        scrollbar = ttk.Scrollbar(tree_frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree = ttk.Treeview(
+            tree_frame,
+            columns=[key for key, _, _ in self.COLUMNS],
+            show='headings',
+            height=12,
+            yscrollcommand=scrollbar.set
+        )
+        for key, title, width in self.COLUMNS:
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=width, anchor=tk.W if key == "method" else tk.E)
+        scrollbar.config(command=self.tree.yview)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        # Capture satu call
+        capture_frame = ttk.LabelFrame(self.window, text="Profil Satu Call", padding="10")
+        capture_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+        form = ttk.Frame(capture_frame)
+        form.pack(fill=tk.X)
+
+        methods = sorted(
+            name for name in dir(type(self.library))
+            if getattr(getattr(type(self.library), name), '__traced__', False)
+        )
+        self.method_var = tk.StringVar(value="search_books" if "search_books" in methods else methods[0])
+        ttk.Combobox(form, textvariable=self.method_var, values=methods, width=28, state="readonly").pack(side=tk.LEFT)
+
+        self.mode_var = tk.StringVar(value="cprofile")
+        for mode in self.tracer.CAPTURE_MODES:
+            ttk.Radiobutton(form, text=mode, value=mode, variable=self.mode_var).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(form, text="Profil call berikutnya", command=self.arm_capture).pack(side=tk.LEFT, padx=5)
+
+        self.capture_text = scrolledtext.ScrolledText(capture_frame, height=12, font=("Courier", 9))
+        self.capture_text.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+        self.shown_capture = None
+
+    def toggle_tracing(self):
+        if self.enabled_var.get():
+            self.tracer.enable()
+        else:
+            self.tracer.disable()
+
+    def reset(self):
+        self.tracer.reset()
+        self.refresh(reschedule=False)
+
+    def arm_capture(self):
+        """Capture call berikutnya (tracing ikut dinyalakan)"""
+        self.tracer.capture_next(self.method_var.get(), self.mode_var.get())
+        self.tracer.enable()
+        self.enabled_var.set(True)
+        self.capture_text.delete(1.0, tk.END)
+        self.capture_text.insert(tk.END, f"Menunggu call {self.method_var.get()} berikutnya...\n")
+
+    def refresh(self, reschedule=True):
+        """Perbarui tabel agregat & laporan capture, lalu jadwalkan ulang"""
+        self.tree.delete(*self.tree.get_children())
+        for row in self.library.get_trace_stats():
+            self.tree.insert('', tk.END, values=(
+                row['method'],
+                row['calls'],
+                f"{row['avg_ms']:.2f}",
+                f"{row['p95_ms']:.2f}",
+                f"{row['max_ms']:.1f}",
+                f"{row['db_ms']:.1f}",
+                f"{row['queries_per_call']:.1f}",
+                f"{row['allocated_per_call']:.0f}"
+            ))
+
+        capture = self.tracer.captures.get(self.method_var.get())
+        if capture and capture is not self.shown_capture:
+            self.shown_capture = capture
+            self.capture_text.delete(1.0, tk.END)
+            self.capture_text.insert(tk.END, f"[{capture['at']}] {capture['mode']}\n\n{capture['report']}")
+
+        if reschedule:
+            self.refresh_job = self.window.after(self.REFRESH_MS, self.refresh)
+
+    def close(self):
+        if self.refresh_job:
+            self.window.after_cancel(self.refresh_job)
+        self.window.destroy()
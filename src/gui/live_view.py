@@ -0,0 +1,79 @@
+import queue
+import threading
+import tkinter as tk
+
+# Helper untuk view yang menerapkan ChangeEvent Library sebagai diff per
+# baris Treeview (iid = primary key baris), bukan hapus-semua lalu muat ulang
+
+def tk_dispatcher(widget, interval=50):
+    """
+    Dispatch untuk EventBus.subscribe (dibuat di thread Tk). Tkinter tidak
+    aman dipanggil dari thread lain, jadi event dari thread lain (mis.
+    change poller) hanya dimasukkan ke queue.Queue; queue dikosongkan oleh
+    after() berulang yang dijadwalkan dari thread Tk setiap interval ms.
+    Event dari thread utama langsung diterapkan setelah antrean lama.
+    """
+    pending = queue.Queue()
+
+    def drain():
+        while True:
+            try:
+                callback, event = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Error menerapkan event {event.kind}: {e}")
+
+    def poll():
+        try:
+            if not widget.winfo_exists():
+                return
+            drain()
+            widget.after(interval, poll)
+        except tk.TclError:
+            # Root sudah dihancurkan: berhenti tanpa menjadwalkan ulang
+            pass
+
+    def dispatch(callback, event):
+        if threading.current_thread() is threading.main_thread():
+            drain()
+            callback(event)
+        else:
+            pending.put((callback, event))
+
+    widget.after(interval, poll)
+    return dispatch
+
+def upsert_row(tree, iid, values, index=tk.END):
+    """Update baris iid jika ada (hanya jika nilainya berubah), selain itu sisipkan"""
+    values = tuple(values)
+    if tree.exists(iid):
+        if tuple(str(value) for value in tree.item(iid, 'values')) != tuple(str(value) for value in values):
+            tree.item(iid, values=values)
+    else:
+        tree.insert('', index, iid=iid, values=values)
+
+def delete_row(tree, iid):
+    """Hapus baris iid jika ada"""
+    if tree.exists(iid):
+        tree.delete(iid)
+
+def sync_rows(tree, rows):
+    """
+    Samakan isi tree dengan rows [(iid, values), ...] secara diff: baris
+    yang hilang dihapus, yang berubah diupdate, yang baru disisipkan sesuai urutan.
+    """
+    order = [str(iid) for iid, _ in rows]
+    wanted = set(order)
+    stale = [iid for iid in tree.get_children() if iid not in wanted]
+    if stale:
+        tree.delete(*stale)
+
+    for iid, values in rows:
+        upsert_row(tree, iid, values)
+
+    # Urutan dibetulkan sekali saja jika memang berbeda
+    if list(tree.get_children()) != order:
+        tree.set_children('', *order)
@@ -4,16 +4,19 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from gui.register_window import RegisterWindow
-
 class LoginWindow:
     """Login window untuk autentikasi user"""
     
-    def __init__(self, library_system, on_login_success):
+    def __init__(self, library_system, on_login_success, root=None):
+        """
+        :param root: Tk root milik aplikasi; login & main window bergantian
+            memakai root yang sama. None = buat root sendiri.
+        """
         self.library = library_system
         self.on_login_success = on_login_success
         
-        self.root = tk.Tk()
+        self.owns_root = root is None
+        self.root = root or tk.Tk()
         self.root.title("Login Sistem Perpustakaan")
         self.root.geometry("450x700")
         self.root.resizable(False, False)
@@ -35,7 +38,7 @@ class LoginWindow:
     def create_widgets(self):
         """Buat komponen UI"""
         # Main frame
-        main_frame = ttk.Frame(self.root, padding="30")
+        main_frame = self.main_frame = ttk.Frame(self.root, padding="30")
         main_frame.pack(fill=tk.BOTH, expand=True)
         
         # Header with icon
@@ -169,16 +172,23 @@ class LoginWindow:
             messagebox.showerror("Error", "Username dan password harus diisi!")
             return
         
-        # Disable button saat proses
+        # Disable button saat proses; verifikasi (KDF) berjalan di background
         self.login_btn.config(state='disabled', text="Memproses...")
-        self.root.update()
+        future = self.library.run_in_background(self.library.login, username, password)
+        self.root.after(50, self.poll_login, future)
+    
+    def poll_login(self, future):
+        """Cek hasil login dari background tanpa memblokir event loop"""
+        if not future.done():
+            self.root.after(50, self.poll_login, future)
+            return
         
         try:
-            success, message = self.library.login(username, password)
+            success, message = future.result()
             
             if success:
                 messagebox.showinfo("Login Berhasil", f"Selamat datang!\n\n{message}")
-                self.root.destroy()
+                self.close()
                 self.on_login_success()
             else:
                 messagebox.showerror("Login Gagal", message)
@@ -193,10 +203,19 @@ class LoginWindow:
     def show_register_form(self):
         """Tampilkan form register"""
         try:
+            from gui.register_window import RegisterWindow
             RegisterWindow(self.library, self.root)
         except Exception as e:
             messagebox.showerror("Error", f"Gagal membuka form registrasi:\n{str(e)}")
     
+    def close(self):
+        """Tutup login (root milik aplikasi tetap hidup untuk main window)"""
+        if self.owns_root:
+            self.root.destroy()
+            return
+        self.root.unbind('<Return>')
+        self.main_frame.destroy()
+    
     def run(self):
         """Jalankan window"""
         self.root.mainloop()
\ No newline at end of file
@@ -2,28 +2,63 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import sys
 import os
+import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from gui.book_management import BookManagementWindow
-from gui.transaction_window import TransactionWindow
-from gui.analytics_window import AnalyticsWindow
+from utils import event_bus
+from gui.live_view import tk_dispatcher, upsert_row, delete_row, sync_rows
+
+# Window admin (kelola buku, transaksi, analytics, debug) diimport saat
+# pertama dibuka, bukan saat aplikasi start
 
 class MainWindow:
     """Main window aplikasi perpustakaan"""
     
-    def __init__(self, library_system, on_logout):
+    # Nama view -> domain data yang dipakai (Library.data_version)
+    VIEW_DOMAINS = {
+        'dashboard': ('books', 'users', 'transactions', 'history'),
+        'books': ('books',),
+        'search': ('books',),
+        'my_transactions': ('transactions', 'books'),
+        'recommendations': ('history', 'books'),
+    }
+    # Jaring pengaman jika perubahan instance lain terlewat (mis. tabel
+    # change_log belum ada): view yang lebih tua dari ini dimuat ulang
+    STALE_SECONDS = 60
+    
+    def __init__(self, library_system, on_logout, root=None):
+        """
+        :param root: Tk root milik aplikasi (dipakai bergantian dengan
+            login window). None = buat root sendiri.
+        """
         self.library = library_system
         self.on_logout = on_logout
         
-        self.root = tk.Tk()
+        self.owns_root = root is None
+        self.root = root or tk.Tk()
         self.root.title("Sistem Perpustakaan - Dashboard")
         self.root.geometry("1000x700")
+        self.root.resizable(True, True)
         
         # Center window
         self.center_window()
         
+        # View dibuat sekali lalu ditukar dengan pack/pack_forget
+        self.views = {}
+        self.current_view = None
+        self.refresh_job = None
+        
         self.create_widgets()
         self.refresh_data()
+        
+        # Perubahan data diterapkan per baris lewat apply_<view>; view tanpa
+        # apply (atau perubahan yang tidak bisa diterapkan) ditandai dirty.
+        # Dispatcher diikat ke frame dashboard, bukan root yang dipakai
+        # ulang: loop drain-nya berhenti saat frame dihancurkan di close()
+        self.subscription = self.library.events.subscribe(
+            self.on_library_event,
+            dispatch=tk_dispatcher(self.frame)
+        )
     
     def center_window(self):
         """Center window di layar"""
@@ -36,8 +71,11 @@ class MainWindow:
     
     def create_widgets(self):
         """Buat komponen UI"""
+        self.frame = ttk.Frame(self.root)
+        self.frame.pack(fill=tk.BOTH, expand=True)
+        
         # Top bar
-        top_frame = ttk.Frame(self.root, padding="10")
+        top_frame = ttk.Frame(self.frame, padding="10")
         top_frame.pack(fill=tk.X)
         
         user_info = f"User: {self.library.current_user.username} ({self.library.current_user.role})"
@@ -54,7 +92,7 @@ class MainWindow:
         ).pack(side=tk.RIGHT)
         
         # Main container
-        main_container = ttk.Frame(self.root)
+        main_container = ttk.Frame(self.frame)
         main_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Left panel - Menu
@@ -78,6 +116,7 @@ class MainWindow:
             menu_buttons.append(("📝 Kelola Buku", self.show_book_management))
             menu_buttons.append(("✅ Proses Transaksi", self.show_transaction_management))
             menu_buttons.append(("📊 Analytics", self.show_analytics))
+            menu_buttons.append(("🐞 Debug", self.show_debug))
         else:
             menu_buttons.append(("📋 Transaksi Saya", self.show_my_transactions))
             menu_buttons.append(("⭐ Rekomendasi", self.show_recommendations))
@@ -95,75 +134,158 @@ class MainWindow:
         self.content_frame = ttk.Frame(main_container)
         self.content_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
     
-    def clear_content(self):
-        """Bersihkan content frame"""
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+    def show_view(self, name, force=False):
+        """
+        Tampilkan view dari cache (dibuat sekali); data dimuat ulang hanya
+        jika versi datanya berubah, ditandai dirty, sudah basi, atau force=True.
+        """
+        view = self.views.get(name)
+        if view is None:
+            frame = ttk.Frame(self.content_frame)
+            getattr(self, f"build_{name}")(frame)
+            view = self.views[name] = {'frame': frame, 'version': None, 'loaded_at': 0.0, 'dirty': False}
+        
+        if self.current_view != name:
+            if self.current_view:
+                self.views[self.current_view]['frame'].pack_forget()
+            view['frame'].pack(fill=tk.BOTH, expand=True)
+            self.current_view = name
+        
+        version = self.library.data_version(*self.VIEW_DOMAINS[name])
+        if (force or view['dirty'] or view['version'] != version
+                or time.monotonic() - view['loaded_at'] > self.STALE_SECONDS):
+            getattr(self, f"load_{name}")()
+            view['version'] = version
+            view['loaded_at'] = time.monotonic()
+            view['dirty'] = False
+    
+    def on_library_event(self, event):
+        """Terapkan ChangeEvent ke view yang sudah dimuat dan memakai domainnya"""
+        for name, view in self.views.items():
+            domains = self.VIEW_DOMAINS[name]
+            if view['version'] is None or view['dirty'] or not set(domains) & set(event.domains):
+                continue
+            
+            apply = getattr(self, f"apply_{name}", None)
+            if apply and apply(event):
+                view['version'] = self.library.data_version(*domains)
+            else:
+                view['dirty'] = True
+        
+        # View yang sedang tampil dan tidak bisa menerapkan diff dimuat ulang
+        # sekali setelah semua event dari satu operasi masuk
+        current = self.views.get(self.current_view)
+        if current and current['dirty'] and self.refresh_job is None:
+            self.refresh_job = self.root.after_idle(self.on_refresh_job)
+    
+    def on_refresh_job(self):
+        self.refresh_job = None
+        self.refresh_data()
     
     def show_dashboard(self):
         """Tampilkan dashboard"""
-        self.clear_content()
-        
+        self.show_view('dashboard')
+    
+    def build_dashboard(self, frame):
         ttk.Label(
-            self.content_frame,
+            frame,
             text="Dashboard",
             font=("Arial", 16, "bold")
         ).pack(pady=10)
         
-        # Statistics
-        stats = self.library.get_statistics()
-        
-        stats_frame = ttk.LabelFrame(self.content_frame, text="Statistik Perpustakaan", padding="20")
+        stats_frame = ttk.LabelFrame(frame, text="Statistik Perpustakaan", padding="20")
         stats_frame.pack(fill=tk.X, padx=10, pady=10)
         
-        info_text = f"""
-Total Buku: {stats['total_books']}
-Buku Tersedia: {stats['available_books']}
-Buku Dipinjam: {stats['borrowed_books']}
-Total User: {stats['total_users']}
-Transaksi Pending: {stats['pending_transactions']}
-        """
-        
-        ttk.Label(
+        self.stats_label = ttk.Label(
             stats_frame,
-            text=info_text,
             font=("Arial", 11),
             justify=tk.LEFT
-        ).pack()
+        )
+        self.stats_label.pack()
         
-        # Popular books
-        popular_frame = ttk.LabelFrame(self.content_frame, text="Buku Populer", padding="20")
-        popular_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.popular_frame = ttk.LabelFrame(frame, text="Buku Populer", padding="20")
+        self.popular_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    
+    def load_dashboard(self):
+        self.dashboard_stats = self.library.get_statistics()
+        self.show_dashboard_stats()
+        
+        for widget in self.popular_frame.winfo_children():
+            widget.destroy()
         
         popular_books = self.library.get_popular_books(5)
+        self.popular_ids = {book.books_id for book, _ in popular_books}
         
         if popular_books:
             for i, (book, count) in enumerate(popular_books, 1):
                 text = f"{i}. {book.title} - Dipinjam {count}x"
                 ttk.Label(
-                    popular_frame,
+                    self.popular_frame,
                     text=text,
                     font=("Arial", 10)
                 ).pack(anchor=tk.W, pady=2)
         else:
             ttk.Label(
-                popular_frame,
+                self.popular_frame,
                 text="Belum ada data peminjaman",
                 font=("Arial", 10)
             ).pack()
     
+    def show_dashboard_stats(self):
+        stats = self.dashboard_stats
+        self.stats_label.config(text=f"""
+Total Buku: {stats['total_books']}
+Buku Tersedia: {stats['available_books']}
+Buku Dipinjam: {stats['borrowed_books']}
+Total User: {stats['total_users']}
+Transaksi Pending: {stats['pending_transactions']}
+        """)
+    
+    def apply_dashboard(self, event):
+        """
+        Perbarui angka statistik dari event tanpa query ulang.
+        :return: False jika daftar buku populer ikut berubah (perlu dimuat ulang).
+        """
+        stats = self.dashboard_stats
+        kind = event.kind
+        
+        if kind in (event_bus.BOOK_ADDED, event_bus.BOOK_DELETED):
+            stats['total_books'] += 1 if kind == event_bus.BOOK_ADDED else -1
+            stats['available_books'] += event.delta
+            complete = event.key not in self.popular_ids
+        elif kind == event_bus.BOOK_UPDATED:
+            stats['available_books'] += event.delta
+            complete = event.key not in self.popular_ids
+        elif kind == event_bus.STOCK_CHANGED:
+            stats['available_books'] += event.delta
+            stats['borrowed_books'] -= event.delta
+            # Peminjaman baru mengubah hitungan buku populer
+            complete = event.delta > 0
+        elif kind in (event_bus.TRANSACTION_ADDED, event_bus.TRANSACTION_PROCESSED):
+            stats['pending_transactions'] = self.library.transaction_queue.get_size()
+            complete = True
+        elif kind == event_bus.USER_ADDED:
+            stats['total_users'] += 1
+            complete = True
+        else:
+            return False
+        
+        self.show_dashboard_stats()
+        return complete
+    
     def show_books(self):
         """Tampilkan daftar buku"""
-        self.clear_content()
-        
+        self.show_view('books')
+    
+    def build_books(self, frame):
         ttk.Label(
-            self.content_frame,
+            frame,
             text="Daftar Buku",
             font=("Arial", 16, "bold")
         ).pack(pady=10)
         
         # Treeview
-        tree_frame = ttk.Frame(self.content_frame)
+        tree_frame = ttk.Frame(frame)
         tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Scrollbar
@@ -172,7 +294,7 @@ Transaksi Pending: {stats['pending_transactions']}
         
         # Treeview
         columns = ("ID", "Title", "Author", "Genre", "Year", "Stock")
-        tree = ttk.Treeview(tree_frame, columns=columns, show='headings', yscrollcommand=scrollbar.set)
+        tree = self.books_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', yscrollcommand=scrollbar.set)
         
         for col in columns:
             tree.heading(col, text=col)
@@ -186,20 +308,8 @@ Transaksi Pending: {stats['pending_transactions']}
         scrollbar.config(command=tree.yview)
         tree.pack(fill=tk.BOTH, expand=True)
         
-        # Load books
-        books = self.library.get_all_books()
-        for book in books:
-            tree.insert('', tk.END, values=(
-                book.books_id,
-                book.title,
-                book.author,
-                book.genre,
-                book.year or "",
-                book.stock
-            ))
-        
         # Actions
-        action_frame = ttk.Frame(self.content_frame)
+        action_frame = ttk.Frame(frame)
         action_frame.pack(fill=tk.X, padx=10, pady=10)
         
         def request_borrow():
@@ -225,18 +335,37 @@ Transaksi Pending: {stats['pending_transactions']}
                 command=request_borrow
             ).pack(side=tk.LEFT, padx=5)
     
+    @staticmethod
+    def book_values(book):
+        return (book.books_id, book.title, book.author, book.genre, book.year or "", book.stock)
+    
+    def load_books(self):
+        books = self.library.get_all_books()
+        sync_rows(self.books_tree, [(book.books_id, self.book_values(book)) for book in books])
+    
+    def apply_books(self, event):
+        """Terapkan perubahan satu buku ke tree (reload penuh tidak diterapkan)"""
+        if event.kind == event_bus.RELOADED:
+            return False
+        if event.kind == event_bus.BOOK_DELETED:
+            delete_row(self.books_tree, event.key)
+        else:
+            upsert_row(self.books_tree, event.key, self.book_values(event.item))
+        return True
+    
     def show_search(self):
         """Tampilkan form pencarian"""
-        self.clear_content()
-        
+        self.show_view('search')
+    
+    def build_search(self, frame):
         ttk.Label(
-            self.content_frame,
+            frame,
             text="Pencarian Buku",
             font=("Arial", 16, "bold")
         ).pack(pady=10)
         
         # Search form
-        search_frame = ttk.Frame(self.content_frame)
+        search_frame = ttk.Frame(frame)
         search_frame.pack(fill=tk.X, padx=10, pady=10)
         
         ttk.Label(search_frame, text="Cari (judul/penulis/genre/ISBN):").pack(side=tk.LEFT, padx=5)
@@ -244,35 +373,20 @@ Transaksi Pending: {stats['pending_transactions']}
         search_entry.pack(side=tk.LEFT, padx=5)
         
         # Results
-        results_frame = ttk.Frame(self.content_frame)
+        results_frame = ttk.Frame(frame)
         results_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        results_text = scrolledtext.ScrolledText(results_frame, height=20, font=("Arial", 10))
-        results_text.pack(fill=tk.BOTH, expand=True)
+        self.search_results = scrolledtext.ScrolledText(results_frame, height=20, font=("Arial", 10))
+        self.search_results.pack(fill=tk.BOTH, expand=True)
+        self.last_search = None
         
         def do_search():
             query = search_entry.get().strip()
             if not query:
                 messagebox.showwarning("Warning", "Masukkan kata kunci pencarian!")
                 return
-            
-            results = self.library.search_books(query)
-            results_text.delete(1.0, tk.END)
-            
-            if results:
-                results_text.insert(tk.END, f"Ditemukan {len(results)} buku:\n\n")
-                for book in results:
-                    info = f"ID: {book.books_id}\n"
-                    info += f"Judul: {book.title}\n"
-                    info += f"Penulis: {book.author}\n"
-                    info += f"Genre: {book.genre}\n"
-                    info += f"Tahun: {book.year or '-'}\n"
-                    info += f"Stock: {book.stock}\n"
-                    info += f"Status: {'Tersedia' if book.is_available() else 'Tidak Tersedia'}\n"
-                    info += "-" * 60 + "\n\n"
-                    results_text.insert(tk.END, info)
-            else:
-                results_text.insert(tk.END, "Tidak ada buku yang ditemukan.")
+            self.last_search = query
+            self.load_search()
         
         ttk.Button(
             search_frame,
@@ -282,69 +396,118 @@ Transaksi Pending: {stats['pending_transactions']}
         
         search_entry.bind('<Return>', lambda e: do_search())
     
+    def load_search(self):
+        """Jalankan ulang pencarian terakhir (jika ada) dengan data terbaru"""
+        if not self.last_search:
+            return
+        
+        results = self.library.search_books(self.last_search)
+        results_text = self.search_results
+        results_text.delete(1.0, tk.END)
+        
+        if results:
+            results_text.insert(tk.END, f"Ditemukan {len(results)} buku:\n\n")
+            for book in results:
+                info = f"ID: {book.books_id}\n"
+                info += f"Judul: {book.title}\n"
+                info += f"Penulis: {book.author}\n"
+                info += f"Genre: {book.genre}\n"
+                info += f"Tahun: {book.year or '-'}\n"
+                info += f"Stock: {book.stock}\n"
+                info += f"Status: {'Tersedia' if book.is_available() else 'Tidak Tersedia'}\n"
+                info += "-" * 60 + "\n\n"
+                results_text.insert(tk.END, info)
+        else:
+            results_text.insert(tk.END, "Tidak ada buku yang ditemukan.")
+    
     def show_book_management(self):
         """Tampilkan window manajemen buku (admin only)"""
-        BookManagementWindow(self.library, self.refresh_data)
+        from gui.book_management import BookManagementWindow
+        BookManagementWindow(self.library)
     
     def show_transaction_management(self):
         """Tampilkan window manajemen transaksi (admin only)"""
-        TransactionWindow(self.library, self.refresh_data)
+        from gui.transaction_window import TransactionWindow
+        TransactionWindow(self.library)
     
     def show_analytics(self):
         """Tampilkan window analytics (admin only)"""
+        from gui.analytics_window import AnalyticsWindow
         AnalyticsWindow(self.library)
     
+    def show_debug(self):
+        """Tampilkan panel debug tracing (admin only)"""
+        from gui.debug_window import DebugWindow
+        DebugWindow(self.library)
+    
     def show_my_transactions(self):
         """Tampilkan transaksi user"""
-        self.clear_content()
-        
+        self.show_view('my_transactions')
+    
+    def build_my_transactions(self, frame):
         ttk.Label(
-            self.content_frame,
+            frame,
             text="Transaksi Saya",
             font=("Arial", 16, "bold")
         ).pack(pady=10)
         
+        self.transactions_text = scrolledtext.ScrolledText(frame, height=25, font=("Arial", 10))
+        self.transactions_empty = ttk.Label(
+            frame,
+            text="Belum ada transaksi",
+            font=("Arial", 11)
+        )
+    
+    def load_my_transactions(self):
         history = self.library.get_user_history()
-        
-        if history:
-            text_widget = scrolledtext.ScrolledText(self.content_frame, height=25, font=("Arial", 10))
-            text_widget.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-            
-            for item in reversed(history):
-                trans = item.get('transaction')
-                if trans:
-                    book = self.library.get_book(trans.book_id)
-                    if book:
-                        info = f"Transaksi ID: {trans.transaction_id}\n"
-                        info += f"Buku: {book.title}\n"
-                        info += f"Tipe: {trans.type}\n"
-                        info += f"Status: {trans.status}\n"
-                        info += f"Waktu: {trans.timestamp}\n"
-                        info += "-" * 60 + "\n\n"
-                        text_widget.insert(tk.END, info)
-        else:
-            ttk.Label(
-                self.content_frame,
-                text="Belum ada transaksi",
-                font=("Arial", 11)
-            ).pack(pady=50)
+        text_widget = self.transactions_text
+        text_widget.delete(1.0, tk.END)
+        
+        if not history:
+            text_widget.pack_forget()
+            self.transactions_empty.pack(pady=50)
+            return
+        
+        self.transactions_empty.pack_forget()
+        text_widget.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Judul buku sudah ikut di hasil JOIN get_user_history
+        for item in reversed(history):
+            trans = item.get('transaction')
+            if trans:
+                info = f"Transaksi ID: {trans.transaction_id}\n"
+                info += f"Buku: {item['book_title']}\n"
+                info += f"Tipe: {trans.type}\n"
+                info += f"Status: {trans.status}\n"
+                info += f"Waktu: {trans.timestamp}\n"
+                info += "-" * 60 + "\n\n"
+                text_widget.insert(tk.END, info)
     
     def show_recommendations(self):
         """Tampilkan rekomendasi buku"""
-        self.clear_content()
-        
+        self.show_view('recommendations')
+    
+    def build_recommendations(self, frame):
         ttk.Label(
-            self.content_frame,
+            frame,
             text="Rekomendasi Buku",
             font=("Arial", 16, "bold")
         ).pack(pady=10)
         
+        self.recommendations_frame = ttk.Frame(frame)
+        self.recommendations_frame.pack(fill=tk.BOTH, expand=True)
+    
+    def load_recommendations(self):
+        container = self.recommendations_frame
+        for widget in container.winfo_children():
+            widget.destroy()
+        
         recommendations = self.library.get_recommendations(10)
         
         if recommendations:
             for book, score in recommendations:
                 book_frame = ttk.LabelFrame(
-                    self.content_frame,
+                    container,
                     text=book.title,
                     padding="10"
                 )
@@ -358,22 +521,36 @@ Transaksi Pending: {stats['pending_transactions']}
                 ttk.Label(book_frame, text=info).pack(anchor=tk.W)
         else:
             ttk.Label(
-                self.content_frame,
+                container,
                 text="Belum ada rekomendasi. Pinjam beberapa buku terlebih dahulu!",
                 font=("Arial", 11)
             ).pack(pady=50)
     
     def refresh_data(self):
-        """Refresh tampilan data"""
-        self.show_dashboard()
+        """Refresh view yang sedang tampil (dimuat ulang jika datanya berubah)"""
+        self.show_view(self.current_view or 'dashboard')
     
     def handle_logout(self):
         """Handle logout"""
         if messagebox.askyesno("Logout", "Yakin ingin logout?"):
             self.library.logout()
-            self.root.destroy()
+            self.close()
             self.on_logout()
     
+    def close(self):
+        """Tutup dashboard beserta window admin yang masih terbuka"""
+        self.library.events.unsubscribe(self.subscription)
+        if self.refresh_job:
+            self.root.after_cancel(self.refresh_job)
+            self.refresh_job = None
+        if self.owns_root:
+            self.root.destroy()
+            return
+        for widget in self.root.winfo_children():
+            if isinstance(widget, tk.Toplevel):
+                widget.destroy()
+        self.frame.destroy()
+    
     def run(self):
         """Jalankan window"""
         self.root.mainloop()
\ No newline at end of file
@@ -306,13 +306,19 @@ class RegisterWindow:
         username = self.username_entry.get().strip()
         password = self.password_entry.get()
         
-        # Disable button saat proses
+        # Disable button saat proses; hashing (KDF) berjalan di background
         self.register_btn.config(state='disabled', text="Memproses...")
-        self.window.update()
+        future = self.library.run_in_background(self.library.register_user, username, password, 'member')
+        self.window.after(50, self.poll_register, future, username)
+    
+    def poll_register(self, future, username):
+        """Cek hasil registrasi dari background tanpa memblokir event loop"""
+        if not future.done():
+            self.window.after(50, self.poll_register, future, username)
+            return
         
         try:
-            # Register user
-            success, message = self.library.register_user(username, password, 'member')
+            success, message = future.result()
             
             if success:
                 messagebox.showinfo(
@@ -345,6 +351,10 @@ if __name__ == "__main__":
         def register_user(self, username, password, role):
             print(f"Mock register: {username}, {password}, {role}")
             return True, "Registrasi berhasil (mock)"
+        
+        def run_in_background(self, func, *args):
+            from concurrent.futures import ThreadPoolExecutor
+            return ThreadPoolExecutor(max_workers=1).submit(func, *args)
     
     mock_lib = MockLibrary()
     app = RegisterWindow(mock_lib)
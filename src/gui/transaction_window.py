@@ -4,6 +4,9 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils import event_bus
+from gui.live_view import tk_dispatcher, upsert_row, delete_row, sync_rows
+
 class TransactionWindow:
     """Window untuk manajemen transaksi (admin only)"""
     
@@ -18,9 +21,19 @@ class TransactionWindow:
         self.window = tk.Toplevel()
         self.window.title("Manajemen Transaksi")
         self.window.geometry("800x600")
+        self.loading_refresh_job = None
         
         self.create_widgets()
         self.refresh_transaction_list()
+        
+        # Transaksi baru/selesai diterapkan per baris, tanpa memuat ulang list
+        self.subscription = self.library.events.subscribe(
+            self.on_library_event,
+            kinds=(event_bus.TRANSACTION_ADDED, event_bus.TRANSACTION_PROCESSED,
+                   event_bus.BOOK_UPDATED, event_bus.RELOADED),
+            dispatch=tk_dispatcher(self.window)
+        )
+        self.window.bind('<Destroy>', self.on_destroy)
     
     def create_widgets(self):
         """Buat komponen UI"""
@@ -106,27 +119,83 @@ class TransactionWindow:
         
         self.tree.bind('<<TreeviewSelect>>', self.on_transaction_select)
     
+    def transaction_values(self, trans):
+        book = self.library.get_book(trans.book_id)
+        book_title = book.title if book else "Unknown"
+        return (
+            trans.transaction_id,
+            trans.user_id,
+            trans.book_id,
+            book_title,
+            trans.type,
+            trans.timestamp
+        )
+    
     def refresh_transaction_list(self):
-        """Refresh daftar transaksi"""
-        self.tree.delete(*self.tree.get_children())
-        self.details_text.delete(1.0, tk.END)
+        """Refresh daftar transaksi (diff terhadap isi tree)"""
+        # Ambil juga transaksi baru dari instance lain
+        self.library.refresh_pending_transactions()
         
-        transactions = self.library.get_pending_transactions()
+        transactions, state = self.library.get_pending_transactions(include_state=True)
+        sync_rows(self.tree, [(trans.transaction_id, self.transaction_values(trans)) for trans in transactions])
         
-        self.info_label.config(text=f"Total transaksi pending: {len(transactions)}")
+        selection = self.tree.selection()
+        if not selection:
+            self.details_text.delete(1.0, tk.END)
+        self.update_info(state)
+    
+    def update_info(self, state=None):
+        """Perbarui label jumlah transaksi pending"""
+        if state is None:
+            _, state = self.library.get_pending_transactions(include_state=True)
+        
+        info = f"Total transaksi pending: {len(self.tree.get_children())}"
+        if not state['complete']:
+            # Startup lazy masih memuat transaksi lama di background
+            total = state['total'] if state['total'] is not None else "?"
+            info += f" (memuat {state['loaded']}/{total}...)"
+            self.schedule_loading_refresh()
+        self.info_label.config(text=info)
+    
+    def on_library_event(self, event):
+        """Terapkan ChangeEvent transaksi/buku ke tree"""
+        if not self.window.winfo_exists():
+            return
         
-        for trans in transactions:
-            book = self.library.get_book(trans.book_id)
-            book_title = book.title if book else "Unknown"
-            
-            self.tree.insert('', tk.END, values=(
-                trans.transaction_id,
-                trans.user_id,
-                trans.book_id,
-                book_title,
-                trans.type,
-                trans.timestamp
-            ))
+        if event.kind == event_bus.TRANSACTION_ADDED:
+            upsert_row(self.tree, event.key, self.transaction_values(event.item))
+            self.update_info()
+        elif event.kind == event_bus.TRANSACTION_PROCESSED:
+            if str(event.key) in self.tree.selection():
+                self.details_text.delete(1.0, tk.END)
+            delete_row(self.tree, event.key)
+            self.update_info()
+        elif event.kind == event_bus.BOOK_UPDATED:
+            # Judul buku ikut tampil di setiap transaksinya
+            for iid in self.tree.get_children():
+                if str(self.tree.set(iid, "Book ID")) == str(event.key):
+                    self.tree.set(iid, "Book Title", event.item.title)
+        elif event.key == 'transactions':
+            self.refresh_transaction_list()
+    
+    def schedule_loading_refresh(self):
+        """Refresh ulang selama transaksi pending masih dimuat"""
+        if self.loading_refresh_job is None:
+            self.loading_refresh_job = self.window.after(1000, self.on_loading_refresh)
+    
+    def on_loading_refresh(self):
+        """Callback refresh berkala saat startup lazy"""
+        self.loading_refresh_job = None
+        if self.window.winfo_exists():
+            self.refresh_transaction_list()
+    
+    def on_destroy(self, event):
+        if event.widget is not self.window:
+            return
+        self.library.events.unsubscribe(self.subscription)
+        if self.loading_refresh_job:
+            self.window.after_cancel(self.loading_refresh_job)
+            self.loading_refresh_job = None
     
     def on_transaction_select(self, event):
         """Handle pemilihan transaksi"""
@@ -140,12 +209,7 @@ class TransactionWindow:
         book_id = values[2]
         
         # Get details
-        transactions = self.library.get_pending_transactions()
-        trans = None
-        for t in transactions:
-            if t.transaction_id == trans_id:
-                trans = t
-                break
+        trans = self.library.get_pending_transaction(trans_id)
         
         if not trans:
             return
@@ -171,6 +235,7 @@ class TransactionWindow:
             details += f"Author: {book.author}\n"
             details += f"Genre: {book.genre}\n"
             details += f"Current Stock: {book.stock}\n"
+            details += f"Reserved: {book.reserved}\n"
             details += f"Available: {'Yes' if book.is_available() else 'No'}\n"
         
         self.details_text.delete(1.0, tk.END)
@@ -198,11 +263,10 @@ class TransactionWindow:
         
         success, message = self.library.process_transaction()
         
+        # Baris transaksi dihapus oleh event TRANSACTION_PROCESSED
         if success:
             messagebox.showinfo("Success", message)
-            self.refresh_transaction_list()
             if self.on_update:
                 self.on_update()
         else:
-            messagebox.showerror("Error", message)
-            self.refresh_transaction_list()
\ No newline at end of file
+            messagebox.showerror("Error", message)
\ No newline at end of file
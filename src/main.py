@@ -11,29 +11,54 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from models.library import Library
-from gui.login_window import LoginWindow
-from gui.main_window import MainWindow
+from utils.database_connector import SQLiteConnector
+
+# Modul GUI diimport saat dibutuhkan: tkinter & login window saat start(),
+# MainWindow baru setelah login berhasil
 
 class LibraryApplication:
     """Main application class"""
     
     def __init__(self):
-        self.library = Library()
+        # Lazy startup: login window tampil dulu, data dimuat di background
+        # (dari snapshot kolumnar jika masih sesuai dengan database)
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        
+        # PERPUSTAKAAN_DB=sqlite untuk berjalan tanpa server MySQL
+        db = None
+        if os.environ.get('PERPUSTAKAAN_DB') == 'sqlite':
+            db = SQLiteConnector(os.path.join(data_dir, 'perpustakaan.db'))
+        
+        # PERPUSTAKAAN_TRACE=1 untuk mengaktifkan tracing sejak startup
+        self.library = Library(
+            lazy_startup=True, snapshot_path=os.path.join(data_dir, 'library.snapshot'), db=db,
+            trace=os.environ.get('PERPUSTAKAAN_TRACE') == '1'
+        )
+        # Perubahan dari desktop lain (change_log) diterapkan di background
+        self.library.start_change_poller()
         self.start()
     
     def start(self):
-        """Start aplikasi dengan login window"""
-        login_window = LoginWindow(self.library, self.on_login_success)
-        login_window.run()
+        """Start aplikasi: satu Tk root untuk seluruh siklus login/logout"""
+        import tkinter as tk
+        
+        self.root = tk.Tk()
+        self.show_login()
+        self.root.mainloop()
+    
+    def show_login(self):
+        """Tampilkan login window di root aplikasi"""
+        from gui.login_window import LoginWindow
+        LoginWindow(self.library, self.on_login_success, root=self.root)
     
     def on_login_success(self):
         """Callback setelah login berhasil"""
-        main_window = MainWindow(self.library, self.on_logout)
-        main_window.run()
+        from gui.main_window import MainWindow
+        MainWindow(self.library, self.on_logout, root=self.root)
     
     def on_logout(self):
-        """Callback setelah logout"""
-        self.start()
+        """Callback setelah logout: kembali ke login tanpa root/mainloop baru"""
+        self.show_login()
 
 def main():
     """Entry point aplikasi"""
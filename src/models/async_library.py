@@ -0,0 +1,261 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import socket
+import uuid
+
+try:
+    import aiomysql
+except ImportError:
+    aiomysql = None
+
+from models.book import Book
+from models.user import User
+from models.session import Session
+from utils.encryption import PasswordEncryption
+from utils.database_connector import DatabaseConnector
+
+class AsyncLibrary:
+    """Facade asyncio untuk Library (web/kiosk dengan banyak sesi bersamaan)
+
+    - Query lewat connection pool aiomysql, tidak ada koneksi global
+    - State user tidak disimpan di instance: login mengembalikan Session
+      yang dikirim eksplisit ke operasi berikutnya
+    - Verifikasi password (KDF, CPU bound) dijalankan di pool PasswordEncryption
+    """
+
+    def __init__(self, host="localhost", user="root", password="",
+                 database="perpustakaan_db", minsize=1, maxsize=20):
+        self.config = {
+            'host': host,
+            'user': user,
+            'password': password,
+            'db': database,
+            'minsize': minsize,
+            'maxsize': maxsize,
+            'autocommit': True
+        }
+        self.pool = None
+
+        # Asal entri change_log, agar instance Library lain menyusul write
+        # dari facade ini (lihat Library.poll_changes)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.change_log_enabled = True
+
+    async def connect(self):
+        """Buat connection pool"""
+        if aiomysql is None:
+            raise ImportError("AsyncLibrary membutuhkan paket aiomysql (pip install aiomysql)")
+        self.pool = await aiomysql.create_pool(**self.config)
+
+        if await self.execute_query("SELECT MAX(change_id) FROM change_log", fetch='one') is None:
+            print("Tabel change_log tidak ditemukan (jalankan data/migrations/002_change_log.sql); "
+                  "write AsyncLibrary tidak terlihat oleh instance lain")
+            self.change_log_enabled = False
+        return True
+
+    async def close(self):
+        """Tutup connection pool"""
+        if self.pool:
+            self.pool.close()
+            await self.pool.wait_closed()
+            self.pool = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def execute_query(self, query, params=None, fetch=None, row_factory=tuple):
+        """
+        Versi async DatabaseConnector.execute_query (tuple cursor).
+        :param fetch: 'one', 'all', 'rowcount' atau None (lastrowid).
+        :param row_factory: tuple atau model dengan COLUMNS & from_row.
+        """
+        if not self.pool:
+            await self.connect()
+
+        try:
+            async with self.pool.acquire() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(query, params or ())
+                    if fetch == 'one':
+                        row = await cursor.fetchone()
+                        convert = DatabaseConnector.make_row_converter(cursor.description, row_factory)
+                        return convert(row) if row and convert else row
+                    if fetch == 'all':
+                        rows = await cursor.fetchall()
+                        convert = DatabaseConnector.make_row_converter(cursor.description, row_factory)
+                        return [convert(row) for row in rows] if convert else list(rows)
+                    if fetch == 'rowcount':
+                        return cursor.rowcount
+                    return cursor.lastrowid
+        except aiomysql.Error as e:
+            print(f"Error saat menjalankan query: {e}")
+            return None
+
+    async def _log_change(self, entity, entity_id, action):
+        """Catat satu write ke change_log (sama dengan Library._log_change)"""
+        if not self.change_log_enabled:
+            return
+        await self.execute_query(
+            "INSERT INTO change_log (entity, entity_id, action, origin) VALUES (%s, %s, %s, %s)",
+            (entity, entity_id, action, self.worker_id)
+        )
+
+    # ==================== USER MANAGEMENT ====================
+
+    async def login(self, username, password):
+        """
+        Login user.
+        :return: (success, message, Session atau None)
+        """
+        user = await self.execute_query(
+            "SELECT * FROM users WHERE username = %s", (username,), fetch='one', row_factory=User
+        )
+        if not user:
+            return False, "Username tidak ditemukan", None
+
+        valid = await asyncio.wrap_future(PasswordEncryption.submit(
+            PasswordEncryption.verify_password_entry, password, user.password_hash
+        ))
+        if not valid:
+            return False, "Password salah", None
+
+        if PasswordEncryption.needs_rehash(user.password_hash):
+            new_entry = await asyncio.wrap_future(PasswordEncryption.submit(
+                PasswordEncryption.create_password_entry, password
+            ))
+            updated = await self.execute_query(
+                "UPDATE users SET password_hash = %s WHERE user_id = %s AND password_hash = %s",
+                (new_entry, user.user_id, user.password_hash),
+                fetch='rowcount'
+            )
+            if updated:
+                user.password_hash = new_entry
+        return True, f"Login berhasil sebagai {user.role}", Session(user)
+
+    # ==================== BOOK MANAGEMENT ====================
+
+    async def search_books(self, query):
+        """Pencarian multi-kriteria"""
+        like_query = f"%{query}%"
+        results = await self.execute_query(
+            """
+                SELECT * FROM books
+                WHERE title LIKE %s OR author LIKE %s OR genre LIKE %s OR isbn LIKE %s
+                ORDER BY title
+            """,
+            (like_query, like_query, like_query, like_query),
+            fetch='all',
+            row_factory=Book
+        ) or []
+
+        try:
+            book = await self.get_book(int(query))
+            # Tiap query membuat objek Book baru: bandingkan ID, bukan objeknya
+            if book and all(found.books_id != book.books_id for found in results):
+                results.append(book)
+        except ValueError:
+            pass
+        return results
+
+    async def get_book(self, book_id):
+        """Dapatkan buku berdasarkan ID"""
+        return await self.execute_query(
+            "SELECT * FROM books WHERE books_id = %s", (book_id,), fetch='one', row_factory=Book
+        )
+
+    # ==================== TRANSACTION MANAGEMENT ====================
+
+    async def request_borrow(self, book_id, session=None):
+        """Request peminjaman buku untuk user sesi (urutan argumen sama dengan Library)"""
+        if not session:
+            return False, "Anda harus login terlebih dahulu"
+        if not session.has_permission('request_transactions'):
+            return False, "Anda tidak memiliki akses untuk mengajukan transaksi"
+
+        book = await self.get_book(book_id)
+        if not book:
+            return False, "Buku tidak ditemukan"
+
+        if not book.is_available():
+            return False, "Buku tidak tersedia"
+
+        # Pesanan atomik yang sama dengan Library.request_borrow
+        reserved = await self.execute_query(
+            "UPDATE books SET reserved = reserved + 1 WHERE books_id = %s AND stock - reserved > 0",
+            (book_id,),
+            fetch='rowcount'
+        )
+        if reserved != 1:
+            return False, "Buku tidak tersedia"
+        await self._log_change('books', book_id, 'update')
+
+        trans_id = await self.execute_query(
+            "INSERT INTO transactions (user_id, book_id, type, status) VALUES (%s, %s, %s, %s)",
+            (session.user_id, book_id, 'borrow', 'pending')
+        )
+        if not trans_id:
+            await self.execute_query(
+                "UPDATE books SET reserved = reserved - 1 WHERE books_id = %s AND reserved > 0", (book_id,)
+            )
+            await self._log_change('books', book_id, 'update')
+            return False, "Gagal mengajukan permintaan"
+        await self._log_change('transactions', trans_id, 'insert')
+        return True, "Permintaan peminjaman berhasil diajukan"
+
+    async def request_return(self, book_id, session=None):
+        """Request pengembalian buku untuk user sesi (urutan argumen sama dengan Library)"""
+        if not session:
+            return False, "Anda harus login terlebih dahulu"
+        if not session.has_permission('request_transactions'):
+            return False, "Anda tidak memiliki akses untuk mengajukan transaksi"
+
+        borrowed = await self.execute_query(
+            "SELECT history_id FROM history WHERE user_id = %s AND book_id = %s AND return_date IS NULL",
+            (session.user_id, book_id),
+            fetch='one'
+        )
+        if not borrowed:
+            return False, "Anda tidak sedang meminjam buku ini"
+
+        trans_id = await self.execute_query(
+            "INSERT INTO transactions (user_id, book_id, type, status) VALUES (%s, %s, %s, %s)",
+            (session.user_id, book_id, 'return', 'pending')
+        )
+        if not trans_id:
+            return False, "Gagal mengajukan permintaan"
+        await self._log_change('transactions', trans_id, 'insert')
+        return True, "Permintaan pengembalian berhasil diajukan"
+
+    # ==================== ANALYTICS ====================
+
+    async def _scalar(self, query):
+        row = await self.execute_query(query, fetch='one')
+        return row[0] if row and row[0] is not None else 0
+
+    async def get_statistics(self):
+        """Dapatkan statistik perpustakaan (query berjalan paralel di pool)"""
+        (total_books, total_users, available_books, borrowed_books,
+         pending_transactions, genre_rows) = await asyncio.gather(
+            self._scalar("SELECT COUNT(*) FROM books"),
+            self._scalar("SELECT COUNT(*) FROM users"),
+            self._scalar("SELECT SUM(stock) FROM books"),
+            self._scalar("SELECT COUNT(*) FROM history WHERE return_date IS NULL"),
+            self._scalar("SELECT COUNT(*) FROM transactions WHERE status = 'pending'"),
+            self.execute_query("SELECT genre, COUNT(*) FROM books GROUP BY genre", fetch='all')
+        )
+
+        return {
+            'total_books': total_books,
+            'available_books': available_books,
+            'borrowed_books': borrowed_books,
+            'total_users': total_users,
+            'pending_transactions': pending_transactions,
+            'genre_distribution': {genre or "Unknown": count for genre, count in genre_rows or []}
+        }
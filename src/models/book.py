@@ -1,8 +1,12 @@
 class Book:
     """Model untuk buku"""
     
+    # Urutan kolom sama dengan tabel `books` (dipakai oleh from_row)
+    COLUMNS = ('books_id', 'isbn', 'title', 'author', 'genre', 'year', 'stock', 'description', 'reserved')
+    __slots__ = COLUMNS
+    
     def __init__(self, books_id, title, author="", isbn="", genre="", 
-                year=None, stock=1, description=""):
+                year=None, stock=1, description="", reserved=0):
         self.books_id = books_id
         self.isbn = isbn
         self.title = title
@@ -11,6 +15,7 @@ class Book:
         self.year = year
         self.stock = stock
         self.description = description
+        self.reserved = reserved    # Salinan yang dipesan permintaan pinjam pending
     
     def to_dict(self):
         """Convert ke dictionary"""
@@ -22,7 +27,8 @@ class Book:
             'genre': self.genre,
             'year': self.year,
             'stock': self.stock,
-            'description': self.description
+            'description': self.description,
+            'reserved': self.reserved
         }
     
     @staticmethod
@@ -36,17 +42,39 @@ class Book:
             genre=data.get('genre', ''),
             year=data.get('year'),
             stock=data.get('stock', 1),
-            description=data.get('description', '')
+            description=data.get('description', ''),
+            reserved=data.get('reserved', 0)
         )
     
+    @staticmethod
+    def from_row(row):
+        """Create Book dari tuple baris database (urutan sesuai COLUMNS)"""
+        book = Book.__new__(Book)
+        (book.books_id, book.isbn, book.title, book.author,
+         book.genre, book.year, book.stock, book.description, book.reserved) = row
+        return book
+    
     def is_available(self):
-        """Cek apakah buku tersedia"""
-        return self.stock > 0
+        """Cek apakah masih ada salinan yang belum dipesan"""
+        return self.stock - self.reserved > 0
+    
+    def reserve(self):
+        """Pesan satu salinan untuk permintaan pinjam pending"""
+        if self.is_available():
+            self.reserved += 1
+            return True
+        return False
+    
+    def release(self):
+        """Lepas satu pesanan (permintaan ditolak/dibatalkan)"""
+        if self.reserved > 0:
+            self.reserved -= 1
     
     def borrow(self):
-        """Kurangi stock saat dipinjam"""
+        """Kurangi stock (dan pesanannya) saat dipinjam"""
         if self.stock > 0:
             self.stock -= 1
+            self.release()
             return True
         return False
     
@@ -57,10 +85,10 @@ class Book:
     def matches_search(self, query):
         """Cek apakah buku cocok dengan query pencarian"""
         query_lower = query.lower()
-        return (query_lower in self.title.lower() or
-                query_lower in self.author.lower() or
-                query_lower in self.genre.lower() or
-                query_lower in self.isbn.lower())
+        return (query_lower in (self.title or '').lower() or
+                query_lower in (self.author or '').lower() or
+                query_lower in (self.genre or '').lower() or
+                query_lower in (self.isbn or '').lower())
     
     def __str__(self):
         return f"{self.title} by {self.author} ({self.year})"
@@ -0,0 +1,117 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_structures.bst import BST
+from data_structures.hash_table import HashTable
+
+# Batas bawah/atas untuk range search pada key komposit (nilai, books_id)
+_MIN_ID = float('-inf')
+_MAX_ID = float('inf')
+
+class CatalogIndex:
+    """Index katalog buku di memori (Hash Table + BST)
+
+    - HashTable by books_id dan isbn untuk lookup O(1)
+    - BST by title, author dan year untuk traversal terurut dan range search
+
+    Key BST berupa tuple (nilai, books_id) supaya judul/penulis/tahun
+    yang sama tidak saling menimpa.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Kosongkan semua index"""
+        self.by_id = HashTable()
+        self.by_isbn = HashTable()
+        self.by_title = BST()
+        self.by_author = BST()
+        self.by_year = BST()
+        self.loaded = False
+
+    @staticmethod
+    def _text_key(value):
+        return (value or '').lower()
+
+    def load(self, books):
+        """Bangun ulang index dari iterable Book"""
+        self.clear()
+        for book in books:
+            self.add(book)
+        self.loaded = True
+
+    def add(self, book):
+        """Tambahkan buku ke semua index"""
+        if self.by_id.contains(book.books_id):
+            self.remove(book.books_id)
+
+        self.by_id.insert(book.books_id, book)
+        if book.isbn:
+            self.by_isbn.insert(book.isbn, book)
+        self.by_title.insert((self._text_key(book.title), book.books_id), book)
+        self.by_author.insert((self._text_key(book.author), book.books_id), book)
+        if book.year is not None:
+            self.by_year.insert((book.year, book.books_id), book)
+
+    def remove(self, books_id):
+        """Hapus buku dari semua index"""
+        book = self.by_id.search(books_id)
+        if not book:
+            return False
+
+        self.by_id.delete(books_id)
+        if book.isbn and self.by_isbn.search(book.isbn) is book:
+            self.by_isbn.delete(book.isbn)
+        self.by_title.delete((self._text_key(book.title), books_id))
+        self.by_author.delete((self._text_key(book.author), books_id))
+        if book.year is not None:
+            self.by_year.delete((book.year, books_id))
+        return True
+
+    def update(self, book):
+        """Sinkronkan index setelah data buku berubah"""
+        self.remove(book.books_id)
+        self.add(book)
+
+    def get(self, books_id):
+        """Lookup buku berdasarkan books_id"""
+        return self.by_id.search(books_id)
+
+    def get_by_isbn(self, isbn):
+        """Lookup buku berdasarkan ISBN"""
+        return self.by_isbn.search(isbn) if isbn else None
+
+    def all_by_title(self):
+        """Semua buku terurut berdasarkan judul"""
+        return [book for _, book in self.by_title.inorder_traversal()]
+
+    def find_by_title(self, title):
+        """Buku dengan judul persis (case-insensitive)"""
+        key = self._text_key(title)
+        return [book for _, book in self.by_title.range_search((key, _MIN_ID), (key, _MAX_ID))]
+
+    def find_by_author(self, author):
+        """Buku dengan penulis persis (case-insensitive)"""
+        key = self._text_key(author)
+        return [book for _, book in self.by_author.range_search((key, _MIN_ID), (key, _MAX_ID))]
+
+    def range_by_year(self, min_year, max_year):
+        """Buku dengan tahun terbit di antara min_year dan max_year (inklusif)"""
+        return [book for _, book in self.by_year.range_search((min_year, _MIN_ID), (max_year, _MAX_ID))]
+
+    def search(self, query):
+        """Pencarian multi-kriteria (judul/penulis/genre/ISBN), hasil terurut judul"""
+        results = [book for book in self.all_by_title() if book.matches_search(query)]
+
+        try:
+            book = self.get(int(query))
+            if book and book not in results:
+                results.append(book)
+        except ValueError:
+            pass
+        return results
+
+    def __len__(self):
+        return len(self.by_id)
@@ -2,83 +2,292 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from data_structures.queue import Queue
+from data_structures.indexed_queue import IndexedQueue
 from data_structures.stack import Stack
 from data_structures.graph import Graph
 from models.book import Book
+from models.catalog_index import CatalogIndex
 from models.user import User
 from models.transaction import Transaction, BorrowHistory
+from models.session import Session
 from utils.encryption import PasswordEncryption
-from utils.database_connector import DatabaseConnector
-from datetime import datetime
+from utils.database_connector import DatabaseConnector, QueryError
+from utils.file_handler import FileHandler
+from utils.tracing import Tracer, trace_public_methods
+from utils import event_bus
+from utils.event_bus import EventBus, ChangeEvent
+from datetime import datetime, timedelta
+from operator import attrgetter
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import time
+import uuid
 
+def _select_columns(alias, model):
+    """Daftar kolom eksplisit (alias.kolom, ...) sesuai urutan model.COLUMNS"""
+    return ", ".join(f"{alias}.{column}" for column in model.COLUMNS)
+
+# Tabel yang boleh diexport penuh -> (model, primary key); users tidak
+# termasuk karena berisi password hash
+EXPORT_TABLES = {
+    'books': (Book, 'books_id'),
+    'transactions': (Transaction, 'transaction_id'),
+    'history': (BorrowHistory, 'history_id'),
+}
+
+# Isi snapshot startup: tabel -> (query, kolom, tipe kolom 'i'/'s');
+# password hash sengaja tidak ikut ditulis ke disk
+SNAPSHOT_TABLES = {
+    'books': (
+        f"SELECT {_select_columns('books', Book)} FROM books ORDER BY books_id",
+        Book.COLUMNS, ('i', 's', 's', 's', 's', 'i', 'i', 's', 'i')
+    ),
+    'users': (
+        "SELECT user_id, username, role, created_at FROM users ORDER BY user_id",
+        ('user_id', 'username', 'role', 'created_at'), ('i', 's', 's', 's')
+    ),
+    'history': (
+        f"SELECT {_select_columns('history', BorrowHistory)} FROM history ORDER BY history_id",
+        BorrowHistory.COLUMNS, ('i', 'i', 'i', 's', 's')
+    ),
+}
+
+# Hasil process_transaction jika klaim instance ini diambil alih admin lain
+LEASE_LOST_MESSAGE = "Transaksi sudah diambil alih admin lain (klaim kedaluwarsa)"
+
+# Domain data yang versinya dilacak (lihat Library.data_version)
+DATA_DOMAINS = ('books', 'users', 'transactions', 'history')
+
+@trace_public_methods(exclude=('is_admin', 'run_in_background', 'wait_until_ready',
+                               'get_query_stats', 'get_trace_stats', 'data_version',
+                               'start_change_poller', 'stop_change_poller'))
 class Library:
     """Sistem perpustakaan utama dengan semua fitur"""
     
-    def __init__(self):
+    def __init__(self, lazy_startup=False, pending_page_size=500, claim_lease_seconds=60, pool_size=None,
+                 snapshot_path=None, db=None, trace=False):
+        """
+        :param lazy_startup: True untuk langsung kembali dan memuat data
+            (koneksi, catalog index, transaksi pending) di background thread.
+        :param pending_page_size: Jumlah transaksi pending per halaman saat dimuat.
+        :param claim_lease_seconds: Lama klaim transaksi oleh instance ini
+            sebelum boleh diambil alih instance admin lain.
+        :param pool_size: Ukuran connection pool jika banyak sesi dilayani
+            dari thread berbeda (None = satu koneksi bersama).
+        :param snapshot_path: File snapshot kolumnar untuk startup cepat
+            (catalog index & graph rekomendasi dibangun dari mmap, bukan
+            query per baris). None = selalu memuat dari database.
+        :param db: Connector yang sudah dibuat (mis. SQLiteConnector);
+            None = MySQL lokal XAMPP.
+        :param trace: Aktifkan tracing method publik sejak awal (bisa
+            dinyalakan nanti lewat tracer.enable()).
+        """
+        started = time.perf_counter()
+        
         # Data structures
-        self.transaction_queue = Queue()
+        self.transaction_queue = IndexedQueue(
+            key_func=attrgetter('transaction_id'),
+            groups={'user': attrgetter('user_id'), 'type': attrgetter('type')}
+        )
         self.history_stack = Stack()
         self.recommendation_graph = Graph()
+        self.catalog_index = CatalogIndex()
+        
+        # State startup & sinkronisasi dengan background loader
+        self._state_lock = threading.RLock()
+        self._queue_lock = threading.RLock()
+        self._background = None     # Thread pool untuk run_in_background
+        
+        # Versi data per domain, naik setiap ada perubahan lewat instance ini;
+        # view GUI memuat ulang hanya jika versi yang dipakainya berubah
+        self._data_versions = dict.fromkeys(DATA_DOMAINS, 0)
+        
+        # Event perubahan per baris untuk view yang menerapkan diff
+        self.events = EventBus()
+        
+        self.snapshot_path = snapshot_path
+        self.snapshot_handler = None
+        if snapshot_path:
+            self.snapshot_handler = FileHandler(os.path.dirname(os.path.abspath(snapshot_path)))
+        self._index_loading = False
+        self._index_backlog = set()
+        self._pending_loading = False
+        self._pending_loaded = 0
+        self._pending_total = None
+        self._deferred_transactions = []
+        self.pending_page_size = pending_page_size
+        self.startup_error = None
+        self._startup_thread = None
+        
+        # Identitas instance untuk klaim transaksi (multi-admin) dan asal
+        # entri change_log
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.claim_lease_seconds = claim_lease_seconds
         
-        # Database Connector
-        self.db = DatabaseConnector(
+        # Sinkronisasi perubahan dari instance lain lewat tabel change_log
+        self.change_log_enabled = True
+        self._last_change_id = None     # None = posisi awal belum dibaca
+        self._poller_thread = None
+        self._poller_stop = threading.Event()
+        
+        # Database Connector (default MySQL, backend lain bisa disuntikkan)
+        self.db = db or DatabaseConnector(
             host="localhost",
             user="root",
             password="",
-            database="perpustakaan_db" # ✅ FIXED: Menggunakan nama database yang konsisten
+            database="perpustakaan_db", # ✅ FIXED: Menggunakan nama database yang konsisten
+            pool_size=pool_size
         )
-        if not self.db.connect():
-            raise ConnectionError("Gagal terhubung ke database. Pastikan XAMPP MySQL berjalan dan database ada.")
         
-        # Current user
+        # Tracing method publik (wall time, waktu & jumlah query, alokasi)
+        self.tracer = Tracer(self.db.stats, enabled=trace)
+        
+        # Current user (mode satu user/GUI); operasi multi-user memakai Session
         self.current_user = None
+        self.current_session = None
+        
+        if lazy_startup:
+            # Koneksi utama dibuka saat query pertama; data dimuat di background
+            self._pending_loading = True
+            self._index_loading = True
+            self._startup_thread = threading.Thread(
+                target=self._lazy_startup, name="library-startup", daemon=True
+            )
+            self._startup_thread.start()
+            self._log_phase("init (lazy)", started)
+            return
+        
+        phase = time.perf_counter()
+        if not self.db.connect():
+            raise ConnectionError("Gagal terhubung ke database. Pastikan XAMPP MySQL berjalan dan database ada.")
+        self._log_phase("connect", phase)
         
         # Load data
         self.initialize_data()
+        self._log_phase("total", started)
     
     # ==================== USER MANAGEMENT ====================
     
     def register_user(self, username, password, role='member'):
         """Register user baru"""
+        return self._create_user(self.db, username, password, role)
+    
+    def _create_user(self, db, username, password, role):
+        """Insert user baru lewat connector tertentu"""
         query_check = "SELECT user_id FROM users WHERE username = %s"
-        if self.db.execute_query(query_check, (username,), fetch='one'):
+        if db.execute_query(query_check, (username,), fetch='one'):
             return False, "Username sudah digunakan"
         
-        password_entry = PasswordEncryption.create_password_entry(password)
+        # KDF dihitung di pool bersama sehingga registrasi bersamaan tidak antre
+        password_entry = PasswordEncryption.submit(
+            PasswordEncryption.create_password_entry, password
+        ).result()
         
         query_insert = "INSERT INTO users (username, password_hash, role) VALUES (%s, %s, %s)"
-        user_id = self.db.execute_query(query_insert, (username, password_entry, role))
+        user_id = db.execute_query(query_insert, (username, password_entry, role))
+        if user_id:
+            self._log_change('users', user_id, 'insert', db)
+            self._bump_version('users')
+            self._publish(event_bus.USER_ADDED, user_id)
         
         return (True, "Registrasi berhasil") if user_id else (False, "Gagal mendaftar ke database.")
     
-    def login(self, username, password):
-        """Login user"""
+    def create_session(self, username, password):
+        """
+        Autentikasi user tanpa mengubah state Library.
+        :return: (success, message, Session atau None)
+        """
         query = "SELECT * FROM users WHERE username = %s"
-        user_data = self.db.execute_query(query, (username,), fetch='one')
+        user = self.db.execute_query(query, (username,), fetch='one', row_factory=User)
         
-        if user_data:
-            user = User.from_dict(user_data)
-            password_hash, salt = PasswordEncryption.parse_password_entry(user.password_hash)
-            if password_hash and PasswordEncryption.verify_password(password, password_hash, salt):
-                self.current_user = user
-                return True, f"Login berhasil sebagai {user.role}"
-            return False, "Password salah"
-        return False, "Username tidak ditemukan"
+        if user:
+            valid = PasswordEncryption.submit(
+                PasswordEncryption.verify_password_entry, password, user.password_hash
+            ).result()
+            if not valid:
+                return False, "Password salah", None
+            if PasswordEncryption.needs_rehash(user.password_hash):
+                self._rehash_password(user, password)
+            return True, f"Login berhasil sebagai {user.role}", Session(user)
+        if self.startup_error:
+            return False, self.startup_error, None
+        return False, "Username tidak ditemukan", None
+    
+    def _rehash_password(self, user, password):
+        """Upgrade entry password lama/cost rendah ke KDF sekarang (saat login)"""
+        new_entry = PasswordEncryption.submit(
+            PasswordEncryption.create_password_entry, password
+        ).result()
+        # Hanya ganti jika entry belum diubah login lain di antaranya
+        updated = self.db.execute_query(
+            "UPDATE users SET password_hash = %s WHERE user_id = %s AND password_hash = %s",
+            (new_entry, user.user_id, user.password_hash),
+            fetch='rowcount'
+        )
+        if updated:
+            user.password_hash = new_entry
+    
+    def data_version(self, *domains):
+        """
+        Versi data untuk domain tertentu ('books', 'users', 'transactions',
+        'history'); tuple berubah setiap ada perubahan lewat instance ini.
+        """
+        versions = self._data_versions
+        return tuple(versions[domain] for domain in domains or DATA_DOMAINS)
+    
+    def _bump_version(self, *domains):
+        with self._state_lock:
+            for domain in domains:
+                self._data_versions[domain] += 1
+    
+    def _publish(self, kind, key, item=None, delta=0):
+        """Publikasikan satu ChangeEvent ke subscriber self.events"""
+        self.events.publish(ChangeEvent(kind, key, item, delta))
+    
+    def run_in_background(self, func, *args, **kwargs):
+        """
+        Jalankan operasi Library (mis. login, register_user) di thread pool
+        agar event loop GUI tidak tertahan KDF/query.
+        :return: concurrent.futures.Future
+        """
+        with self._state_lock:
+            if self._background is None:
+                self._background = ThreadPoolExecutor(max_workers=4, thread_name_prefix='library')
+        return self._background.submit(func, *args, **kwargs)
+    
+    def login(self, username, password):
+        """Login user (mode satu user: sesi disimpan sebagai current_user)"""
+        success, message, session = self.create_session(username, password)
+        if success:
+            self.current_session = session
+            self.current_user = session.user
+        return success, message
     
     def logout(self):
         """Logout user"""
         self.current_user = None
+        self.current_session = None
+    
+    def _session_user(self, session=None):
+        """User dari sesi eksplisit, atau current_user jika sesi tidak diberikan"""
+        return session.user if session else self.current_user
+    
+    def is_admin(self, session=None):
+        """Cek apakah user sesi (atau current user) adalah admin"""
+        user = self._session_user(session)
+        return bool(user and user.is_admin())
     
-    def is_admin(self):
-        """Cek apakah current user adalah admin"""
-        return self.current_user and self.current_user.is_admin()
+    def has_permission(self, permission, session=None):
+        """Cek hak akses sesi (atau sesi current user), lihat ROLE_PERMISSIONS"""
+        session = session or self.current_session
+        return bool(session and session.has_permission(permission))
     
     # ==================== BOOK MANAGEMENT ====================
     
-    def add_book(self, title, author="", isbn="", genre="", year=None, stock=1, description=""):
+    def add_book(self, title, author="", isbn="", genre="", year=None, stock=1, description="", session=None):
         """Tambah buku baru (admin only)"""
-        if not self.is_admin():
+        if not self.has_permission('manage_books', session):
             return False, "Hanya admin yang dapat menambah buku"
         
         query = """
@@ -88,15 +297,24 @@ class Library:
         params = (title, author, isbn, genre, year, stock, description)
         book_id = self.db.execute_query(query, params)
         
-        return (True, "Buku berhasil ditambahkan") if book_id else (False, "Gagal menambahkan buku.")
+        if not book_id:
+            return False, "Gagal menambahkan buku."
+        
+        self._log_change('books', book_id, 'insert')
+        book = Book(book_id, title, author, isbn, genre, year, stock, description)
+        self._sync_catalog_index(book_id, book)
+        self._publish(event_bus.BOOK_ADDED, book_id, book, delta=stock)
+        return True, "Buku berhasil ditambahkan"
     
-    def update_book(self, book_id, **kwargs):
+    def update_book(self, book_id, session=None, **kwargs):
         """Update data buku"""
-        if not self.is_admin():
+        if not self.has_permission('manage_books', session):
             return False, "Hanya admin yang dapat mengupdate buku"
         
-        if not self.get_book(book_id):
+        old_book = self.get_book(book_id)
+        if not old_book:
             return False, "Buku tidak ditemukan"
+        old_stock = old_book.stock
         
         fields = []
         params = []
@@ -111,22 +329,37 @@ class Library:
         params.append(book_id)
         query = f"UPDATE books SET {', '.join(fields)} WHERE books_id = %s"
         self.db.execute_query(query, tuple(params))
+        self._log_change('books', book_id, 'update')
+        book = self._fetch_book(book_id)
+        self._sync_catalog_index(book_id, book, deleted=book is None)
+        if book:
+            self._publish(event_bus.BOOK_UPDATED, book_id, book, delta=book.stock - old_stock)
         return True, "Buku berhasil diupdate."
     
-    def delete_book(self, book_id):
+    def delete_book(self, book_id, session=None):
         """Hapus buku"""
-        if not self.is_admin():
+        if not self.has_permission('manage_books', session):
             return False, "Hanya admin yang dapat menghapus buku"
         
-        if not self.get_book(book_id):
+        book = self.get_book(book_id)
+        if not book:
             return False, "Buku tidak ditemukan"
         
         query = "DELETE FROM books WHERE books_id = %s"
         self.db.execute_query(query, (book_id,))
+        self._log_change('books', book_id, 'delete')
+        self._sync_catalog_index(book_id, deleted=True)
+        self._publish(event_bus.BOOK_DELETED, book_id, book, delta=-book.stock)
         return True, "Buku berhasil dihapus"
     
     def search_books(self, query):
         """Pencarian multi-kriteria"""
+        # Dibaca di bawah _state_lock: change poller mengubah index dari
+        # thread lain (update = remove + add, BST bisa sedang dirotasi)
+        with self._state_lock:
+            if self.catalog_index.loaded:
+                return self.catalog_index.search(query)
+        
         results = []
         sql_query = """
             SELECT * FROM books 
@@ -135,9 +368,9 @@ class Library:
         like_query = f"%{query}%"
         params = (like_query, like_query, like_query, like_query)
         
-        books_data = self.db.execute_query(sql_query, params, fetch='all')
-        if books_data:
-            results.extend([Book.from_dict(data) for data in books_data])
+        books = self.db.execute_query(sql_query, params, fetch='all', row_factory=Book)
+        if books:
+            results.extend(books)
 
         try:
             book_id = int(query)
@@ -150,47 +383,173 @@ class Library:
     
     def get_all_books(self):
         """Dapatkan semua buku"""
-        books_data = self.db.execute_query("SELECT * FROM books ORDER BY title", fetch='all')
-        return [Book.from_dict(data) for data in books_data] if books_data else []
+        with self._state_lock:
+            if self.catalog_index.loaded:
+                return self.catalog_index.all_by_title()
+        
+        try:
+            return list(self.db.stream_query("SELECT * FROM books ORDER BY title", row_factory=Book))
+        except QueryError as e:
+            print(e)
+            return []
     
     def get_book(self, book_id):
         """Dapatkan buku berdasarkan ID"""
-        book_data = self.db.execute_query("SELECT * FROM books WHERE books_id = %s", (book_id,), fetch='one')
-        return Book.from_dict(book_data) if book_data else None
+        with self._state_lock:
+            if self.catalog_index.loaded:
+                try:
+                    return self.catalog_index.get(int(book_id))
+                except (TypeError, ValueError):
+                    return None
+        
+        return self._fetch_book(book_id)
+    
+    def get_books_by_year_range(self, min_year, max_year):
+        """Dapatkan buku dengan tahun terbit dalam range (inklusif)"""
+        with self._state_lock:
+            if self.catalog_index.loaded:
+                return self.catalog_index.range_by_year(min_year, max_year)
+        
+        return self.db.execute_query(
+            "SELECT * FROM books WHERE year BETWEEN %s AND %s ORDER BY year, books_id",
+            (min_year, max_year),
+            fetch='all',
+            row_factory=Book
+        ) or []
+    
+    def _fetch_book(self, book_id, db=None):
+        """Ambil buku langsung dari database (tanpa index)"""
+        db = db or self.db
+        return db.execute_query("SELECT * FROM books WHERE books_id = %s", (book_id,), fetch='one', row_factory=Book)
+    
+    def _sync_catalog_index(self, book_id, book=None, deleted=False):
+        """Sinkronkan satu buku di catalog index setelah write"""
+        # Snapshot lokal langsung dibuang; instance lain mengenalinya basi
+        # dari change_id di fingerprint
+        self._invalidate_snapshot()
+        self._bump_version('books')
+        
+        with self._state_lock:
+            if self._index_loading:
+                # Index sedang dibangun di background, terapkan setelah selesai
+                self._index_backlog.add(book_id)
+                return
+        
+        if not self.catalog_index.loaded:
+            return
+        
+        if not deleted and book is None:
+            book = self._fetch_book(book_id)
+        
+        with self._state_lock:
+            if book and not deleted:
+                self.catalog_index.update(book)
+            else:
+                self.catalog_index.remove(book_id)
+    
+    def load_catalog_index(self, db=None, books=None):
+        """
+        Bangun catalog index (BST + Hash Table) dari tabel books.
+        :param books: Iterable Book alternatif (mis. dari snapshot).
+        """
+        db = db or self.db
+        with self._state_lock:
+            self._index_loading = True
+        
+        # Index baru dibangun terpisah lalu ditukar, sehingga pembaca tidak
+        # pernah melihat index setengah jadi
+        index = CatalogIndex()
+        try:
+            if books is None:
+                books = db.stream_query("SELECT * FROM books", row_factory=Book)
+            index.load(books)
+        except QueryError as e:
+            print(f"{e}\nGagal memuat catalog index, pencarian memakai database")
+            with self._state_lock:
+                self._index_loading = False
+                self._index_backlog = set()
+            return False
+        
+        while True:
+            with self._state_lock:
+                backlog = self._index_backlog
+                self._index_backlog = set()
+                if not backlog:
+                    self.catalog_index = index
+                    self._index_loading = False
+                    break
+            
+            for book_id in backlog:
+                book = self._fetch_book(book_id, db)
+                if book:
+                    index.update(book)
+                else:
+                    index.remove(book_id)
+        
+        self._bump_version('books')
+        self._publish(event_bus.RELOADED, 'books')
+        print(f"Catalog index dimuat: {len(self.catalog_index)} buku")
+        return True
     
     # ==================== TRANSACTION MANAGEMENT ====================
     
-    def request_borrow(self, book_id):
+    def request_borrow(self, book_id, session=None):
         """Request peminjaman buku"""
-        if not self.current_user:
+        user = self._session_user(session)
+        if not user:
             return False, "Anda harus login terlebih dahulu"
+        if not self.has_permission('request_transactions', session):
+            return False, "Anda tidak memiliki akses untuk mengajukan transaksi"
         
         book = self.get_book(book_id)
         if not book:
             return False, "Buku tidak ditemukan"
         
+        # Salinan di catalog index jadi peta ketersediaan: buku yang semua
+        # salinannya sudah dipesan ditolak tanpa round-trip ke database
         if not book.is_available():
             return False, "Buku tidak tersedia"
         
+        # Pesan satu salinan secara atomik: permintaan bersamaan (juga dari
+        # instance lain) tidak bisa memesan melebihi stock
+        reserved = self.db.execute_query(
+            "UPDATE books SET reserved = reserved + 1 WHERE books_id = %s AND stock - reserved > 0",
+            (book_id,),
+            fetch='rowcount'
+        )
+        if reserved != 1:
+            # Salinan lokal basi: segarkan dari database
+            self._sync_catalog_index(book_id)
+            return False, "Buku tidak tersedia"
+        self._log_change('books', book_id, 'update')
+        book.reserve()
+        
         query = "INSERT INTO transactions (user_id, book_id, type, status) VALUES (%s, %s, %s, %s)"
-        params = (self.current_user.user_id, book_id, 'borrow', 'pending')  # ✅ FIXED: Tipe transaksi harus 'borrow'
+        params = (user.user_id, book_id, 'borrow', 'pending')  # ✅ FIXED: Tipe transaksi harus 'borrow'
         trans_id = self.db.execute_query(query, params)
         
         if not trans_id:
+            self._release_reservation(book)
             return False, "Gagal mengajukan permintaan"
+        self._log_change('transactions', trans_id, 'insert')
+        self._sync_catalog_index(book_id, book)
+        self._publish(event_bus.BOOK_UPDATED, book_id, book)
 
-        transaction = Transaction(trans_id, self.current_user.user_id, book_id, 'borrow')  # ✅ FIXED: Tipe transaksi harus 'borrow'
-        self.transaction_queue.enqueue(transaction)
+        transaction = Transaction(trans_id, user.user_id, book_id, 'borrow')  # ✅ FIXED: Tipe transaksi harus 'borrow'
+        self._enqueue_transaction(transaction)
         return True, "Permintaan peminjaman berhasil diajukan"
     
-    def request_return(self, book_id):
+    def request_return(self, book_id, session=None):
         """Request pengembalian buku"""
-        if not self.current_user:
+        user = self._session_user(session)
+        if not user:
             return False, "Anda harus login terlebih dahulu"
+        if not self.has_permission('request_transactions', session):
+            return False, "Anda tidak memiliki akses untuk mengajukan transaksi"
         
         history_data = self.db.execute_query( # Menggunakan tabel 'history'
             "SELECT * FROM history WHERE user_id = %s AND book_id = %s AND return_date IS NULL",
-            (self.current_user.user_id, book_id),
+            (user.user_id, book_id),
             fetch='one'
         )
         
@@ -198,61 +557,105 @@ class Library:
             return False, "Anda tidak sedang meminjam buku ini"
         
         query = "INSERT INTO transactions (user_id, book_id, type, status) VALUES (%s, %s, %s, %s)"
-        params = (self.current_user.user_id, book_id, 'return', 'pending')
+        params = (user.user_id, book_id, 'return', 'pending')
         trans_id = self.db.execute_query(query, params)
         
         if not trans_id:
             return False, "Gagal mengajukan permintaan"
+        self._log_change('transactions', trans_id, 'insert')
         
-        transaction = Transaction(trans_id, self.current_user.user_id, book_id, 'return')
-        self.transaction_queue.enqueue(transaction)
+        transaction = Transaction(trans_id, user.user_id, book_id, 'return')
+        self._enqueue_transaction(transaction)
         return True, "Permintaan pengembalian berhasil diajukan"
     
-    def process_transaction(self):
+    def process_transaction(self, session=None):
         """Process transaksi dari queue (admin only)"""
-        if not self.is_admin():
+        if not self.has_permission('process_transactions', session):
             return False, "Hanya admin yang dapat memproses transaksi"
         
-        if self.transaction_queue.is_empty():
+        transaction = self._claim_next_transaction()
+        if transaction is None:
             return False, "Tidak ada transaksi untuk diproses"
         
-        transaction = self.transaction_queue.dequeue()
         book = self.get_book(transaction.book_id)
         
         if not book:
-            self.db.execute_query("UPDATE transactions SET status = 'failed' WHERE transaction_id = %s", (transaction.transaction_id,))
+            if not self._finish_transaction(transaction, 'failed'):
+                return False, LEASE_LOST_MESSAGE
             return False, f"Buku dengan ID {transaction.book_id} tidak ditemukan. Transaksi dibatalkan."
         
         if transaction.is_borrow():
-            if book.borrow():
-                transaction.approve()
-                
-                # Update di DB
-                self.db.execute_query("UPDATE books SET stock = stock - 1 WHERE books_id = %s", (book.books_id,))
-                self.db.execute_query("UPDATE transactions SET status = 'approved' WHERE transaction_id = %s", (transaction.transaction_id,))
-                self.db.execute_query("INSERT INTO history (user_id, book_id) VALUES (%s, %s)", (transaction.user_id, transaction.book_id)) # Menggunakan tabel 'history'
-
-                # Save to stack for undo
-                self.history_stack.push({
-                    'action': 'borrow',
-                    'transaction': transaction
-                })
-                
-                # Update recommendation graph
-                self._update_recommendation_graph(transaction.user_id, transaction.book_id)
-                return True, "Peminjaman berhasil diproses"
-            else:
-                transaction.reject()
-                self.db.execute_query("UPDATE transactions SET status = 'rejected' WHERE transaction_id = %s", (transaction.transaction_id,))
+            # Decrement bersyarat: stock tidak pernah negatif walau banyak
+            # admin; pesanan dari request_borrow ikut dipakai
+            stock_updated = self.db.execute_query(
+                "UPDATE books SET stock = stock - 1, reserved = reserved - 1 WHERE books_id = %s AND stock > 0 AND reserved > 0",
+                (book.books_id,),
+                fetch='rowcount'
+            )
+            used_reservation = stock_updated == 1
+            if not used_reservation:
+                # Transaksi lama (sebelum ada kolom reserved) tanpa pesanan
+                stock_updated = self.db.execute_query(
+                    "UPDATE books SET stock = stock - 1 WHERE books_id = %s AND stock > 0",
+                    (book.books_id,),
+                    fetch='rowcount'
+                )
+            if stock_updated != 1:
+                if not self._finish_transaction(transaction, 'rejected'):
+                    return False, LEASE_LOST_MESSAGE
+                self._release_reservation(book)
                 return False, "Buku tidak tersedia"
+            
+            if not self._finish_transaction(transaction, 'approved'):
+                # Klaim sudah diambil alih admin lain: batalkan tepat yang
+                # tadi dikurangi, efek samping dijalankan oleh pemilik klaim
+                self.db.execute_query(
+                    "UPDATE books SET stock = stock + 1, reserved = reserved + %s WHERE books_id = %s",
+                    (1 if used_reservation else 0, book.books_id)
+                )
+                return False, LEASE_LOST_MESSAGE
+            
+            self._log_change('books', book.books_id, 'update')
+            book.borrow()
+            self._sync_catalog_index(book.books_id, book)
+            self._bump_version('history')
+            self._publish(event_bus.STOCK_CHANGED, book.books_id, book, delta=-1)
+            
+            # Update di DB
+            self.db.execute_query("INSERT INTO history (user_id, book_id) VALUES (%s, %s)", (transaction.user_id, transaction.book_id)) # Menggunakan tabel 'history'
+
+            # Save to stack for undo
+            self.history_stack.push({
+                'action': 'borrow',
+                'transaction': transaction
+            })
+            
+            # Update recommendation graph
+            self._update_recommendation_graph(transaction.user_id, transaction.book_id)
+            return True, "Peminjaman berhasil diproses"
         
         elif transaction.is_return():
+            # Database dulu; salinan lokal & event hanya setelah semua berhasil
+            stock_updated = self.db.execute_query(
+                "UPDATE books SET stock = stock + 1 WHERE books_id = %s",
+                (book.books_id,),
+                fetch='rowcount'
+            )
+            if stock_updated != 1:
+                if not self._finish_transaction(transaction, 'failed'):
+                    return False, LEASE_LOST_MESSAGE
+                return False, "Gagal memperbarui stock buku. Transaksi dibatalkan."
+            
+            if not self._finish_transaction(transaction, 'approved'):
+                self.db.execute_query("UPDATE books SET stock = stock - 1 WHERE books_id = %s", (book.books_id,))
+                return False, LEASE_LOST_MESSAGE
+            
+            self._log_change('books', book.books_id, 'update')
             book.return_book()
-            transaction.approve()
+            self._sync_catalog_index(book.books_id, book)
+            self._bump_version('history')
+            self._publish(event_bus.STOCK_CHANGED, book.books_id, book, delta=1)
             
-            # Update di DB
-            self.db.execute_query("UPDATE books SET stock = stock + 1 WHERE books_id = %s", (book.books_id,))
-            self.db.execute_query("UPDATE transactions SET status = 'approved' WHERE transaction_id = %s", (transaction.transaction_id,))
             self.db.execute_query("UPDATE history SET return_date = %s WHERE user_id = %s AND book_id = %s AND return_date IS NULL", (datetime.now(), transaction.user_id, transaction.book_id)) # Menggunakan tabel 'history'
             
             self.history_stack.push({
@@ -261,39 +664,242 @@ class Library:
             })
             return True, "Pengembalian berhasil diproses"
         
+        if not self._finish_transaction(transaction, 'failed'):
+            return False, LEASE_LOST_MESSAGE
         return False, "Jenis transaksi tidak valid"
     
-    def get_pending_transactions(self):
-        """Dapatkan semua transaksi pending"""
-        return self.transaction_queue.get_all()
+    def _release_reservation(self, book):
+        """Lepas pesanan satu salinan (permintaan pinjam gagal/ditolak)"""
+        self.db.execute_query(
+            "UPDATE books SET reserved = reserved - 1 WHERE books_id = %s AND reserved > 0",
+            (book.books_id,)
+        )
+        self._log_change('books', book.books_id, 'update')
+        book.release()
+        self._sync_catalog_index(book.books_id, book)
+        self._publish(event_bus.BOOK_UPDATED, book.books_id, book)
+    
+    def _claim_transaction(self, transaction):
+        """
+        Klaim transaksi pending di database untuk instance ini.
+        UPDATE bersyarat bersifat atomik, jadi hanya satu admin yang menang;
+        klaim yang lease-nya habis (instance mati) boleh diambil alih.
+        """
+        now = datetime.now()
+        claimed = self.db.execute_query(
+            """
+                UPDATE transactions SET claimed_by = %s, claim_expires = %s
+                WHERE transaction_id = %s AND status = 'pending'
+                AND (claimed_by IS NULL OR claimed_by = %s OR claim_expires < %s)
+            """,
+            (self.worker_id, now + timedelta(seconds=self.claim_lease_seconds),
+             transaction.transaction_id, self.worker_id, now),
+            fetch='rowcount'
+        )
+        return claimed == 1
+    
+    def _claim_next_transaction(self):
+        """Ambil transaksi terdepan yang berhasil diklaim instance ini"""
+        while True:
+            with self._queue_lock:
+                transaction = self.transaction_queue.dequeue()
+            
+            if transaction is None or self._claim_transaction(transaction):
+                return transaction
+            # Sudah diklaim/diproses admin lain: cukup buang dari queue lokal
+            self._drop_transaction(transaction)
+    
+    def _drop_transaction(self, transaction):
+        """Beritahu view bahwa transaksi keluar dari queue tanpa diproses instance ini"""
+        self._bump_version('transactions')
+        self._publish(event_bus.TRANSACTION_PROCESSED, transaction.transaction_id, transaction)
     
-    def get_user_history(self, user_id=None):
+    def _finish_transaction(self, transaction, status):
+        """
+        Simpan status akhir transaksi yang sedang diklaim instance ini.
+        :return: False jika klaim sudah diambil alih admin lain (lease habis);
+            caller tidak boleh menjalankan efek samping transaksi.
+        """
+        finished = self.db.execute_query(
+            """
+                UPDATE transactions SET status = %s, claim_expires = NULL
+                WHERE transaction_id = %s AND claimed_by = %s AND status = 'pending'
+            """,
+            (status, transaction.transaction_id, self.worker_id),
+            fetch='rowcount'
+        )
+        if finished != 1:
+            self._drop_transaction(transaction)
+            return False
+        
+        transaction.status = status
+        self._log_change('transactions', transaction.transaction_id, 'update')
+        self._bump_version('transactions')
+        self._publish(event_bus.TRANSACTION_PROCESSED, transaction.transaction_id, transaction)
+        return True
+    
+    def _enqueue_transaction(self, transaction):
+        """Masukkan transaksi baru ke queue (ditunda selama transaksi lama dimuat)"""
+        with self._queue_lock:
+            if self._pending_loading:
+                self._deferred_transactions.append(transaction)
+            else:
+                self.transaction_queue.enqueue(transaction)
+        self._bump_version('transactions')
+        self._publish(event_bus.TRANSACTION_ADDED, transaction.transaction_id, transaction)
+    
+    def get_pending_transactions(self, include_state=False):
+        """
+        Dapatkan semua transaksi pending.
+        :param include_state: True untuk juga mengembalikan status pemuatan
+            {'complete', 'loaded', 'total'} selama startup lazy masih berjalan.
+        """
+        with self._queue_lock:
+            transactions = self.transaction_queue.get_all()
+            state = {
+                'complete': not self._pending_loading,
+                'loaded': self._pending_loaded,
+                'total': self._pending_total
+            }
+        
+        if include_state:
+            return transactions, state
+        return transactions
+    
+    def get_pending_transaction(self, transaction_id):
+        """Dapatkan transaksi pending berdasarkan ID (O(1))"""
+        with self._queue_lock:
+            return self.transaction_queue.get(transaction_id)
+    
+    def get_pending_by_user(self, user_id):
+        """Transaksi pending milik satu user (urutan FIFO)"""
+        with self._queue_lock:
+            return self.transaction_queue.view('user', user_id)
+    
+    def get_pending_by_type(self, trans_type):
+        """Transaksi pending dengan tipe 'borrow' atau 'return' (urutan FIFO)"""
+        with self._queue_lock:
+            return self.transaction_queue.view('type', trans_type)
+    
+    def refresh_pending_transactions(self):
+        """
+        Ambil transaksi pending yang lebih baru dari transaction_id terakhir
+        di queue (mis. dibuat oleh instance lain), ditambah transaksi yang
+        klaimnya sudah kedaluwarsa: pemiliknya mati sebelum selesai, jadi
+        transaksi yang sempat dibuang dari queue lokal boleh diambil alih.
+        :return: Jumlah transaksi baru yang masuk queue.
+        """
+        with self._queue_lock:
+            if self._pending_loading:
+                return 0
+            last_seen_id = self.transaction_queue.max_key or 0
+        
+        transactions = self.db.execute_query(
+            """
+                SELECT * FROM transactions
+                WHERE status = 'pending' AND (transaction_id > %s OR claim_expires < %s)
+                ORDER BY transaction_id
+            """,
+            (last_seen_id, datetime.now()),
+            fetch='all',
+            row_factory=Transaction
+        )
+        
+        added = []
+        with self._queue_lock:
+            for transaction in transactions or []:
+                if not self.transaction_queue.contains(transaction.transaction_id):
+                    self.transaction_queue.enqueue(transaction)
+                    added.append(transaction)
+        if added:
+            self._bump_version('transactions')
+        for transaction in added:
+            self._publish(event_bus.TRANSACTION_ADDED, transaction.transaction_id, transaction)
+        return len(added)
+    
+    def get_user_history(self, user_id=None, session=None):
         """Dapatkan history peminjaman user - FIXED"""
-        if user_id is None and self.current_user:
-            user_id = self.current_user.user_id
+        if not self.has_permission('view_history', session):
+            return []
+        user = self._session_user(session)
+        if user_id is None and user:
+            user_id = user.user_id
         
-        query = """
-            SELECT t.*, b.title as book_title 
+        query = f"""
+            SELECT {_select_columns('t', Transaction)}, b.title as book_title 
             FROM transactions t
             LEFT JOIN books b ON t.book_id = b.books_id
             WHERE t.user_id = %s 
             ORDER BY t.timestamp DESC
         """
-        trans_data = self.db.execute_query(query, (user_id,), fetch='all')
+        trans_rows = self.db.execute_query(query, (user_id,), fetch='all', row_factory=tuple)
         
-        if not trans_data:
+        if not trans_rows:
             return []
         
-        # ✅ FIXED: Konversi ke format yang benar
-        result = []
-        for t_dict in trans_data:
-            transaction = Transaction.from_dict(t_dict)
-            result.append({
-                'transaction': transaction,
-                'book_title': t_dict.get('book_title', 'Unknown')
-            })
+        # Baris tuple: kolom transaksi diikuti book_title di posisi terakhir
+        from_row = Transaction.from_row
+        return [
+            {'transaction': from_row(row[:-1]), 'book_title': row[-1] or 'Unknown'}
+            for row in trans_rows
+        ]
+    
+    def iter_user_history(self, user_id, batch_size=1000):
+        """Generator history transaksi user (streaming, untuk export/scan besar)"""
+        query = "SELECT * FROM transactions WHERE user_id = %s ORDER BY transaction_id"
+        return self.db.stream_query(query, (user_id,), row_factory=Transaction, batch_size=batch_size)
+    
+    # ==================== EXPORT ====================
+    
+    def get_query_stats(self):
+        """Statistik query database (latency per query, slow query log)"""
+        return self.db.stats.to_dict()
+    
+    def get_trace_stats(self):
+        """Agregat tracing per method (kosong jika tracer belum aktif)"""
+        return self.tracer.snapshot()
+    
+    def export_query_stats(self, file_handler, filename='query_stats.json'):
+        """Simpan statistik query ke JSON"""
+        return self.db.stats.export_json(file_handler, filename)
+    
+    def export_catalog_jsonl(self, file_handler, filename='catalog.jsonl'):
+        """Export seluruh katalog ke JSON Lines (streaming, memori konstan)"""
+        # QueryError dari stream ditangani save_jsonl (file tujuan tidak diganti)
+        books = self.db.stream_query("SELECT * FROM books ORDER BY books_id", row_factory=Book)
+        return file_handler.save_jsonl(filename, (book.to_dict() for book in books))
+    
+    def export_history_jsonl(self, file_handler, filename='history.jsonl', user_id=None):
+        """Export history peminjaman (semua user atau satu user) ke JSON Lines"""
+        query = "SELECT * FROM history"
+        params = None
+        if user_id is not None:
+            query += " WHERE user_id = %s"
+            params = (user_id,)
+        query += " ORDER BY history_id"
         
-        return result
+        rows = self.db.stream_query(query, params, row_factory=BorrowHistory)
+        return file_handler.save_jsonl(filename, (row.to_dict() for row in rows))
+    
+    def export_table_csv(self, file_handler, table, filename=None, compress=False, progress=None):
+        """Export satu tabel ke CSV (streaming fetchmany, opsional gzip)"""
+        if table not in EXPORT_TABLES:
+            return False, f"Tabel {table} tidak bisa diexport"
+        
+        model, key = EXPORT_TABLES[table]
+        query = f"SELECT {_select_columns(table, model)} FROM {table} ORDER BY {key}"
+        return self.export_query_csv(
+            file_handler, filename or f"{table}.csv", query, model.COLUMNS,
+            compress=compress, progress=progress
+        )
+    
+    def export_query_csv(self, file_handler, filename, query, headers, params=None,
+                         compress=False, progress=None, batch_size=5000):
+        """Export hasil query bebas ke CSV tanpa memuat seluruh result set"""
+        rows = self.db.stream_query(query, params, row_factory=tuple, batch_size=batch_size)
+        return file_handler.export_rows_csv(
+            filename, rows, headers, compress=compress, progress=progress, batch_size=batch_size
+        )
     
     # ==================== RECOMMENDATION SYSTEM ====================
     
@@ -305,10 +911,10 @@ class Library:
         self.recommendation_graph.add_vertex(user_vertex)
         self.recommendation_graph.add_edge(user_vertex, book_vertex, weight=1.0)
         
-        all_users = self.db.execute_query("SELECT user_id FROM users", fetch='all')
-        for user in all_users:
-            if user['user_id'] != user_id:
-                other_vertex = f"user_{user['user_id']}"
+        all_users = self.db.execute_query("SELECT user_id FROM users", fetch='all', row_factory=tuple)
+        for (other_id,) in all_users or []:
+            if other_id != user_id:
+                other_vertex = f"user_{other_id}"
                 other_books = self.recommendation_graph.get_neighbors(other_vertex)
                 
                 if book_vertex in other_books:
@@ -317,12 +923,46 @@ class Library:
                         user_vertex, other_vertex, weight=similarity
                     )
     
-    def get_recommendations(self, top_n=5):
-        """Dapatkan rekomendasi buku untuk current user"""
-        if not self.current_user:
+    def load_recommendation_graph(self, db=None, pairs=None):
+        """
+        Bangun ulang graph rekomendasi dari seluruh tabel history: edge
+        user -> buku untuk setiap peminjaman, dan edge kemiripan antar user
+        yang pernah meminjam buku yang sama (bobot sama dengan
+        _update_recommendation_graph).
+        :param pairs: Iterable (user_id, book_id) alternatif (mis. kolom
+            history dari snapshot).
+        :return: Jumlah baris history yang dibaca.
+        """
+        db = db or self.db
+        if pairs is None:
+            pairs = db.stream_query("SELECT user_id, book_id FROM history", row_factory=tuple)
+        graph = Graph()
+        borrowers = {}
+        count = 0
+        for user_id, book_id in pairs:
+            graph.add_edge(f"user_{user_id}", f"book_{book_id}", weight=1.0)
+            borrowers.setdefault(book_id, set()).add(user_id)
+            count += 1
+        
+        for users in borrowers.values():
+            users = sorted(users)
+            for i, user_id in enumerate(users):
+                for other_id in users[i + 1:]:
+                    graph.add_undirected_edge(f"user_{user_id}", f"user_{other_id}", weight=0.2)
+        
+        with self._state_lock:
+            self.recommendation_graph = graph
+        self._bump_version('history')
+        self._publish(event_bus.RELOADED, 'history')
+        return count
+    
+    def get_recommendations(self, top_n=5, session=None):
+        """Dapatkan rekomendasi buku untuk user sesi (atau current user)"""
+        user = self._session_user(session)
+        if not user or not self.has_permission('view_recommendations', session):
             return []
         
-        user_vertex = f"user_{self.current_user.user_id}"
+        user_vertex = f"user_{user.user_id}"
         similar_users = self.recommendation_graph.get_neighbors(user_vertex)
         user_books = self.recommendation_graph.get_neighbors(user_vertex)
         
@@ -392,41 +1032,411 @@ class Library:
     
     def get_popular_books(self, top_n=10):
         """Dapatkan buku paling populer"""
-        query = """
-            SELECT b.*, COUNT(bh.book_id) as borrow_count
+        query = f"""
+            SELECT {_select_columns('b', Book)}, COUNT(bh.book_id) as borrow_count
             FROM history bh
             JOIN books b ON bh.book_id = b.books_id
             GROUP BY bh.book_id
             ORDER BY borrow_count DESC
             LIMIT %s
         """
-        popular_data = self.db.execute_query(query, (top_n,), fetch='all')
-        
-        result = []
-        if popular_data:
-            for item in popular_data:
-                book = Book.from_dict(item)
-                result.append((book, item['borrow_count']))
+        popular_rows = self.db.execute_query(query, (top_n,), fetch='all', row_factory=tuple)
         
-        return result
+        return [(Book.from_row(row[:-1]), row[-1]) for row in popular_rows or []]
     
     # ==================== DATA PERSISTENCE ====================
     
-    def initialize_data(self):
+    @staticmethod
+    def _log_phase(name, started):
+        """Log durasi satu fase startup"""
+        print(f"[startup] {name}: {(time.perf_counter() - started) * 1000:.1f} ms")
+    
+    def initialize_data(self, db=None):
         """Inisialisasi data dari database saat startup"""
+        db = db or self.db
         print("Menginisialisasi data dari database...")
         
-        trans_data = self.db.execute_query("SELECT * FROM transactions WHERE status = 'pending'", fetch='all')
-        if trans_data:
-            print(f"Memuat {len(trans_data)} transaksi yang tertunda...")
-            for t_dict in trans_data:
-                transaction = Transaction.from_dict(t_dict)
-                self.transaction_queue.enqueue(transaction)
+        # Posisi change_log dibaca sebelum data dimuat: perubahan selama
+        # pemuatan diterapkan ulang oleh poller (idempoten)
+        self._init_change_log(db)
+        
+        phase = time.perf_counter()
+        self._seed_default_users(db)
+        self._log_phase("default users", phase)
+        
+        phase = time.perf_counter()
+        if not (self.snapshot_path and self._load_snapshot(db)):
+            self.load_catalog_index(db)
+            self.load_recommendation_graph(db)
+        self._log_phase("catalog index & graph", phase)
+        
+        phase = time.perf_counter()
+        self._load_pending_transactions(db)
+        self._log_phase("pending transactions", phase)
+    
+    # ==================== CHANGE LOG ====================
+    
+    def _log_change(self, entity, entity_id, action, db=None):
+        """Catat satu write ke change_log agar instance lain bisa menyusul"""
+        if not self.change_log_enabled:
+            return
+        (db or self.db).execute_query(
+            "INSERT INTO change_log (entity, entity_id, action, origin) VALUES (%s, %s, %s, %s)",
+            (entity, entity_id, action, self.worker_id)
+        )
+    
+    def _init_change_log(self, db, retention_hours=24):
+        """Baca change_id terakhir dan buang entri yang sudah lewat masa simpan"""
+        result = db.execute_query("SELECT MAX(change_id) as m FROM change_log", fetch='one')
+        if result is None:
+            print("Tabel change_log tidak ditemukan (jalankan data/migrations/002_change_log.sql); "
+                  "sinkronisasi antar instance nonaktif")
+            self.change_log_enabled = False
+            return
+        
+        self._last_change_id = result['m'] or 0
+        db.execute_query(
+            "DELETE FROM change_log WHERE created_at < %s",
+            (datetime.now() - timedelta(hours=retention_hours),)
+        )
+    
+    def poll_changes(self, batch_size=500):
+        """
+        Terapkan perubahan dari instance lain yang tercatat di change_log
+        setelah change_id terakhir yang sudah dilihat: catalog index, queue
+        transaksi & graph rekomendasi disegarkan per batch, snapshot
+        dibuang, lalu event dipublikasikan ke view.
+        :return: Jumlah entri change_log yang diproses.
+        """
+        if not self.change_log_enabled or self._last_change_id is None:
+            return 0
+        
+        if self._change_log_gap():
+            self._reload_after_gap()
+            return 0
         
-        user_count_result = self.db.execute_query("SELECT COUNT(*) as c FROM users", fetch='one')
+        rows = self.db.execute_query(
+            """
+                SELECT change_id, entity, entity_id, action FROM change_log
+                WHERE change_id > %s AND origin <> %s
+                ORDER BY change_id LIMIT %s
+            """,
+            (self._last_change_id, self.worker_id, batch_size),
+            fetch='all',
+            row_factory=tuple
+        )
+        if not rows:
+            return 0
+        
+        # Beberapa entri untuk baris yang sama cukup diterapkan sekali
+        # (state terbaru dibaca ulang); aksi terakhir yang dipakai
+        changes = {}
+        for _, entity, entity_id, action in rows:
+            changes.setdefault(entity, {})[entity_id] = action
+        
+        if 'books' in changes:
+            self._apply_book_changes(changes['books'])
+        if 'transactions' in changes:
+            self._apply_transaction_changes(changes['transactions'])
+        if 'users' in changes:
+            self._bump_version('users')
+            for user_id, action in changes['users'].items():
+                if action == 'insert':
+                    self._publish(event_bus.USER_ADDED, user_id)
+        
+        self._last_change_id = rows[-1][0]
+        return len(rows)
+    
+    def _change_log_gap(self):
+        """
+        Cek apakah entri setelah change_id terakhir sudah terhapus (dipangkas
+        instance lain setelah masa simpan, atau tabel dikosongkan sehingga
+        change_id mulai ulang); perubahan di dalamnya tidak bisa disusul lagi.
+        """
+        row = self.db.execute_query(
+            "SELECT MIN(change_id), MAX(change_id) FROM change_log", fetch='one', row_factory=tuple
+        )
+        if not row or row[0] is None:
+            return False
+        oldest, newest = row
+        return oldest > self._last_change_id + 1 or newest < self._last_change_id
+    
+    def _reload_after_gap(self):
+        """Muat ulang semua cache dari database karena change_log tidak lengkap"""
+        print("Entri change_log sudah terhapus sebelum diterapkan, memuat ulang semua data...")
+        # Posisi baru dibaca sebelum memuat: perubahan selama pemuatan
+        # diterapkan ulang oleh poll berikutnya (idempoten)
+        result = self.db.execute_query("SELECT MAX(change_id) as m FROM change_log", fetch='one')
+        self._invalidate_snapshot()
+        self.load_catalog_index()
+        with self._queue_lock:
+            self.transaction_queue.clear()
+        self._load_pending_transactions(self.db)
+        self.load_recommendation_graph()
+        self._bump_version('users')
+        self._publish(event_bus.RELOADED, 'users')
+        if result:
+            self._last_change_id = result['m'] or 0
+    
+    def _fetch_rows(self, table, key, ids, model):
+        """Ambil banyak baris sekaligus berdasarkan primary key"""
+        placeholders = ", ".join(["%s"] * len(ids))
+        rows = self.db.execute_query(
+            f"SELECT * FROM {table} WHERE {key} IN ({placeholders})",
+            tuple(ids), fetch='all', row_factory=model
+        )
+        return {getattr(row, key): row for row in rows or []}
+    
+    def _apply_book_changes(self, changes):
+        """Segarkan buku yang diubah instance lain di catalog index"""
+        books = self._fetch_rows('books', 'books_id', list(changes), Book)
+        self._invalidate_snapshot()
+        self._bump_version('books')
+        
+        with self._state_lock:
+            if self._index_loading:
+                # Index sedang dibangun, buku ini diterapkan setelah selesai
+                self._index_backlog.update(changes)
+                return
+        
+        if not self.catalog_index.loaded:
+            # Tanpa index tidak ada state lama untuk dibandingkan
+            self._publish(event_bus.RELOADED, 'books')
+            return
+        
+        for book_id, action in changes.items():
+            book = books.get(book_id)
+            with self._state_lock:
+                old = self.catalog_index.get(book_id)
+                old_stock = old.stock if old else 0
+                if book:
+                    self.catalog_index.update(book)
+                elif old:
+                    self.catalog_index.remove(book_id)
+            
+            if book is None:
+                if old:
+                    self._publish(event_bus.BOOK_DELETED, book_id, old, delta=-old_stock)
+            elif old is None:
+                self._publish(event_bus.BOOK_ADDED, book_id, book, delta=book.stock)
+            else:
+                self._publish(event_bus.BOOK_UPDATED, book_id, book, delta=book.stock - old_stock)
+    
+    def _apply_transaction_changes(self, changes):
+        """Samakan queue pending & graph rekomendasi dengan transaksi dari instance lain"""
+        transactions = self._fetch_rows('transactions', 'transaction_id', list(changes), Transaction)
+        
+        added = []
+        processed = []
+        with self._queue_lock:
+            for transaction_id in sorted(changes):
+                transaction = transactions.get(transaction_id)
+                queued = self.transaction_queue.contains(transaction_id)
+                if transaction and transaction.status == 'pending':
+                    # Selama startup, halaman pending ikut membaca transaksi ini
+                    if not queued and not self._pending_loading:
+                        self.transaction_queue.enqueue(transaction)
+                        added.append(transaction)
+                elif queued:
+                    # Diproses admin lain (atau ikut terhapus bersama bukunya)
+                    processed.append(transaction or self.transaction_queue.get(transaction_id))
+                    self.transaction_queue.remove(transaction_id)
+        
+        approved = [t for t in transactions.values() if t.status == 'approved']
+        for transaction in approved:
+            if transaction.is_borrow():
+                self._update_recommendation_graph(transaction.user_id, transaction.book_id)
+        
+        if added or processed:
+            self._bump_version('transactions')
+        for transaction in added:
+            self._publish(event_bus.TRANSACTION_ADDED, transaction.transaction_id, transaction)
+        for transaction in processed:
+            self._publish(event_bus.TRANSACTION_PROCESSED, transaction.transaction_id, transaction)
+        if approved:
+            # Buku populer, pinjaman aktif & rekomendasi ikut berubah
+            self._bump_version('history')
+            self._publish(event_bus.RELOADED, 'history')
+    
+    def start_change_poller(self, interval=2.0, batch_size=500):
+        """
+        Jalankan poll_changes berkala di background thread.
+        :return: False jika poller sudah berjalan.
+        """
+        with self._state_lock:
+            if self._poller_thread and self._poller_thread.is_alive():
+                return False
+            self._poller_stop.clear()
+            self._poller_thread = threading.Thread(
+                target=self._poll_loop, args=(interval, batch_size),
+                name="library-change-poller", daemon=True
+            )
+            self._poller_thread.start()
+        return True
+    
+    def stop_change_poller(self, timeout=None):
+        """Hentikan background poller (menunggu iterasi yang sedang berjalan)"""
+        self._poller_stop.set()
+        if self._poller_thread:
+            self._poller_thread.join(timeout)
+            self._poller_thread = None
+    
+    def _poll_loop(self, interval, batch_size):
+        while not self._poller_stop.wait(interval):
+            try:
+                # Batch penuh berarti masih ada sisa: langsung ambil berikutnya
+                while self.poll_changes(batch_size) == batch_size and not self._poller_stop.is_set():
+                    pass
+                # Klaim yang kedaluwarsa tidak tercatat di change_log
+                self.refresh_pending_transactions()
+            except Exception as e:
+                print(f"Error saat memproses change_log: {e}")
+    
+    # ==================== SNAPSHOT ====================
+    
+    def _snapshot_fingerprint(self, db):
+        """
+        Ringkasan murah state database untuk mendeteksi snapshot basi.
+        Edit isi baris (judul, penulis, ...) tidak mengubah jumlah/total,
+        jadi change_id terakhir ikut dipakai: setiap write lewat Library
+        di instance mana pun menambah entri change_log.
+        """
+        change_log = ", (SELECT MAX(change_id) FROM change_log)" if self.change_log_enabled else ""
+        row = db.execute_query(f"""
+            SELECT (SELECT COUNT(*) FROM books), (SELECT MAX(books_id) FROM books),
+                   (SELECT SUM(stock) FROM books), (SELECT SUM(reserved) FROM books),
+                   (SELECT COUNT(*) FROM users), (SELECT MAX(user_id) FROM users),
+                   (SELECT COUNT(*) FROM history), (SELECT MAX(history_id) FROM history),
+                   (SELECT COUNT(return_date) FROM history){change_log}
+        """, fetch='one', row_factory=tuple)
+        return "|".join(map(str, row)) if row else None
+    
+    def save_snapshot(self, db=None, fingerprint=None):
+        """Tulis books, users dan history ke snapshot kolumnar"""
+        if not self.snapshot_handler:
+            return False, "Snapshot tidak diaktifkan"
+        
+        db = db or self.db
+        # Fingerprint diambil sebelum membaca data: perubahan di tengah
+        # jalan membuat snapshot dianggap basi pada startup berikutnya
+        if fingerprint is None:
+            fingerprint = self._snapshot_fingerprint(db)
+        tables = {
+            name: (columns, types, db.stream_query(query, row_factory=tuple))
+            for name, (query, columns, types) in SNAPSHOT_TABLES.items()
+        }
+        return self.snapshot_handler.save_snapshot(
+            os.path.basename(self.snapshot_path), tables, fingerprint or ''
+        )
+    
+    def _invalidate_snapshot(self):
+        """Hapus snapshot setelah write lokal yang tidak tercakup fingerprint"""
+        if self.snapshot_handler:
+            self.snapshot_handler.delete_file(os.path.basename(self.snapshot_path))
+    
+    def _load_snapshot(self, db):
+        """Muat catalog index & graph rekomendasi dari snapshot (dibuat ulang jika basi)"""
+        filename = os.path.basename(self.snapshot_path)
+        fingerprint = self._snapshot_fingerprint(db)
+        if fingerprint is None:
+            return False
+        
+        snapshot = self.snapshot_handler.load_snapshot(filename, fingerprint)
+        if snapshot is None:
+            success, message = self.save_snapshot(db, fingerprint)
+            print(message)
+            if not success:
+                return False
+            snapshot = self.snapshot_handler.load_snapshot(filename, fingerprint)
+            if snapshot is None:
+                return False
+        
+        with snapshot:
+            books = (Book.from_row(row) for row in snapshot.rows('books'))
+            if not self.load_catalog_index(db, books=books):
+                return False
+            
+            # Graph sama persis dengan jalur tanpa snapshot, hanya sumbernya kolom mmap
+            user_ids = snapshot.int_column('history', 'user_id')
+            book_ids = snapshot.int_column('history', 'book_id')
+            self.load_recommendation_graph(db, pairs=zip(user_ids, book_ids))
+        return True
+    
+    def _seed_default_users(self, db):
+        """Buat user default jika tabel users masih kosong"""
+        user_count_result = db.execute_query("SELECT COUNT(*) as c FROM users", fetch='one')
         user_count = user_count_result['c'] if user_count_result else 0
         
         if user_count == 0:
             print("Database pengguna kosong. Membuat pengguna default...")
-            self.register_user('admin', 'admin123', 'admin')
-            self.register_user('user', 'user123', 'member')
\ No newline at end of file
+            self._create_user(db, 'admin', 'admin123', 'admin')
+            self._create_user(db, 'user', 'user123', 'member')
+    
+    def _load_pending_transactions(self, db):
+        """Muat transaksi pending ke queue per halaman (urut transaction_id)"""
+        with self._queue_lock:
+            self._pending_loading = True
+            self._pending_loaded = 0
+        
+        total_result = db.execute_query("SELECT COUNT(*) as c FROM transactions WHERE status = 'pending'", fetch='one')
+        self._pending_total = total_result['c'] if total_result else None
+        
+        last_id = 0
+        try:
+            for page in db.stream_query(
+                "SELECT * FROM transactions WHERE status = 'pending' ORDER BY transaction_id",
+                row_factory=Transaction,
+                batch_size=self.pending_page_size,
+                batches=True
+            ):
+                with self._queue_lock:
+                    for transaction in page:
+                        self.transaction_queue.enqueue(transaction)
+                    self._pending_loaded += len(page)
+                last_id = page[-1].transaction_id
+        except QueryError as e:
+            print(e)
+        
+        with self._queue_lock:
+            # Transaksi yang diajukan selama pemuatan menyusul di belakang,
+            # kecuali yang sudah ikut terbaca oleh query halaman
+            for transaction in self._deferred_transactions:
+                if transaction.transaction_id > last_id:
+                    self.transaction_queue.enqueue(transaction)
+            self._deferred_transactions = []
+            self._pending_loading = False
+        self._bump_version('transactions')
+        self._publish(event_bus.RELOADED, 'transactions')
+        
+        if self._pending_loaded:
+            print(f"Memuat {self._pending_loaded} transaksi yang tertunda...")
+    
+    def _lazy_startup(self):
+        """Startup di background thread dengan koneksi loader sendiri"""
+        started = time.perf_counter()
+        loader_db = self.db.clone()
+        
+        phase = time.perf_counter()
+        if not loader_db.connect():
+            self.startup_error = "Gagal terhubung ke database. Pastikan XAMPP MySQL berjalan dan database ada."
+            with self._state_lock:
+                self._index_loading = False
+            with self._queue_lock:
+                for transaction in self._deferred_transactions:
+                    self.transaction_queue.enqueue(transaction)
+                self._deferred_transactions = []
+                self._pending_loading = False
+            return
+        self._log_phase("connect (loader)", phase)
+        
+        try:
+            self.initialize_data(loader_db)
+        finally:
+            loader_db.disconnect()
+        self._log_phase("total (background)", started)
+    
+    def wait_until_ready(self, timeout=None):
+        """Tunggu background startup selesai (untuk test/benchmark)"""
+        if self._startup_thread:
+            self._startup_thread.join(timeout)
+        return not self._pending_loading and not self._index_loading
\ No newline at end of file
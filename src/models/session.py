@@ -0,0 +1,44 @@
+import secrets
+from datetime import datetime
+
+# Hak akses per role; dicek entry point Library/AsyncLibrary lewat
+# Session.has_permission
+ROLE_PERMISSIONS = {
+    'admin': frozenset({
+        'manage_books', 'process_transactions', 'view_analytics',
+        'request_transactions', 'view_history', 'view_recommendations'
+    }),
+    'member': frozenset({
+        'request_transactions', 'view_history', 'view_recommendations'
+    }),
+}
+
+class Session:
+    """Sesi login satu user, dikirim eksplisit ke operasi Library
+
+    Menggantikan state global `current_user` sehingga satu proses bisa
+    melayani banyak user sekaligus.
+    """
+
+    __slots__ = ('session_id', 'user', 'permissions', 'created_at')
+
+    def __init__(self, user):
+        self.session_id = secrets.token_hex(16)
+        self.user = user
+        self.permissions = ROLE_PERMISSIONS.get(user.role, frozenset())
+        self.created_at = datetime.now()
+
+    @property
+    def user_id(self):
+        return self.user.user_id
+
+    def is_admin(self):
+        """Cek apakah user sesi adalah admin"""
+        return self.user.is_admin()
+
+    def has_permission(self, permission):
+        """Cek hak akses sesi"""
+        return permission in self.permissions
+
+    def __repr__(self):
+        return f"Session(user='{self.user.username}', role='{self.user.role}')"
@@ -3,6 +3,10 @@ from datetime import datetime
 class Transaction:
     """Model untuk transaksi peminjaman/pengembalian"""
     
+    # Urutan kolom sama dengan tabel `transactions` (dipakai oleh from_row)
+    COLUMNS = ('transaction_id', 'user_id', 'book_id', 'type', 'status', 'timestamp')
+    __slots__ = COLUMNS
+    
     def __init__(self, transaction_id, user_id, book_id, trans_type, 
                  status='pending', timestamp=None):
         self.transaction_id = transaction_id
@@ -35,6 +39,14 @@ class Transaction:
             timestamp=data.get('timestamp')
         )
     
+    @staticmethod
+    def from_row(row):
+        """Create Transaction dari tuple baris database (urutan sesuai COLUMNS)"""
+        transaction = Transaction.__new__(Transaction)
+        (transaction.transaction_id, transaction.user_id, transaction.book_id,
+         transaction.type, transaction.status, transaction.timestamp) = row
+        return transaction
+    
     def is_pending(self):
         """Cek apakah transaksi masih pending"""
         return self.status == 'pending'
@@ -64,6 +76,10 @@ class Transaction:
 class BorrowHistory:
     """Model untuk history peminjaman"""
     
+    # Urutan kolom sama dengan tabel `history` (dipakai oleh from_row)
+    COLUMNS = ('history_id', 'user_id', 'book_id', 'borrow_date', 'return_date')
+    __slots__ = COLUMNS
+    
     def __init__(self, history_id, user_id, book_id, borrow_date=None, return_date=None):
         self.history_id = history_id
         self.user_id = user_id
@@ -92,6 +108,13 @@ class BorrowHistory:
             return_date=data.get('return_date')
         )
     
+    @staticmethod
+    def from_row(row):
+        """Create BorrowHistory dari tuple baris database (urutan sesuai COLUMNS)"""
+        history = BorrowHistory.__new__(BorrowHistory)
+        history.history_id, history.user_id, history.book_id, history.borrow_date, history.return_date = row
+        return history
+    
     def is_returned(self):
         """Cek apakah sudah dikembalikan"""
         return self.return_date is not None
@@ -3,6 +3,10 @@ from datetime import datetime
 class User:
     """Model untuk user"""
     
+    # Urutan kolom sama dengan tabel `users` (dipakai oleh from_row)
+    COLUMNS = ('user_id', 'username', 'password_hash', 'role', 'created_at')
+    __slots__ = COLUMNS
+    
     def __init__(self, user_id, username, password_hash, role='member', created_at=None):
         self.user_id = user_id
         self.username = username
@@ -31,6 +35,13 @@ class User:
             created_at=data.get('created_at')
         )
     
+    @staticmethod
+    def from_row(row):
+        """Create User dari tuple baris database (urutan sesuai COLUMNS)"""
+        user = User.__new__(User)
+        user.user_id, user.username, user.password_hash, user.role, user.created_at = row
+        return user
+    
     def is_admin(self):
         """Cek apakah user adalah admin"""
         return self.role == 'admin'
@@ -0,0 +1,114 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.book import Book
+from models.catalog_index import CatalogIndex
+
+def make_index():
+    index = CatalogIndex()
+    index.load([
+        Book(1, "Laskar Pelangi", "Andrea Hirata", isbn="9789793062792", genre="Novel", year=2005),
+        Book(2, "Bumi Manusia", "Pramoedya Ananta Toer", isbn="9789799731234", genre="Novel", year=1980),
+        Book(3, "Algoritma", "Rinaldi Munir", isbn="9786020000001", genre="Science", year=2016),
+        Book(4, "Sang Pemimpi", "Andrea Hirata", genre="Novel", year=2006),
+        Book(5, "Tanpa Tahun", "Anonim", genre=None),
+    ])
+    return index
+
+def test_index_lookup():
+    """Test lookup by id dan isbn"""
+    print("Testing Catalog Index Lookup...")
+    index = make_index()
+
+    assert index.loaded
+    assert len(index) == 5
+    assert index.get(2).title == "Bumi Manusia"
+    assert index.get(99) is None
+    assert index.get_by_isbn("9786020000001").books_id == 3
+    assert index.get_by_isbn("") is None
+    print("✓ Lookup test passed")
+
+def test_index_ordering():
+    """Test urutan judul dan pencarian penulis"""
+    print("Testing Catalog Index Ordering...")
+    index = make_index()
+
+    titles = [book.title for book in index.all_by_title()]
+    assert titles == sorted(titles, key=str.lower)
+
+    hirata = index.find_by_author("andrea hirata")
+    assert [book.books_id for book in hirata] == [1, 4]
+    assert [book.books_id for book in index.find_by_title("ALGORITMA")] == [3]
+    print("✓ Ordering test passed")
+
+def test_index_year_range():
+    """Test range search berdasarkan tahun"""
+    print("Testing Catalog Index Year Range...")
+    index = make_index()
+
+    books = index.range_by_year(2005, 2016)
+    assert [book.books_id for book in books] == [1, 4, 3]
+    assert index.range_by_year(1990, 2000) == []
+    print("✓ Year range test passed")
+
+def test_index_search():
+    """Test pencarian multi-kriteria"""
+    print("Testing Catalog Index Search...")
+    index = make_index()
+
+    assert {book.books_id for book in index.search("novel")} == {1, 2, 4}
+    assert [book.books_id for book in index.search("978979")] == [2, 1]
+    assert [book.books_id for book in index.search("5")] == [5]
+    print("✓ Search test passed")
+
+def test_index_sync():
+    """Test sinkronisasi add, update dan delete"""
+    print("Testing Catalog Index Sync...")
+    index = make_index()
+
+    index.add(Book(6, "Ayat-Ayat Cinta", "Habiburrahman", isbn="111", year=2004))
+    assert index.get(6).title == "Ayat-Ayat Cinta"
+
+    index.update(Book(6, "Ayat Ayat Cinta 2", "Habiburrahman", isbn="222", year=2015))
+    assert index.get_by_isbn("111") is None
+    assert index.get_by_isbn("222").books_id == 6
+    assert index.find_by_title("Ayat-Ayat Cinta") == []
+    assert [book.books_id for book in index.range_by_year(2015, 2015)] == [6]
+
+    assert index.remove(6) == True
+    assert index.remove(6) == False
+    assert index.get(6) is None
+    assert index.search("habiburrahman") == []
+    assert len(index) == 5
+    print("✓ Sync test passed")
+
+def run_all_tests():
+    """Run all Catalog Index tests"""
+    print("\n" + "="*50)
+    print("RUNNING CATALOG INDEX TESTS")
+    print("="*50 + "\n")
+
+    try:
+        test_index_lookup()
+        test_index_ordering()
+        test_index_year_range()
+        test_index_search()
+        test_index_sync()
+
+        print("\n" + "="*50)
+        print("ALL CATALOG INDEX TESTS PASSED! ✓")
+        print("="*50 + "\n")
+        return True
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
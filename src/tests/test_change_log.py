@@ -0,0 +1,241 @@
+import sys
+import os
+import time
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import event_bus
+from utils.database_connector import SQLiteConnector
+from models.library import Library
+
+def make_instances():
+    """Dua instance Library (mis. dua desktop) di atas database yang sama"""
+    first = Library(db=SQLiteConnector(':memory:'))
+    second = Library(db=first.db.clone())
+    return first, second
+
+def test_change_log_written():
+    """Test write Library tercatat di change_log dengan origin instance"""
+    print("Testing Change Log Written...")
+
+    lib, _ = make_instances()
+    lib.login("admin", "admin123")
+    lib.add_book("Ronggeng Dukuh Paruk", "Ahmad Tohari", "9789792201970", "Novel", 1982, 2)
+    book_id = lib.search_books("Ronggeng")[0].books_id
+    lib.update_book(book_id, stock=3)
+    lib.delete_book(book_id)
+
+    rows = lib.db.execute_query(
+        "SELECT entity, entity_id, action, origin FROM change_log WHERE entity = 'books' ORDER BY change_id",
+        fetch='all', row_factory=tuple
+    )
+    assert [(entity, action) for entity, _, action, _ in rows] == [
+        ('books', 'insert'), ('books', 'update'), ('books', 'delete')
+    ]
+    assert all(entity_id == book_id and origin == lib.worker_id for _, entity_id, _, origin in rows)
+    print("✓ Change log written test passed")
+
+def test_poll_changes():
+    """Test poller menerapkan perubahan instance lain ke index, queue & event"""
+    print("Testing Poll Changes...")
+
+    admin_a, admin_b = make_instances()
+    events = []
+    admin_b.events.subscribe(events.append)
+    assert admin_b.poll_changes() == 0
+
+    admin_a.login("admin", "admin123")
+    admin_a.add_book("Cantik Itu Luka", "Eka Kurniawan", "9789792217230", "Novel", 2002, 1)
+    book_id = admin_a.search_books("Cantik")[0].books_id
+    admin_a.logout()
+    admin_a.login("user", "user123")
+    admin_a.request_borrow(book_id)
+
+    # Perubahan sendiri tidak diterapkan ulang oleh instance asal
+    assert admin_a.poll_changes() == 0
+
+    assert admin_b.poll_changes(batch_size=1) == 1
+    assert admin_b.poll_changes() >= 1
+    assert admin_b.get_book(book_id).title == "Cantik Itu Luka"
+    assert len(admin_b.get_pending_transactions()) == 1
+    kinds = [event.kind for event in events]
+    assert event_bus.BOOK_ADDED in kinds and event_bus.TRANSACTION_ADDED in kinds
+
+    # Admin A memproses: queue & stock di B ikut tersinkron
+    admin_a.logout()
+    admin_a.login("admin", "admin123")
+    version = admin_b.data_version('books', 'transactions', 'history')
+    del events[:]
+    success, _ = admin_a.process_transaction()
+    assert success
+    assert admin_b.poll_changes() >= 2
+    assert admin_b.get_pending_transactions() == []
+    assert admin_b.get_book(book_id).stock == 0
+    assert admin_b.data_version('books', 'transactions', 'history') != version
+    kinds = [event.kind for event in events]
+    assert event_bus.TRANSACTION_PROCESSED in kinds and event_bus.BOOK_UPDATED in kinds
+    assert next(event for event in events if event.kind == event_bus.BOOK_UPDATED).delta == -1
+    assert admin_b.poll_changes() == 0
+    print("✓ Poll changes test passed")
+
+def test_pruned_change_log_reloads():
+    """Test entri yang terpangkas sebelum dibaca memicu muat ulang penuh"""
+    print("Testing Pruned Change Log Reloads...")
+
+    admin_a, admin_b = make_instances()
+    events = []
+    admin_b.events.subscribe(events.append)
+    assert admin_b.poll_changes() == 0
+
+    admin_a.login("admin", "admin123")
+    admin_a.add_book("Pulang", "Leila S. Chudori", "9789799105158", "Novel", 2012, 2)
+    book_id = admin_a.search_books("Pulang")[0].books_id
+    member = admin_a.create_session("user", "user123")[2]
+    admin_a.request_borrow(book_id, session=member)
+    admin_a.process_transaction()
+    admin_a.request_borrow(book_id, session=member)
+
+    # Instance lain memangkas change_log sebelum B sempat membacanya
+    admin_a.db.execute_query("DELETE FROM change_log")
+    admin_a.add_book("Amba", "Laksmi Pamuntjak", "9789792292442", "Novel", 2012, 1)
+
+    assert admin_b.poll_changes() == 0
+    assert admin_b.get_book(book_id).stock == 1
+    assert admin_b.search_books("Amba")
+    assert len(admin_b.get_pending_transactions()) == 1
+    assert f"book_{book_id}" in admin_b.recommendation_graph.get_neighbors(f"user_{member.user.user_id}")
+    reloaded = {event.key for event in events if event.kind == event_bus.RELOADED}
+    assert {'books', 'transactions', 'history'} <= reloaded
+    assert admin_b.poll_changes() == 0
+    print("✓ Pruned change log reloads test passed")
+
+def test_expired_claim_taken_over():
+    """Test transaksi milik admin yang mati diambil alih setelah lease habis"""
+    print("Testing Expired Claim Taken Over...")
+
+    admin_a, admin_b = make_instances()
+    admin_a.login("admin", "admin123")
+    admin_b.login("admin", "admin123")
+    admin_a.add_book("Orang-Orang Biasa", "Andrea Hirata", "9786022916086", "Novel", 2019, 1)
+    book_id = admin_a.search_books("Orang")[0].books_id
+    admin_a.request_borrow(book_id, session=admin_a.create_session("user", "user123")[2])
+    admin_b.poll_changes()
+    trans_id = admin_b.get_pending_transactions()[0].transaction_id
+
+    # A mengklaim lalu "crash" sebelum menyelesaikan transaksi
+    assert admin_a._claim_next_transaction().transaction_id == trans_id
+    success, _ = admin_b.process_transaction()
+    assert not success
+    assert admin_b.get_pending_transactions() == []
+    assert admin_b.refresh_pending_transactions() == 0
+
+    # Lease A habis: B menemukan transaksi itu lagi dan memprosesnya
+    admin_a.db.execute_query(
+        "UPDATE transactions SET claim_expires = %s WHERE transaction_id = %s",
+        ("2000-01-01 00:00:00", trans_id)
+    )
+    assert admin_b.refresh_pending_transactions() == 1
+    success, _ = admin_b.process_transaction()
+    assert success
+    row = admin_b.db.execute_query(
+        "SELECT status, claimed_by FROM transactions WHERE transaction_id = %s", (trans_id,), fetch='one'
+    )
+    assert row == {'status': 'approved', 'claimed_by': admin_b.worker_id}
+    assert admin_b.get_book(book_id).stock == 0
+    print("✓ Expired claim taken over test passed")
+
+def test_snapshot_fingerprint_sees_edits():
+    """Test edit judul tanpa perubahan jumlah/stock tetap mengubah fingerprint"""
+    print("Testing Snapshot Fingerprint Sees Edits...")
+
+    admin_a, admin_b = make_instances()
+    admin_a.login("admin", "admin123")
+    admin_a.add_book("Bumi", "Tere Liye", "9786020332956", "Novel", 2014, 1)
+    book_id = admin_a.search_books("Bumi")[0].books_id
+
+    fingerprint = admin_b._snapshot_fingerprint(admin_b.db)
+    admin_a.update_book(book_id, title="Bumi (Cetakan Ulang)")
+    assert admin_b._snapshot_fingerprint(admin_b.db) != fingerprint
+    print("✓ Snapshot fingerprint sees edits test passed")
+
+def test_index_reads_during_poller_updates():
+    """Test pembaca index tidak melihat buku hilang saat poller meng-update"""
+    print("Testing Index Reads During Poller Updates...")
+
+    lib, _ = make_instances()
+    lib.login("admin", "admin123")
+    lib.add_book("Lelaki Harimau", "Eka Kurniawan", "9789792211009", "Novel", 2004, 1)
+    book = lib.search_books("Harimau")[0]
+    done = threading.Event()
+
+    def writer():
+        # Seperti _apply_book_changes: update (remove + add) di bawah _state_lock
+        while not done.is_set():
+            with lib._state_lock:
+                lib.catalog_index.update(book)
+
+    # Pergantian thread sesering mungkin agar celah remove/add terlihat
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(2000):
+            assert lib.get_book(book.books_id) is book
+            assert lib.get_all_books() == [book]
+    finally:
+        done.set()
+        thread.join()
+        sys.setswitchinterval(interval)
+    print("✓ Index reads during poller updates test passed")
+
+def test_background_poller():
+    """Test background poller berjalan sendiri dan bisa dihentikan"""
+    print("Testing Background Poller...")
+
+    admin_a, admin_b = make_instances()
+    assert admin_b.start_change_poller(interval=0.01)
+    assert not admin_b.start_change_poller(interval=0.01)
+
+    admin_a.login("admin", "admin123")
+    admin_a.add_book("Saman", "Ayu Utami", "9789799023179", "Novel", 1998, 1)
+    book_id = admin_a.search_books("Saman")[0].books_id
+
+    deadline = time.time() + 5
+    while admin_b.get_book(book_id) is None and time.time() < deadline:
+        time.sleep(0.01)
+    admin_b.stop_change_poller()
+    assert admin_b.catalog_index.get(book_id) is not None
+    print("✓ Background poller test passed")
+
+def run_all_tests():
+    """Run all change log tests"""
+    print("\n" + "="*50)
+    print("RUNNING CHANGE LOG TESTS")
+    print("="*50 + "\n")
+
+    try:
+        test_change_log_written()
+        test_poll_changes()
+        test_pruned_change_log_reloads()
+        test_expired_claim_taken_over()
+        test_snapshot_fingerprint_sees_edits()
+        test_index_reads_during_poller_updates()
+        test_background_poller()
+
+        print("\n" + "="*50)
+        print("ALL CHANGE LOG TESTS PASSED! ✓")
+        print("="*50 + "\n")
+        return True
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,150 @@
+import sys
+import os
+import tempfile
+from collections import Counter
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_generator import DataGenerator, generate, write_csv, load_data_statement, CHUNK_ROWS
+from utils.database_connector import SQLiteConnector
+
+def make_generator(**options):
+    # password_entry tetap supaya test tidak menghitung KDF
+    options.setdefault('password_entry', "pbkdf2_sha256$1$salt$hash")
+    return DataGenerator(**options)
+
+def test_deterministic_shards():
+    """Test hasil sama persis berapa pun pembagian shard"""
+    print("Testing Deterministic Shards...")
+
+    generator = make_generator(books=500, users=100, history=25000)
+    full = list(generator.history_rows())
+    assert len(full) == 25000
+    assert [h[0] for h, _ in full] == list(range(1, 25001))
+
+    pieces = []
+    for start, end in generator.shards('history', 3):
+        assert (start - 1) % CHUNK_ROWS == 0
+        pieces.extend(generator.history_rows(start, end))
+    assert pieces == full
+
+    # Potongan di tengah chunk juga konsisten
+    assert list(generator.history_rows(12345, 12350)) == full[12344:12349]
+    assert list(make_generator(books=500, users=100, history=25000).book_rows()) == list(generator.book_rows())
+    print("✓ Deterministic shards test passed")
+
+def test_distributions():
+    """Test popularitas Zipf, genre miring dan transaksi konsisten"""
+    print("Testing Distributions...")
+
+    generator = make_generator(books=1000, users=200, history=20000)
+    rows = list(generator.history_rows())
+
+    popularity = Counter(history[2] for history, _ in rows)
+    top_share = sum(count for _, count in popularity.most_common(10)) / len(rows)
+    assert top_share > 0.3, f"10 buku teratas hanya {top_share:.0%}"
+
+    genres = Counter(book[4] for book in generator.book_rows())
+    assert genres.most_common(1)[0][0] == 'Novel'
+    assert genres['Novel'] > 5 * genres.get('Puisi', 0)
+
+    for history, transactions in rows:
+        history_id, user_id, book_id, borrowed, returned = history
+        assert 1 <= user_id <= 200 and 1 <= book_id <= 1000
+        assert transactions[0] == (2 * history_id - 1, user_id, book_id, 'borrow', 'approved', borrowed)
+        if returned:
+            assert returned > borrowed and transactions[1][3:5] == ('return', 'approved')
+        assert borrowed.hour >= 7
+    print("✓ Distributions test passed")
+
+def test_stock_excludes_open_loans():
+    """Test stock = salinan dikurangi pinjaman terbuka, sama di jalur paralel"""
+    print("Testing Stock Excludes Open Loans...")
+
+    generator = make_generator(books=200, users=50, history=5000, open_ratio=0.3)
+    open_loans = Counter(history[2] for history, _ in generator.history_rows() if history[4] is None)
+    assert generator.open_loan_counts() == open_loans
+
+    copies = make_generator(books=200, users=50, history=5000, open_ratio=0.3)
+    copies.open_loans = {}
+    for book, raw in zip(generator.book_rows(), copies.book_rows()):
+        assert book[6] == max(0, raw[6] - open_loans[book[0]])
+        # Semua pinjaman terbuka dikembalikan: stock tidak melebihi salinan
+        assert book[6] + open_loans[book[0]] == max(raw[6], open_loans[book[0]])
+    assert sum(open_loans.values()) > 0
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "sintetis.db")
+        parallel = make_generator(books=200, users=50, history=5000, open_ratio=0.3)
+        generate(parallel, workers=2, shards=2, backend='sqlite', db_options={'database': path})
+        db = SQLiteConnector(path)
+        stocks = db.execute_query("SELECT stock FROM books ORDER BY books_id", fetch='all', row_factory=tuple)
+        assert [row[0] for row in stocks] == [book[6] for book in generator.book_rows()]
+        db.disconnect()
+    print("✓ Stock excludes open loans test passed")
+
+def test_csv_for_load_data():
+    """Test format CSV (NULL = \\N) dan statement LOAD DATA"""
+    print("Testing CSV for LOAD DATA...")
+
+    generator = make_generator(books=10, users=5, history=10)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "history.csv")
+        history = [(1, 2, 3, generator.end, None)]
+        assert write_csv(path, history) == 1
+        with open(path, 'r', encoding='utf-8') as f:
+            assert f.read() == "1,2,3,2025-12-01 00:00:00,\\N\n"
+
+        statement = load_data_statement('history', path)
+        assert "INTO TABLE `history`" in statement
+        assert "(`history_id`, `user_id`, `book_id`, `borrow_date`, `return_date`)" in statement
+    print("✓ CSV for LOAD DATA test passed")
+
+def test_generate_into_sqlite():
+    """Test bulk insert paralel ke SQLite (foreign key terpenuhi)"""
+    print("Testing Generate into SQLite...")
+
+    generator = make_generator(books=300, users=50, history=3000)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "sintetis.db")
+        totals = generate(generator, workers=2, shards=2, backend='sqlite', db_options={'database': path})
+        assert totals['books'] == 300 and totals['users'] == 50 and totals['history'] == 3000
+
+        db = SQLiteConnector(path)
+        count = lambda table: db.execute_query(f"SELECT COUNT(*) FROM {table}", fetch='one', row_factory=tuple)[0]
+        assert count('history') == 3000
+        assert count('transactions') == totals['transactions']
+        assert db.execute_query("PRAGMA foreign_key_check", fetch='all') == []
+        admin = db.execute_query("SELECT role FROM users WHERE user_id = 1", fetch='one')
+        assert admin == {'role': 'admin'}
+        db.disconnect()
+    print("✓ Generate into SQLite test passed")
+
+def run_all_tests():
+    """Run all data generator tests"""
+    print("\n" + "="*50)
+    print("RUNNING DATA GENERATOR TESTS")
+    print("="*50 + "\n")
+
+    try:
+        test_deterministic_shards()
+        test_distributions()
+        test_stock_excludes_open_loans()
+        test_csv_for_load_data()
+        test_generate_into_sqlite()
+
+        print("\n" + "="*50)
+        print("ALL DATA GENERATOR TESTS PASSED! ✓")
+        print("="*50 + "\n")
+        return True
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
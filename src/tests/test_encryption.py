@@ -0,0 +1,146 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import io
+from utils.encryption import PasswordEncryption, DataEncryption
+
+def test_kdf_entries():
+    """Test entry PBKDF2 dan scrypt"""
+    print("Testing KDF Entries...")
+
+    entry = PasswordEncryption.create_password_entry("rahasia123", iterations=1000)
+    assert entry.startswith("pbkdf2_sha256$1000$")
+    assert PasswordEncryption.verify_password_entry("rahasia123", entry)
+    assert not PasswordEncryption.verify_password_entry("salah", entry)
+
+    entry = PasswordEncryption.create_password_entry("rahasia123", scheme='scrypt', n=2 ** 10)
+    assert entry.startswith("scrypt$1024$8$1$")
+    assert PasswordEncryption.verify_password_entry("rahasia123", entry)
+    assert not PasswordEncryption.verify_password_entry("salah", entry)
+    print("✓ KDF entries test passed")
+
+def test_legacy_entry_and_rehash():
+    """Test entry lama hash$salt tetap valid dan ditandai rehash"""
+    print("Testing Legacy Entry & Rehash...")
+
+    password_hash, salt = PasswordEncryption.hash_password("user123")
+    legacy = f"{password_hash}${salt}"
+    assert PasswordEncryption.verify_password_entry("user123", legacy)
+    assert not PasswordEncryption.verify_password_entry("user124", legacy)
+    assert PasswordEncryption.needs_rehash(legacy)
+
+    current = PasswordEncryption.create_password_entry("user123")
+    assert not PasswordEncryption.needs_rehash(current)
+    weak = PasswordEncryption.create_password_entry("user123", iterations=1000)
+    assert PasswordEncryption.needs_rehash(weak)
+    strong = PasswordEncryption.create_password_entry("user123", iterations=400_000)
+    assert not PasswordEncryption.needs_rehash(strong)
+    other_scheme = PasswordEncryption.create_password_entry("user123", scheme='scrypt', n=2 ** 10)
+    assert PasswordEncryption.needs_rehash(other_scheme)
+
+    assert not PasswordEncryption.verify_password_entry("user123", "")
+    assert not PasswordEncryption.verify_password_entry("user123", "rusak")
+    print("✓ Legacy entry & rehash test passed")
+
+def test_pool_verification():
+    """Test verifikasi bersamaan lewat pool"""
+    print("Testing Pool Verification...")
+
+    entry = PasswordEncryption.create_password_entry("admin123", iterations=1000)
+    futures = [
+        PasswordEncryption.submit(PasswordEncryption.verify_password_entry, password, entry)
+        for password in ("admin123", "salah", "admin123")
+    ]
+    assert [future.result() for future in futures] == [True, False, True]
+    print("✓ Pool verification test passed")
+
+def test_process_pool_uses_configured_cost():
+    """Test worker proses (spawn) membuat entry dengan cost hasil configure"""
+    print("Testing Process Pool Uses Configured Cost...")
+
+    scheme, cost = PasswordEncryption.scheme, PasswordEncryption.cost
+    start_method = PasswordEncryption.start_method
+    try:
+        PasswordEncryption.start_method = 'spawn'
+        PasswordEncryption.configure(use_processes=True, pool_workers=1, iterations=1234)
+        entry = PasswordEncryption.submit(PasswordEncryption.create_password_entry, "admin123").result()
+        assert entry.startswith("pbkdf2_sha256$1234$")
+        assert not PasswordEncryption.needs_rehash(entry)
+
+        # Cost diubah lagi: worker baru ikut memakai nilai terbaru
+        PasswordEncryption.configure(iterations=2345)
+        entry = PasswordEncryption.submit(PasswordEncryption.create_password_entry, "admin123").result()
+        assert entry.startswith("pbkdf2_sha256$2345$")
+    finally:
+        PasswordEncryption.start_method = start_method
+        PasswordEncryption.configure(use_processes=False, pool_workers=4)
+        PasswordEncryption.scheme, PasswordEncryption.cost = scheme, cost
+    print("✓ Process pool uses configured cost test passed")
+
+def test_xor_roundtrip():
+    """Test XOR string sama dengan implementasi per byte"""
+    print("Testing XOR Roundtrip...")
+
+    data = "Laskar Pelangi — Andrea Hirata " * 37
+    key = "kunci"
+    expected = bytes(b ^ key.encode()[i % 5] for i, b in enumerate(data.encode('utf-8')))
+
+    encrypted = DataEncryption.xor_encrypt(data, key)
+    assert DataEncryption.xor_bytes(data.encode('utf-8'), key.encode()) == expected
+    assert DataEncryption.xor_decrypt(encrypted, key) == data
+    assert DataEncryption.xor_encrypt("", key) == ""
+    assert DataEncryption.xor_decrypt("bukan base64!", key) is None
+    assert DataEncryption.xor_decrypt(None, key) is None
+    assert DataEncryption.xor_decrypt(b"bytes", key) is None
+    assert DataEncryption.xor_decrypt(encrypted, None) is None
+    assert DataEncryption.xor_decrypt(encrypted, "") is None
+    print("✓ XOR roundtrip test passed")
+
+def test_xor_stream():
+    """Test XOR per chunk dengan ukuran chunk tidak kelipatan key"""
+    print("Testing XOR Stream...")
+
+    data = bytes(range(256)) * 100
+    key = "abcdefg"
+    whole = DataEncryption.xor_bytes(data, key.encode())
+
+    destination = io.BytesIO()
+    total = DataEncryption.xor_stream(io.BytesIO(data), destination, key, chunk_size=1000)
+    assert total == len(data)
+    assert destination.getvalue() == whole
+
+    restored = b''.join(DataEncryption.xor_chunks([whole[:3], whole[3:5000], whole[5000:]], key))
+    assert restored == data
+    print("✓ XOR stream test passed")
+
+def run_all_tests():
+    """Run all encryption tests"""
+    print("\n" + "="*50)
+    print("RUNNING ENCRYPTION TESTS")
+    print("="*50 + "\n")
+
+    try:
+        test_kdf_entries()
+        test_legacy_entry_and_rehash()
+        test_pool_verification()
+        test_process_pool_uses_configured_cost()
+        test_xor_roundtrip()
+        test_xor_stream()
+
+        print("\n" + "="*50)
+        print("ALL ENCRYPTION TESTS PASSED! ✓")
+        print("="*50 + "\n")
+        return True
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
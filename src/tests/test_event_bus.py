@@ -0,0 +1,131 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import event_bus
+from utils.event_bus import EventBus, ChangeEvent
+from utils.database_connector import SQLiteConnector
+from models.library import Library
+
+def test_event_bus():
+    """Test subscribe, filter jenis event, dispatch & unsubscribe"""
+    print("Testing Event Bus...")
+
+    bus = EventBus()
+    received = []
+    books_only = []
+    dispatched = []
+
+    token = bus.subscribe(received.append)
+    bus.subscribe(books_only.append, kinds=(event_bus.BOOK_ADDED,))
+    bus.subscribe(lambda event: dispatched.append(event.key),
+                  dispatch=lambda callback, event: callback(event))
+    bus.subscribe(lambda event: 1 / 0)     # Subscriber gagal tidak menghentikan publish
+
+    bus.publish(ChangeEvent(event_bus.BOOK_ADDED, 1, delta=3))
+    bus.publish(ChangeEvent(event_bus.TRANSACTION_ADDED, 7))
+    assert [event.kind for event in received] == [event_bus.BOOK_ADDED, event_bus.TRANSACTION_ADDED]
+    assert [event.key for event in books_only] == [1]
+    assert dispatched == [1, 7]
+    assert received[0].delta == 3 and received[0].domains == ('books',)
+    assert ChangeEvent(event_bus.RELOADED, 'history').domains == ('history',)
+
+    bus.unsubscribe(token)
+    bus.unsubscribe(token)
+    bus.publish(ChangeEvent(event_bus.USER_ADDED, 2))
+    assert len(received) == 2
+    assert len(bus) == 3
+    print("✓ Event bus test passed")
+
+def test_library_events():
+    """Test Library mempublikasikan event per baris untuk setiap write"""
+    print("Testing Library Events...")
+
+    lib = Library(db=SQLiteConnector(':memory:'))
+    events = []
+    lib.events.subscribe(events.append)
+
+    lib.login("admin", "admin123")
+    lib.add_book("Laskar Pelangi", "Andrea Hirata", "9789793062792", "Novel", 2005, 2)
+    book_id = events[-1].key
+    assert events[-1].kind == event_bus.BOOK_ADDED and events[-1].delta == 2
+
+    lib.update_book(book_id, title="Laskar Pelangi (Edisi Baru)", stock=3)
+    event = events[-1]
+    assert event.kind == event_bus.BOOK_UPDATED
+    assert event.item.title == "Laskar Pelangi (Edisi Baru)" and event.delta == 1
+
+    lib.logout()
+    lib.login("user", "user123")
+    lib.request_borrow(book_id)
+    trans_id = events[-1].key
+    assert events[-1].kind == event_bus.TRANSACTION_ADDED
+
+    lib.logout()
+    lib.login("admin", "admin123")
+    del events[:]
+    lib.process_transaction()
+    assert [event.kind for event in events] == [event_bus.TRANSACTION_PROCESSED, event_bus.STOCK_CHANGED]
+    assert events[0].key == trans_id and events[0].item.status == 'approved'
+    assert events[1].delta == -1 and events[1].item.stock == 2
+
+    lib.delete_book(book_id)
+    assert events[-1].kind == event_bus.BOOK_DELETED and events[-1].delta == -2
+
+    lib.register_user("budi", "rahasia123")
+    assert events[-1].kind == event_bus.USER_ADDED and events[-1].item is None
+    print("✓ Library events test passed")
+
+def test_dropped_transaction_event():
+    """Test transaksi yang diklaim admin lain tetap dihapus dari view"""
+    print("Testing Dropped Transaction Event...")
+
+    lib = Library(db=SQLiteConnector(':memory:'))
+    lib.login("admin", "admin123")
+    lib.add_book("Gadis Kretek", "Ratih Kumala", "9789792281415", "Novel", 2012, 1)
+    book_id = lib.search_books("Gadis")[0].books_id
+    member = lib.create_session("user", "user123")[2]
+    lib.request_borrow(book_id, session=member)
+    trans_id = lib.get_pending_transactions()[0].transaction_id
+
+    # Admin lain sedang memegang klaim yang masih berlaku
+    lib.db.execute_query(
+        "UPDATE transactions SET claimed_by = 'admin-lain', claim_expires = %s WHERE transaction_id = %s",
+        ("2999-01-01 00:00:00", trans_id)
+    )
+    events = []
+    lib.events.subscribe(events.append)
+    version = lib.data_version('transactions')
+    success, _ = lib.process_transaction()
+    assert not success
+    assert [(event.kind, event.key) for event in events] == [(event_bus.TRANSACTION_PROCESSED, trans_id)]
+    assert lib.data_version('transactions') != version
+    print("✓ Dropped transaction event test passed")
+
+def run_all_tests():
+    """Run all event bus tests"""
+    print("\n" + "="*50)
+    print("RUNNING EVENT BUS TESTS")
+    print("="*50 + "\n")
+
+    try:
+        test_event_bus()
+        test_library_events()
+        test_dropped_transaction_event()
+
+        print("\n" + "="*50)
+        print("ALL EVENT BUS TESTS PASSED! ✓")
+        print("="*50 + "\n")
+        return True
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
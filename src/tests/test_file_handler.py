@@ -0,0 +1,185 @@
+import sys
+import os
+import tempfile
+import gzip
+import csv
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_handler import FileHandler, INT_NULL
+
+def test_atomic_save_json():
+    """Test save_json atomic dan load_json"""
+    print("Testing Atomic Save JSON...")
+
+    with tempfile.TemporaryDirectory() as folder:
+        handler = FileHandler(folder)
+        success, _ = handler.save_json("books.json", [{"title": "Laskar Pelangi"}])
+        assert success
+        assert handler.load_json("books.json") == [{"title": "Laskar Pelangi"}]
+
+        # Data yang gagal di-serialize tidak merusak file lama
+        circular = []
+        circular.append(circular)
+        success, _ = handler.save_json("books.json", circular)
+        assert not success
+        assert handler.load_json("books.json") == [{"title": "Laskar Pelangi"}]
+        assert handler.list_files('.tmp') == []
+    print("✓ Atomic save JSON test passed")
+
+def test_jsonl_streaming():
+    """Test writer JSON Lines dari generator dan reader generator"""
+    print("Testing JSON Lines Streaming...")
+
+    with tempfile.TemporaryDirectory() as folder:
+        handler = FileHandler(folder)
+        records = ({"books_id": i, "title": f"Buku {i}"} for i in range(1000))
+        success, message = handler.save_jsonl("catalog.jsonl", records)
+        assert success
+        assert message.startswith("1000")
+
+        reader = handler.iter_jsonl("catalog.jsonl")
+        assert next(reader) == {"books_id": 0, "title": "Buku 0"}
+        assert sum(1 for _ in reader) == 999
+        assert list(handler.iter_jsonl("tidak_ada.jsonl")) == []
+    print("✓ JSON Lines streaming test passed")
+
+def test_backup_copies_bytes():
+    """Test backup menyalin file apa adanya"""
+    print("Testing Backup...")
+
+    with tempfile.TemporaryDirectory() as folder:
+        handler = FileHandler(folder)
+        handler.save_jsonl("history.jsonl", [{"history_id": 1}, {"history_id": 2}])
+        success, message = handler.backup_data("history.jsonl")
+        assert success
+
+        backup_name = message.split(": ")[1]
+        with open(os.path.join(folder, "history.jsonl"), 'rb') as original, \
+             open(os.path.join(folder, backup_name), 'rb') as backup:
+            assert original.read() == backup.read()
+
+        assert not handler.backup_data("tidak_ada.json")[0]
+    print("✓ Backup test passed")
+
+def test_export_rows_csv():
+    """Test export CSV streaming, gzip, progress dan memori"""
+    print("Testing Streaming CSV Export...")
+
+    with tempfile.TemporaryDirectory() as folder:
+        handler = FileHandler(folder)
+        rows = ((i, i % 50, i % 97, "2025-12-07 23:34:05", None) for i in range(100000))
+        reported = []
+
+        tracemalloc.start()
+        success, message = handler.export_rows_csv(
+            "history.csv", rows, ("history_id", "user_id", "book_id", "borrow_date", "return_date"),
+            compress=True, progress=reported.append, batch_size=5000
+        )
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert success, message
+        assert reported[0] == 5000 and reported[-1] == 100000
+        assert peak < 8 * 1024 * 1024
+
+        with gzip.open(os.path.join(folder, "history.csv.gz"), 'rt', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            assert next(reader) == ["history_id", "user_id", "book_id", "borrow_date", "return_date"]
+            assert next(reader) == ["0", "0", "0", "2025-12-07 23:34:05", ""]
+            assert sum(1 for _ in reader) == 99999
+
+        success, _ = handler.export_rows_csv("plain.csv", [(1, "a,b")], ("id", "text"))
+        with open(os.path.join(folder, "plain.csv"), encoding="utf-8", newline="") as f:
+            assert f.read() == 'id,text\r\n1,"a,b"\r\n'
+    print("✓ Streaming CSV export test passed")
+
+def make_snapshot_tables():
+    books = [
+        (1, "9789793062792", "Laskar Pelangi", "Andrea Hirata", "Novel", 2005, 3, None),
+        (2, "", "Bumi Manusia", "Pramoedya", "Sejarah", None, 0, "Tetralogi Buru"),
+    ]
+    history = [(1, 10, 1, "2025-12-07 23:34:05", None), (2, 11, 2, "2025-12-08 10:00:00", "2025-12-09 10:00:00")]
+    return {
+        'books': (('books_id', 'isbn', 'title', 'author', 'genre', 'year', 'stock', 'description'),
+                  ('i', 's', 's', 's', 's', 'i', 'i', 's'), iter(books)),
+        'history': (('history_id', 'user_id', 'book_id', 'borrow_date', 'return_date'),
+                    ('i', 'i', 'i', 's', 's'), iter(history)),
+    }, books, history
+
+def test_snapshot_roundtrip():
+    """Test snapshot kolumnar ditulis lalu dibaca lewat mmap"""
+    print("Testing Snapshot Roundtrip...")
+
+    with tempfile.TemporaryDirectory() as folder:
+        handler = FileHandler(folder)
+        tables, books, history = make_snapshot_tables()
+        success, message = handler.save_snapshot("library.snapshot", tables, fingerprint="2|2|3")
+        assert success, message
+
+        with handler.load_snapshot("library.snapshot", fingerprint="2|2|3") as snapshot:
+            assert snapshot.row_count('books') == 2
+            assert list(snapshot.rows('books')) == books
+            assert list(snapshot.rows('history')) == history
+            assert list(snapshot.int_column('books', 'year')) == [2005, INT_NULL]
+            assert list(snapshot.string_column('books', 'title')) == ["Laskar Pelangi", "Bumi Manusia"]
+            assert list(snapshot.rows('history', ['book_id', 'user_id'])) == [(1, 10), (2, 11)]
+    print("✓ Snapshot roundtrip test passed")
+
+def test_snapshot_rejects_stale_and_corrupt():
+    """Test snapshot basi, rusak atau beda versi diabaikan"""
+    print("Testing Snapshot Validation...")
+
+    with tempfile.TemporaryDirectory() as folder:
+        handler = FileHandler(folder)
+        tables, _, _ = make_snapshot_tables()
+        handler.save_snapshot("library.snapshot", tables, fingerprint="v1")
+        path = os.path.join(folder, "library.snapshot")
+
+        assert handler.load_snapshot("library.snapshot", fingerprint="v2") is None
+        assert handler.load_snapshot("tidak_ada.snapshot") is None
+
+        with open(path, 'r+b') as f:
+            f.seek(-3, os.SEEK_END)
+            byte = f.read(1)
+            f.seek(-3, os.SEEK_END)
+            f.write(bytes([byte[0] ^ 0xFF]))
+        assert handler.load_snapshot("library.snapshot", fingerprint="v1") is None
+
+        handler.save_snapshot("library.snapshot", make_snapshot_tables()[0], fingerprint="v1")
+        with open(path, 'r+b') as f:
+            f.seek(4)
+            f.write(bytes([99, 0]))
+        assert handler.load_snapshot("library.snapshot") is None
+    print("✓ Snapshot validation test passed")
+
+def run_all_tests():
+    """Run all file handler tests"""
+    print("\n" + "="*50)
+    print("RUNNING FILE HANDLER TESTS")
+    print("="*50 + "\n")
+
+    try:
+        test_atomic_save_json()
+        test_jsonl_streaming()
+        test_backup_copies_bytes()
+        test_export_rows_csv()
+        test_snapshot_roundtrip()
+        test_snapshot_rejects_stale_and_corrupt()
+
+        print("\n" + "="*50)
+        print("ALL FILE HANDLER TESTS PASSED! ✓")
+        print("="*50 + "\n")
+        return True
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,134 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from operator import attrgetter
+from data_structures.indexed_queue import IndexedQueue
+from models.transaction import Transaction
+
+def make_queue():
+    return IndexedQueue(
+        key_func=attrgetter('transaction_id'),
+        groups={'user': attrgetter('user_id'), 'type': attrgetter('type')}
+    )
+
+def fill(queue):
+    queue.enqueue(Transaction(1, 10, 100, 'borrow'))
+    queue.enqueue(Transaction(2, 11, 101, 'borrow'))
+    queue.enqueue(Transaction(3, 10, 102, 'return'))
+    queue.enqueue(Transaction(4, 12, 100, 'borrow'))
+
+def test_fifo_order():
+    """Test urutan FIFO"""
+    print("Testing Indexed Queue FIFO...")
+    queue = make_queue()
+    fill(queue)
+
+    assert queue.peek().transaction_id == 1
+    assert [t.transaction_id for t in queue.get_all()] == [1, 2, 3, 4]
+    assert queue.dequeue().transaction_id == 1
+    assert queue.dequeue().transaction_id == 2
+    assert queue.get_size() == 2
+    assert queue.dequeue().transaction_id == 3
+    assert queue.dequeue().transaction_id == 4
+    assert queue.dequeue() is None
+    assert queue.peek() is None
+    assert queue.is_empty()
+    print("✓ FIFO test passed")
+
+def test_lookup_and_remove():
+    """Test lookup dan remove by id"""
+    print("Testing Indexed Queue Lookup & Remove...")
+    queue = make_queue()
+    fill(queue)
+
+    assert queue.get(3).book_id == 102
+    assert queue.get(99) is None
+    assert queue.contains(2)
+
+    assert queue.remove(1).transaction_id == 1
+    assert queue.remove(1) is None
+    assert queue.peek().transaction_id == 2
+    assert queue.remove(3).transaction_id == 3
+    assert [t.transaction_id for t in queue.get_all()] == [2, 4]
+    assert len(queue) == 2
+    print("✓ Lookup & remove test passed")
+
+def test_group_views():
+    """Test view per user dan per type"""
+    print("Testing Indexed Queue Group Views...")
+    queue = make_queue()
+    fill(queue)
+
+    assert [t.transaction_id for t in queue.view('user', 10)] == [1, 3]
+    assert [t.transaction_id for t in queue.view('type', 'borrow')] == [1, 2, 4]
+    assert queue.view('user', 99) == []
+
+    queue.dequeue()
+    queue.remove(4)
+    assert [t.transaction_id for t in queue.view('user', 10)] == [3]
+    assert [t.transaction_id for t in queue.view('type', 'borrow')] == [2]
+    assert queue.view('user', 12) == []
+    print("✓ Group views test passed")
+
+def test_reenqueue_and_cursor():
+    """Test enqueue ulang key yang sama dan cursor max_key"""
+    print("Testing Indexed Queue Re-enqueue...")
+    queue = make_queue()
+    fill(queue)
+
+    queue.enqueue(Transaction(2, 11, 101, 'borrow', status='pending'))
+    assert [t.transaction_id for t in queue.get_all()] == [1, 3, 4, 2]
+    assert queue.get_size() == 4
+    assert queue.max_key == 4
+
+    queue.remove(4)
+    queue.enqueue(Transaction(4, 12, 100, 'borrow'))
+    assert [t.transaction_id for t in queue.get_all()] == [1, 3, 2, 4]
+    print("✓ Re-enqueue test passed")
+
+def test_compaction():
+    """Test banyak remove tidak merusak urutan"""
+    print("Testing Indexed Queue Compaction...")
+    queue = make_queue()
+
+    for i in range(1, 1001):
+        queue.enqueue(Transaction(i, i % 7, i, 'borrow'))
+    for i in range(1, 1001):
+        if i % 10:
+            queue.remove(i)
+
+    assert len(queue.order) < 1000
+    assert [t.transaction_id for t in queue.get_all()] == list(range(10, 1001, 10))
+    assert queue.dequeue().transaction_id == 10
+    print("✓ Compaction test passed")
+
+def run_all_tests():
+    """Run all Indexed Queue tests"""
+    print("\n" + "="*50)
+    print("RUNNING INDEXED QUEUE TESTS")
+    print("="*50 + "\n")
+
+    try:
+        test_fifo_order()
+        test_lookup_and_remove()
+        test_group_views()
+        test_reenqueue_and_cursor()
+        test_compaction()
+
+        print("\n" + "="*50)
+        print("ALL INDEXED QUEUE TESTS PASSED! ✓")
+        print("="*50 + "\n")
+        return True
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,99 @@
+import sys
+import os
+import json
+import random
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.query_stats import LatencyHistogram, QueryStats, normalize_query
+from utils.database_connector import SQLiteConnector
+from utils.file_handler import FileHandler
+from models.library import Library
+
+def test_histogram_percentiles():
+    """Test percentile histogram dalam toleransi presisi bucket"""
+    print("Testing Latency Histogram...")
+
+    histogram = LatencyHistogram()
+    values = [random.randint(1, 2_000_000) for _ in range(5000)]
+    for value in values:
+        histogram.record(value)
+
+    values.sort()
+    for percent in (50, 90, 99):
+        exact = values[-(-len(values) * percent // 100) - 1]
+        approx = histogram.percentile(percent)
+        assert exact <= approx <= exact * (1 + 1 / LatencyHistogram.SUB_BUCKETS) + 1
+    assert histogram.percentile(100) == max(values)
+    assert histogram.count == 5000
+
+    for value in (0, 31, 32, 63, 64, 1000, 123456789):
+        index = LatencyHistogram.bucket_index(value)
+        assert LatencyHistogram.bucket_upper(index) >= value
+        assert index == 0 or LatencyHistogram.bucket_upper(index - 1) < value
+    print("✓ Latency histogram test passed")
+
+def test_normalize_query():
+    """Test normalisasi query untuk agregasi"""
+    print("Testing Query Normalization...")
+
+    assert normalize_query("SELECT * FROM books\n   WHERE books_id = %s") == "SELECT * FROM books WHERE books_id = %s"
+    assert normalize_query("SELECT * FROM books WHERE books_id = 42") == "SELECT * FROM books WHERE books_id = ?"
+    assert normalize_query("SELECT * FROM users WHERE role = 'admin'") == "SELECT * FROM users WHERE role = ?"
+    assert normalize_query("SELECT * FROM books WHERE books_id IN (%s, %s, %s)") == "SELECT * FROM books WHERE books_id IN (...)"
+    print("✓ Query normalization test passed")
+
+def test_library_instrumentation():
+    """Test statistik & slow query log dari operasi Library"""
+    print("Testing Library Instrumentation...")
+
+    stats = QueryStats(slow_query_ms=0)
+    lib = Library(db=SQLiteConnector(':memory:', stats=stats))
+    lib.login("admin", "admin123")
+    for i in range(3):
+        lib.add_book(f"Buku {i}", "Penulis", f"isbn-{i}", stock=2)
+
+    report = lib.get_query_stats()
+    inserts = [q for q in report['queries'] if q['query'].startswith("INSERT INTO books")]
+    assert len(inserts) == 1
+    assert inserts[0]['calls'] == 3 and inserts[0]['rows'] == 3
+    assert inserts[0]['callers'] == {'Library.add_book': 3}
+    assert inserts[0]['latency']['count'] == 3
+
+    slow = [entry for entry in report['slow_queries'] if entry['caller'] == 'Library.add_book']
+    assert slow and 'Library.add_book' in slow[0]['chain']
+
+    with tempfile.TemporaryDirectory() as folder:
+        success, _ = lib.export_query_stats(FileHandler(folder))
+        assert success
+        with open(os.path.join(folder, "query_stats.json"), encoding='utf-8') as f:
+            assert json.load(f)['slow_query_ms'] == 0
+    print("✓ Library instrumentation test passed")
+
+def run_all_tests():
+    """Run all query stats tests"""
+    print("\n" + "="*50)
+    print("RUNNING QUERY STATS TESTS")
+    print("="*50 + "\n")
+
+    try:
+        test_histogram_percentiles()
+        test_normalize_query()
+        test_library_instrumentation()
+
+        print("\n" + "="*50)
+        print("ALL QUERY STATS TESTS PASSED! ✓")
+        print("="*50 + "\n")
+        return True
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
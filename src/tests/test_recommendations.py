@@ -1,8 +1,10 @@
 import sys
 import os
+import tempfile
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.library import Library
+from utils.database_connector import SQLiteConnector
 
 def test_graph_building():
     """Test recommendation graph building"""
@@ -140,6 +142,37 @@ def test_no_recommendations_for_new_user():
     
     print("✓ New user recommendations test passed")
 
+def test_graph_from_startup_history():
+    """Test startup dengan dan tanpa snapshot membangun graph yang sama dari history"""
+    print("Testing Graph From Startup History...")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "perpustakaan.db")
+        lib = Library(db=SQLiteConnector(path))
+        lib.login("admin", "admin123")
+        lib.add_book("Book A", isbn="9780000000001", stock=10)
+        lib.add_book("Book B", isbn="9780000000002", stock=10)
+        book_a, book_b = (lib.search_books(title)[0].books_id for title in ("Book A", "Book B"))
+        lib.register_user("user1", "rahasia123")
+        lib.register_user("user2", "rahasia123")
+        users = {row['username']: row['user_id'] for row in lib.db.execute_query(
+            "SELECT user_id, username FROM users", fetch='all')}
+        lib.db.execute_many("INSERT INTO history (user_id, book_id) VALUES (%s, %s)", [
+            (users['user1'], book_a), (users['user1'], book_b), (users['user2'], book_a),
+        ])
+        lib.db.disconnect()
+
+        expected = [(book_b, 0.2)]
+        for snapshot_path in (None, os.path.join(folder, "library.snapshot"),
+                              os.path.join(folder, "library.snapshot")):
+            # Ketiga startup: database, snapshot baru dibuat, snapshot dimuat ulang
+            started = Library(db=SQLiteConnector(path), snapshot_path=snapshot_path)
+            started.login("user2", "rahasia123")
+            recommendations = [(book.books_id, round(score, 2)) for book, score in started.get_recommendations()]
+            assert recommendations == expected, (snapshot_path, recommendations)
+            started.db.disconnect()
+    print("✓ Graph from startup history test passed")
+
 def run_all_tests():
     """Run all recommendation tests"""
     print("\n" + "="*50)
@@ -152,6 +185,7 @@ def run_all_tests():
         test_content_based_filtering()
         test_recommendation_update()
         test_no_recommendations_for_new_user()
+        test_graph_from_startup_history()
         
         print("\n" + "="*50)
         print("ALL RECOMMENDATION TESTS PASSED! ✓")
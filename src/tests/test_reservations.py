@@ -0,0 +1,244 @@
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import event_bus
+from utils.database_connector import SQLiteConnector
+from models.library import Library, LEASE_LOST_MESSAGE
+from models.session import Session
+from models.user import User
+
+def member_session(lib, username):
+    """Sesi member baru tanpa KDF login"""
+    lib.register_user(username, "rahasia123")
+    row = lib.db.execute_query("SELECT * FROM users WHERE username = %s", (username,), fetch='one', row_factory=User)
+    return Session(row)
+
+def reserved_in_db(lib, book_id):
+    return lib.db.execute_query("SELECT reserved FROM books WHERE books_id = %s", (book_id,), fetch='one')['reserved']
+
+def test_reservation_refuses_early():
+    """Test permintaan pinjam memesan salinan & ditolak dini saat habis"""
+    print("Testing Reservation Refuses Early...")
+
+    lib = Library(db=SQLiteConnector(':memory:'))
+    lib.login("admin", "admin123")
+    lib.add_book("Negeri 5 Menara", "Ahmad Fuadi", "9789792248616", "Novel", 2009, 1)
+    book_id = lib.search_books("Negeri")[0].books_id
+    first = member_session(lib, "andi")
+    second = member_session(lib, "sari")
+
+    success, _ = lib.request_borrow(book_id, session=first)
+    assert success
+    assert reserved_in_db(lib, book_id) == 1
+    assert lib.get_book(book_id).reserved == 1 and not lib.get_book(book_id).is_available()
+
+    # Ditolak dari peta ketersediaan di memori tanpa query database
+    queries = lib.db.stats.thread_totals()[0]
+    success, message = lib.request_borrow(book_id, session=second)
+    assert not success and message == "Buku tidak tersedia"
+    assert lib.db.stats.thread_totals()[0] == queries
+    assert len(lib.get_pending_transactions()) == 1
+
+    # Persetujuan memakai pesanan: stock & reserved sama-sama turun
+    success, _ = lib.process_transaction()
+    assert success
+    assert reserved_in_db(lib, book_id) == 0
+    book = lib.get_book(book_id)
+    assert (book.stock, book.reserved) == (0, 0)
+    print("✓ Reservation refuses early test passed")
+
+def test_reservation_released_on_reject():
+    """Test pesanan dilepas saat transaksi ditolak"""
+    print("Testing Reservation Released On Reject...")
+
+    lib = Library(db=SQLiteConnector(':memory:'))
+    lib.login("admin", "admin123")
+    lib.add_book("Perahu Kertas", "Dee Lestari", "9789791227780", "Novel", 2009, 1)
+    book_id = lib.search_books("Perahu")[0].books_id
+    lib.request_borrow(book_id, session=member_session(lib, "budi"))
+
+    # Admin lain mengosongkan stock sebelum permintaan diproses
+    lib.db.execute_query("UPDATE books SET stock = 0 WHERE books_id = %s", (book_id,))
+    success, _ = lib.process_transaction()
+    assert not success
+    assert reserved_in_db(lib, book_id) == 0
+    assert lib.get_book(book_id).reserved == 0
+    print("✓ Reservation released on reject test passed")
+
+def test_lease_lost_has_no_side_effects():
+    """Test klaim yang diambil alih admin lain tidak mengubah stock/pesanan"""
+    print("Testing Lease Lost Has No Side Effects...")
+
+    lib = Library(db=SQLiteConnector(':memory:'))
+    lib.login("admin", "admin123")
+    lib.add_book("Dilan 1990", "Pidi Baiq", "9786027870413", "Novel", 2014, 2)
+    book_id = lib.search_books("Dilan")[0].books_id
+    member = member_session(lib, "eka")
+    lib.request_borrow(book_id, session=member)
+
+    # Lease instance ini habis dan admin lain sudah mengklaim ulang baris
+    trans_id = lib.get_pending_transactions()[0].transaction_id
+    lib.db.execute_query("UPDATE transactions SET claimed_by = 'admin-lain' WHERE transaction_id = %s", (trans_id,))
+    lib._claim_transaction = lambda transaction: True
+    events = []
+    lib.events.subscribe(events.append)
+
+    success, message = lib.process_transaction()
+    assert not success and message == LEASE_LOST_MESSAGE
+    assert [(event.kind, event.key) for event in events] == [(event_bus.TRANSACTION_PROCESSED, trans_id)]
+    row = lib.db.execute_query("SELECT stock, reserved FROM books WHERE books_id = %s", (book_id,), fetch='one')
+    assert (row['stock'], row['reserved']) == (2, 1)
+    assert (lib.get_book(book_id).stock, lib.get_book(book_id).reserved) == (2, 1)
+    assert lib.db.execute_query("SELECT COUNT(*) as c FROM history", fetch='one')['c'] == 0
+    status = lib.db.execute_query("SELECT status FROM transactions WHERE transaction_id = %s", (trans_id,), fetch='one')
+    assert status['status'] == 'pending'
+    print("✓ Lease lost has no side effects test passed")
+
+def test_lease_lost_without_reservation():
+    """Test pembatalan decrement tidak membuat pesanan hantu"""
+    print("Testing Lease Lost Without Reservation...")
+
+    lib = Library(db=SQLiteConnector(':memory:'))
+    lib.login("admin", "admin123")
+    lib.add_book("Ayat-Ayat Cinta", "Habiburrahman El Shirazy", "9789793604021", "Novel", 2004, 2)
+    book_id = lib.search_books("Ayat")[0].books_id
+    lib.request_borrow(book_id, session=member_session(lib, "fajar"))
+
+    # Transaksi lama tanpa pesanan (dibuat sebelum kolom reserved ada)
+    lib.db.execute_query("UPDATE books SET reserved = 0 WHERE books_id = %s", (book_id,))
+    lib.get_book(book_id).reserved = 0
+    trans_id = lib.get_pending_transactions()[0].transaction_id
+    lib.db.execute_query("UPDATE transactions SET claimed_by = 'admin-lain' WHERE transaction_id = %s", (trans_id,))
+    lib._claim_transaction = lambda transaction: True
+
+    success, message = lib.process_transaction()
+    assert not success and message == LEASE_LOST_MESSAGE
+    row = lib.db.execute_query("SELECT stock, reserved FROM books WHERE books_id = %s", (book_id,), fetch='one')
+    assert (row['stock'], row['reserved']) == (2, 0)
+    print("✓ Lease lost without reservation test passed")
+
+def test_reservation_during_index_load():
+    """Test pesanan selama index dimuat ulang tidak tertimpa data basi"""
+    print("Testing Reservation During Index Load...")
+
+    lib = Library(db=SQLiteConnector(':memory:'))
+    lib.login("admin", "admin123")
+    lib.add_book("Hujan", "Tere Liye", "9786020324784", "Novel", 2016, 2)
+    book_id = lib.search_books("Hujan")[0].books_id
+
+    # Loader sudah membaca baris buku sebelum permintaan pinjam masuk
+    stale = lib._fetch_book(book_id)
+    with lib._state_lock:
+        lib._index_loading = True
+    lib.request_borrow(book_id, session=member_session(lib, "gita"))
+    lib.load_catalog_index(books=[stale])
+    assert lib.get_book(book_id).reserved == 1
+
+    with lib._state_lock:
+        lib._index_loading = True
+    lib.process_transaction()
+    lib.load_catalog_index(books=[stale])
+    book = lib.get_book(book_id)
+    assert (book.stock, book.reserved) == (1, 0)
+    print("✓ Reservation during index load test passed")
+
+def test_lease_lost_on_failed_return():
+    """Test transaksi return yang gagal juga memeriksa klaim"""
+    print("Testing Lease Lost On Failed Return...")
+
+    lib = Library(db=SQLiteConnector(':memory:'))
+    lib.login("admin", "admin123")
+    lib.add_book("Rindu", "Tere Liye", "9786020822129", "Novel", 2014, 1)
+    book_id = lib.search_books("Rindu")[0].books_id
+    member = member_session(lib, "hana")
+    lib.db.execute_query("INSERT INTO history (user_id, book_id) VALUES (%s, %s)", (member.user_id, book_id))
+    lib.request_return(book_id, session=member)
+    trans_id = lib.get_pending_transactions()[0].transaction_id
+
+    # Buku hilang dari index & klaim sudah diambil alih admin lain
+    lib.catalog_index.remove(book_id)
+    lib.db.execute_query("UPDATE transactions SET claimed_by = 'admin-lain' WHERE transaction_id = %s", (trans_id,))
+    lib._claim_transaction = lambda transaction: True
+
+    success, message = lib.process_transaction()
+    assert not success and message == LEASE_LOST_MESSAGE
+    status = lib.db.execute_query("SELECT status FROM transactions WHERE transaction_id = %s", (trans_id,), fetch='one')
+    assert status['status'] == 'pending'
+    print("✓ Lease lost on failed return test passed")
+
+def test_reservation_across_instances():
+    """Test pesanan atomik menang atas salinan lokal yang basi"""
+    print("Testing Reservation Across Instances...")
+
+    lib_a = Library(db=SQLiteConnector(':memory:'))
+    lib_b = Library(db=lib_a.db.clone())
+    lib_a.login("admin", "admin123")
+    lib_a.add_book("Supernova", "Dee Lestari", "9789793062099", "Novel", 2001, 1)
+    book_id = lib_a.search_books("Supernova")[0].books_id
+    lib_b.load_catalog_index()
+
+    assert lib_a.request_borrow(book_id, session=member_session(lib_a, "citra"))[0]
+    # Index B belum tahu pesanan A: UPDATE bersyarat yang menolak
+    assert lib_b.get_book(book_id).is_available()
+    success, _ = lib_b.request_borrow(book_id, session=member_session(lib_b, "dodi"))
+    assert not success
+    assert reserved_in_db(lib_a, book_id) == 1
+    assert not lib_b.get_book(book_id).is_available()
+    print("✓ Reservation across instances test passed")
+
+def test_sqlite_adds_reserved_column():
+    """Test file SQLite lama mendapat kolom reserved saat dibuka"""
+    print("Testing SQLite Adds Reserved Column...")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "lama.db")
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE books (books_id INTEGER PRIMARY KEY AUTOINCREMENT, isbn TEXT, "
+                           "title TEXT NOT NULL, author TEXT, genre TEXT, year INTEGER, stock INTEGER DEFAULT 1, "
+                           "description TEXT)")
+        connection.execute("INSERT INTO books (title, stock) VALUES ('Lama', 2)")
+        connection.commit()
+        connection.close()
+
+        db = SQLiteConnector(path)
+        assert db.connect()
+        row = db.execute_query("SELECT reserved, stock FROM books", fetch='one')
+        assert (row['reserved'], row['stock']) == (0, 2)
+        db.disconnect()
+    print("✓ SQLite adds reserved column test passed")
+
+def run_all_tests():
+    """Run all reservation tests"""
+    print("\n" + "="*50)
+    print("RUNNING RESERVATION TESTS")
+    print("="*50 + "\n")
+
+    try:
+        test_reservation_refuses_early()
+        test_reservation_released_on_reject()
+        test_lease_lost_has_no_side_effects()
+        test_lease_lost_without_reservation()
+        test_reservation_during_index_load()
+        test_lease_lost_on_failed_return()
+        test_reservation_across_instances()
+        test_sqlite_adds_reserved_column()
+
+        print("\n" + "="*50)
+        print("ALL RESERVATION TESTS PASSED! ✓")
+        print("="*50 + "\n")
+        return True
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
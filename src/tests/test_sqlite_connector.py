@@ -0,0 +1,170 @@
+import sys
+import os
+import subprocess
+import tempfile
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.database_connector import SQLiteConnector, translate_placeholders
+from models.book import Book
+from models.library import Library
+
+def test_placeholder_translation():
+    """Test terjemahan placeholder %s ke ?"""
+    print("Testing Placeholder Translation...")
+
+    assert translate_placeholders("SELECT * FROM books WHERE books_id = %s") == "SELECT * FROM books WHERE books_id = ?"
+    assert translate_placeholders("SELECT %s, %s LIMIT %s") == "SELECT ?, ? LIMIT ?"
+    assert translate_placeholders("SELECT '100%%' WHERE a = %s") == "SELECT '100%' WHERE a = ?"
+    print("✓ Placeholder translation test passed")
+
+def test_schema_and_queries():
+    """Test skema, pragma WAL dan bentuk hasil query"""
+    print("Testing SQLite Schema & Queries...")
+
+    with tempfile.TemporaryDirectory() as folder:
+        db = SQLiteConnector(os.path.join(folder, "perpustakaan.db"))
+        assert db.connect()
+        assert db.execute_query("PRAGMA journal_mode", fetch='one', row_factory=tuple) == ('wal',)
+
+        indexes = {row['name'] for row in db.execute_query("SELECT name FROM sqlite_master WHERE type = 'index'", fetch='all')}
+        assert {'isbn', 'idx_books_title', 'idx_history_user', 'idx_transactions_status', 'username'} <= indexes
+
+        book_id = db.execute_query(
+            "INSERT INTO books (isbn, title, author, genre, year, stock) VALUES (%s, %s, %s, %s, %s, %s)",
+            ("9789793062792", "Laskar Pelangi", "Andrea Hirata", "Novel", 2005, 1)
+        )
+        assert book_id == 1
+        assert db.execute_query("SELECT * FROM books WHERE books_id = %s", (book_id,), fetch='one', row_factory=Book).title == "Laskar Pelangi"
+        assert db.execute_query("SELECT title FROM books WHERE title LIKE %s", ("%laskar%",), fetch='all') == [{'title': "Laskar Pelangi"}]
+
+        # UPDATE bersyarat dan rowcount
+        query = "UPDATE books SET stock = stock - 1 WHERE books_id = %s AND stock > 0"
+        assert db.execute_query(query, (book_id,), fetch='rowcount') == 1
+        assert db.execute_query(query, (book_id,), fetch='rowcount') == 0
+
+        # Username unik (case-insensitive seperti MySQL)
+        db.execute_query("INSERT INTO users (username, password_hash) VALUES (%s, %s)", ("Budi", "x"))
+        assert db.execute_query("INSERT INTO users (username, password_hash) VALUES (%s, %s)", ("budi", "x")) is None
+
+        expires = datetime(2025, 12, 7, 23, 34, 5)
+        db.execute_query(
+            "INSERT INTO transactions (user_id, book_id, type, claim_expires) VALUES (%s, %s, %s, %s)",
+            (1, book_id, 'borrow', expires)
+        )
+        row = db.execute_query("SELECT timestamp, claim_expires FROM transactions", fetch='one', row_factory=tuple)
+        assert isinstance(row[0], datetime) and row[1] == expires
+
+        assert [r[0] for r in db.stream_query("SELECT books_id FROM books", row_factory=tuple)] == [book_id]
+
+        # Bulk insert
+        rows = [(f"isbn-{i}", f"Buku {i}") for i in range(100)]
+        assert db.execute_many("INSERT INTO books (isbn, title) VALUES (%s, %s)", rows) == 100
+        assert db.execute_query("SELECT COUNT(*) FROM books", fetch='one', row_factory=tuple) == (101,)
+        db.disconnect()
+    print("✓ SQLite schema & queries test passed")
+
+def test_library_on_sqlite():
+    """Test alur Library lengkap tanpa server MySQL"""
+    print("Testing Library on SQLite...")
+
+    lib = Library(db=SQLiteConnector(':memory:'))
+    assert lib.register_user("member01", "rahasia123")[0]
+    assert lib.login("admin", "admin123")[0]
+    assert lib.add_book("Bumi Manusia", "Pramoedya", "9789799731234", "Sejarah", 1980, 1)[0]
+    book = lib.search_books("bumi")[0]
+
+    lib.logout()
+    lib.login("member01", "rahasia123")
+    assert lib.request_borrow(book.books_id)[0]
+
+    lib.logout()
+    lib.login("admin", "admin123")
+    assert lib.process_transaction()[0]
+    assert lib.get_book(book.books_id).stock == 0
+    assert lib.get_statistics()['borrowed_books'] == 1
+    print("✓ Library on SQLite test passed")
+
+def test_data_version():
+    """Test versi data per domain (cache view GUI)"""
+    print("Testing Data Version...")
+
+    lib = Library(db=SQLiteConnector(':memory:'))
+    lib.login("admin", "admin123")
+    books = lib.data_version('books')
+    everything = lib.data_version()
+
+    lib.get_statistics()
+    lib.search_books("bumi")
+    assert lib.data_version() == everything
+
+    lib.add_book("Bumi Manusia", "Pramoedya", "9789799731234", "Sejarah", 1980, 1)
+    assert lib.data_version('books') != books
+    book = lib.search_books("bumi")[0]
+
+    lib.register_user("member01", "rahasia123")
+    lib.logout()
+    lib.login("member01", "rahasia123")
+    transactions = lib.data_version('transactions')
+    assert lib.request_borrow(book.books_id)[0]
+    assert lib.data_version('transactions') != transactions
+
+    lib.logout()
+    lib.login("admin", "admin123")
+    before = lib.data_version('books', 'history')
+    assert lib.process_transaction()[0]
+    after = lib.data_version('books', 'history')
+    assert after[0] != before[0] and after[1] != before[1]
+    print("✓ Data version test passed")
+
+def test_types_registered_on_connect():
+    """Test adapter DATETIME baru didaftarkan saat koneksi SQLite dibuka"""
+    print("Testing DATETIME Registration...")
+
+    # Proses baru: registry sqlite3 di proses test sudah terisi test lain
+    script = (
+        "import sqlite3\n"
+        "from datetime import datetime\n"
+        "import utils.database_connector\n"
+        "key = (datetime, sqlite3.PrepareProtocol)\n"
+        "default = sqlite3.adapters.get(key)\n"
+        "assert 'DATETIME' not in sqlite3.converters, 'terdaftar saat import'\n"
+        "db = utils.database_connector.SQLiteConnector(':memory:')\n"
+        "assert db.connect() and sqlite3.adapters[key] is not default\n"
+        "row = db.execute_query('SELECT created_at FROM users LIMIT 1', fetch='one')\n"
+        "assert row is None or isinstance(row['created_at'], datetime)\n"
+    )
+    src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", script], cwd=src, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    print("✓ DATETIME registration test passed")
+
+def run_all_tests():
+    """Run all SQLite connector tests"""
+    print("\n" + "="*50)
+    print("RUNNING SQLITE CONNECTOR TESTS")
+    print("="*50 + "\n")
+
+    try:
+        test_placeholder_translation()
+        test_schema_and_queries()
+        test_library_on_sqlite()
+        test_data_version()
+        test_types_registered_on_connect()
+
+        print("\n" + "="*50)
+        print("ALL SQLITE CONNECTOR TESTS PASSED! ✓")
+        print("="*50 + "\n")
+        return True
+    except AssertionError as e:
+        print(f"\n✗ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
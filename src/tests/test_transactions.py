@@ -3,6 +3,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.library import Library
+from utils.database_connector import SQLiteConnector
 
 def test_transaction_flow():
     """Test complete transaction flow"""
@@ -141,20 +142,57 @@ def test_stock_management():
     assert book.stock == 0
     assert not book.is_available()
     
-    # Second user tries to borrow
+    # Second user tries to borrow: refused early, no pending transaction
     lib.logout()
     lib.login("user2", "pass")
     success, msg = lib.request_borrow(book_id)
-    assert success == True  # Request accepted
-    
-    # But processing fails
-    lib.logout()
-    lib.login("admin", "pass")
-    success, msg = lib.process_transaction()
-    assert success == False  # Should fail due to no stock
+    assert success == False
+    assert lib.transaction_queue.is_empty()
     
     print("✓ Stock management test passed")
 
+def test_session_scoped_operations():
+    """Test banyak sesi dilayani satu Library tanpa login/logout bergantian"""
+    print("Testing Session-Scoped Operations...")
+    
+    # SQLite in-memory: berjalan tanpa server MySQL; admin dari seeding startup
+    lib = Library(db=SQLiteConnector(':memory:'))
+    lib.register_user("user1", "pass", "member")
+    lib.register_user("user2", "pass", "member")
+    
+    _, _, admin = lib.create_session("admin", "admin123")
+    _, _, user1 = lib.create_session("user1", "pass")
+    _, _, user2 = lib.create_session("user2", "pass")
+    assert lib.current_user is None
+    assert admin.has_permission('manage_books')
+    assert not user1.has_permission('manage_books')
+    
+    assert lib.add_book("Shared Book", stock=5, session=admin)[0] == True
+    book_id = lib.search_books("Shared Book")[0].books_id
+    
+    success, msg = lib.add_book("Not Allowed", session=user1)
+    assert success == False
+    
+    assert lib.request_borrow(book_id, session=user1)[0] == True
+    assert lib.request_borrow(book_id, session=user2)[0] == True
+    assert lib.process_transaction(session=user1)[0] == False
+    assert lib.process_transaction(session=admin)[0] == True
+    assert lib.process_transaction(session=admin)[0] == True
+    
+    assert lib.get_book(book_id).stock == 3
+    assert any(h['transaction'].book_id == book_id for h in lib.get_user_history(session=user2))
+    
+    # Entry point mengecek ROLE_PERMISSIONS, bukan sekadar role admin
+    assert admin.has_permission('view_recommendations')
+    user2.permissions = frozenset({'view_history'})
+    assert lib.request_borrow(book_id, session=user2)[0] == False
+    assert lib.request_return(book_id, session=user2)[0] == False
+    assert lib.get_recommendations(session=user2) == []
+    user2.permissions = frozenset()
+    assert lib.get_user_history(session=user2) == []
+    
+    print("✓ Session-scoped operations test passed")
+
 def run_all_tests():
     """Run all transaction tests"""
     print("\n" + "="*50)
@@ -166,6 +204,7 @@ def run_all_tests():
         test_queue_operations()
         test_history_stack()
         test_stock_management()
+        test_session_scoped_operations()
         
         print("\n" + "="*50)
         print("ALL TRANSACTION TESTS PASSED! ✓")
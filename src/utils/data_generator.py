@@ -0,0 +1,416 @@
+"""
+Generator data sintetis skala besar untuk skema perpustakaan_db
+
+Menghasilkan baris books, users, history dan transactions (kolom sesuai
+perpustakaan_db.sql) dengan distribusi yang mendekati data asli:
+- popularitas buku Zipf (sedikit buku dipinjam sangat sering)
+- aktivitas user Zipf yang lebih landai
+- genre dengan distribusi miring
+- waktu pinjam bursty: awal semester, hari kerja, jam sibuk, event acak
+- stock buku = salinan dikurangi pinjaman yang belum dikembalikan
+
+Baris dibuat per chunk dengan seed sendiri, sehingga hasilnya sama persis
+berapa pun jumlah shard/worker. Output ke CSV (untuk LOAD DATA) atau bulk
+insert lewat connector, paralel di process pool per shard.
+
+Jalankan:
+    python utils/data_generator.py --books 100000 --users 20000 --history 5000000 --out data/generated
+    python utils/data_generator.py --backend sqlite --database data/besar.db --history 1000000
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import csv
+import math
+import random
+import argparse
+import time
+from array import array
+from bisect import bisect
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from models.book import Book
+from models.user import User
+from models.transaction import Transaction, BorrowHistory
+from utils.encryption import PasswordEncryption
+
+# Urutan kolom = urutan COLUMNS model (sama dengan perpustakaan_db.sql)
+TABLE_COLUMNS = {
+    'books': Book.COLUMNS,
+    'users': User.COLUMNS,
+    'history': BorrowHistory.COLUMNS,
+    'transactions': Transaction.COLUMNS,
+}
+
+# Bobot genre (miring: Novel mendominasi, Puisi jarang)
+GENRE_WEIGHTS = {
+    'Novel': 34, 'Komputer': 14, 'Sejarah': 11, 'Sains': 10, 'Agama': 9,
+    'Biografi': 7, 'Anak': 6, 'Ekonomi': 5, 'Filsafat': 3, 'Puisi': 1,
+}
+
+# Bobot per jam (jam buka perpustakaan, puncak siang & sore)
+HOUR_WEIGHTS = [0, 0, 0, 0, 0, 0, 0, 1, 4, 8, 10, 9, 6, 8, 10, 9, 7, 5, 3, 2, 1, 0, 0, 0]
+WEEKDAY_WEIGHTS = [1.0, 1.1, 1.1, 1.0, 0.9, 0.5, 0.3]    # Senin..Minggu
+SEMESTER_STARTS = ((2, 1), (8, 20))                     # (bulan, tanggal) awal semester
+WORDS = ("laskar pelangi bumi manusia ronggeng hujan senja negeri cinta perahu kertas gadis "
+         "pantai ayat matahari sang pemimpi data python sejarah nusantara kopi laut jalan "
+         "rumah kaca anak semua bangsa cantik luka harimau").split()
+
+CHUNK_ROWS = 10000      # Unit seed: shard selalu dipotong di kelipatan chunk
+NULL = '\\N'            # Penanda NULL untuk LOAD DATA
+
+class ZipfSampler:
+    """Sampling rank 1..n dengan peluang ~ 1 / rank^exponent (bisect di CDF)"""
+
+    def __init__(self, n, exponent):
+        self.cumulative = array('d', accumulate(1.0 / (rank ** exponent) for rank in range(1, n + 1)))
+        self.total = self.cumulative[-1]
+
+    def sample(self, rng):
+        """Rank 0-based"""
+        return bisect(self.cumulative, rng.random() * self.total)
+
+class DataGenerator:
+    """Sumber baris sintetis deterministik untuk keempat tabel"""
+
+    def __init__(self, books=10000, users=1000, history=100000, seed=20251207,
+                 book_exponent=1.1, user_exponent=0.8, end=datetime(2025, 12, 1),
+                 span_days=730, open_ratio=0.03, pending_ratio=0.2, admins=1,
+                 password="member123", password_entry=None):
+        """
+        :param book_exponent: Eksponen Zipf popularitas buku (makin besar makin timpang).
+        :param user_exponent: Eksponen Zipf aktivitas user.
+        :param end: Akhir rentang waktu (tetap, supaya hasil bisa diulang).
+        :param open_ratio: Porsi history yang belum dikembalikan.
+        :param pending_ratio: Porsi pinjaman terbuka yang sudah mengajukan
+            pengembalian (transaksi 'return' berstatus pending).
+        :param password_entry: Entry KDF yang dipakai semua user; None =
+            dihitung sekali dari password.
+        """
+        self.counts = {'books': books, 'users': users, 'history': history}
+        self.seed = seed
+        self.book_exponent = book_exponent
+        self.user_exponent = user_exponent
+        self.end = end
+        self.span_days = span_days
+        self.open_ratio = open_ratio
+        self.pending_ratio = pending_ratio
+        self.admins = admins
+        self.password_entry = password_entry or PasswordEncryption.create_password_entry(password)
+        self.open_loans = None      # books_id -> pinjaman terbuka (lihat open_loan_counts)
+        self._samplers = None
+
+    def __getstate__(self):
+        # Sampler besar dibangun ulang di tiap worker, tidak ikut di-pickle
+        state = self.__dict__.copy()
+        state['_samplers'] = None
+        return state
+
+    def _rng(self, table, chunk):
+        return random.Random(f"{self.seed}:{table}:{chunk}")
+
+    def _chunks(self, table, start, end):
+        """(rng, id_awal_chunk, start_efektif, end_efektif) per chunk yang beririsan dengan [start, end)"""
+        for chunk in range((start - 1) // CHUNK_ROWS, (end - 2) // CHUNK_ROWS + 1):
+            low = max(start, chunk * CHUNK_ROWS + 1)
+            high = min(end, (chunk + 1) * CHUNK_ROWS + 1)
+            # Caller membuat baris sejak awal chunk dan membuang yang < low,
+            # supaya hasil tidak bergantung batas shard
+            yield self._rng(table, chunk), chunk * CHUNK_ROWS + 1, low, high
+
+    def _build_samplers(self):
+        rng = random.Random(f"{self.seed}:samplers")
+        book_ranks = list(range(1, self.counts['books'] + 1))
+        user_ranks = list(range(1, self.counts['users'] + 1))
+        rng.shuffle(book_ranks)     # Buku populer tersebar, bukan id 1..k
+        rng.shuffle(user_ranks)
+
+        day_weights = []
+        first_day = self.end - timedelta(days=self.span_days)
+        event_days = set(rng.sample(range(self.span_days), min(self.span_days, 6)))
+        for offset in range(self.span_days):
+            day = first_day + timedelta(days=offset)
+            weight = WEEKDAY_WEIGHTS[day.weekday()]
+            for month, date in SEMESTER_STARTS:
+                start = datetime(day.year, month, date)
+                if timedelta(0) <= day - start < timedelta(days=14):
+                    weight *= 3.0
+            if offset in event_days:
+                weight *= 5.0
+            day_weights.append(weight)
+
+        self._samplers = {
+            'book': ZipfSampler(self.counts['books'], self.book_exponent),
+            'user': ZipfSampler(self.counts['users'], self.user_exponent),
+            'book_ids': book_ranks,
+            'user_ids': user_ranks,
+            'first_day': first_day,
+            'day_cum': list(accumulate(day_weights)),
+            'hour_cum': list(accumulate(HOUR_WEIGHTS)),
+        }
+        return self._samplers
+
+    def _random_time(self, rng, samplers):
+        """Waktu pinjam bursty (hari berbobot, jam sibuk)"""
+        day = rng.choices(range(self.span_days), cum_weights=samplers['day_cum'])[0]
+        hour = rng.choices(range(24), cum_weights=samplers['hour_cum'])[0]
+        return samplers['first_day'] + timedelta(days=day, hours=hour, seconds=rng.randrange(3600))
+
+    def book_rows(self, start=1, end=None):
+        """
+        Baris books (books_id, isbn, title, author, genre, year, stock, description, reserved).
+        stock adalah salinan yang ada di rak: jumlah salinan dikurangi pinjaman
+        terbuka di history (salinan minimal sebanyak pinjaman terbuka), sehingga
+        transaksi return pending tidak membuat stock melebihi jumlah salinan.
+        """
+        end = end or self.counts['books'] + 1
+        if self.open_loans is None:
+            self.open_loans = self.open_loan_counts()
+        genres = list(GENRE_WEIGHTS)
+        genre_cum = list(accumulate(GENRE_WEIGHTS.values()))
+        authors = max(1, self.counts['books'] // 8)
+        for rng, chunk_start, low, high in self._chunks('books', start, end):
+            for books_id in range(chunk_start, high):
+                title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).title()
+                genre = rng.choices(genres, cum_weights=genre_cum)[0]
+                author = f"Penulis {int(authors * rng.random() ** 2) + 1}"     # Penulis produktif lebih sering
+                year = min(2025, 2025 - int(rng.expovariate(1 / 12)))
+                copies = rng.choices((0, 1, 2, 3, 5, 10), (5, 40, 25, 15, 10, 5))[0]
+                description = f"{title} - {genre}" if rng.random() < 0.5 else None
+                if books_id >= low:
+                    yield (books_id, f"978{books_id:010d}", f"{title} #{books_id}", author,
+                           genre, year, max(0, copies - self.open_loans.get(books_id, 0)), description, 0)
+
+    def user_rows(self, start=1, end=None):
+        """Baris users (user_id, username, password_hash, role, created_at)"""
+        end = end or self.counts['users'] + 1
+        first_day = self.end - timedelta(days=self.span_days)
+        for rng, chunk_start, low, high in self._chunks('users', start, end):
+            for user_id in range(chunk_start, high):
+                # Pendaftaran makin ramai mendekati akhir rentang
+                created = first_day + timedelta(seconds=int(self.span_days * 86400 * math.sqrt(rng.random())))
+                if user_id >= low:
+                    role = 'admin' if user_id <= self.admins else 'member'
+                    yield (user_id, f"user{user_id:07d}", self.password_entry, role, created)
+
+    def history_rows(self, start=1, end=None):
+        """
+        Baris history beserta transaksinya.
+        :return: Generator (baris_history, [baris_transaksi...]); transaction_id
+            borrow = 2*history_id-1 dan return = 2*history_id.
+        """
+        end = end or self.counts['history'] + 1
+        samplers = self._samplers or self._build_samplers()
+        book_sampler, user_sampler = samplers['book'], samplers['user']
+        book_ids, user_ids = samplers['book_ids'], samplers['user_ids']
+        for rng, chunk_start, low, high in self._chunks('history', start, end):
+            for history_id in range(chunk_start, high):
+                user_id = user_ids[user_sampler.sample(rng)]
+                book_id = book_ids[book_sampler.sample(rng)]
+                borrowed = self._random_time(rng, samplers)
+                # Durasi pinjam log-normal (median ~7 hari, ekor panjang)
+                duration = timedelta(seconds=int(min(90.0, rng.lognormvariate(math.log(7), 0.6)) * 86400))
+                is_open = rng.random() < self.open_ratio or borrowed + duration > self.end
+                returned = None if is_open else borrowed + duration
+                pending_return = is_open and rng.random() < self.pending_ratio
+                if history_id < low:
+                    continue
+
+                transactions = [(2 * history_id - 1, user_id, book_id, 'borrow', 'approved', borrowed)]
+                if returned:
+                    transactions.append((2 * history_id, user_id, book_id, 'return', 'approved', returned))
+                elif pending_return:
+                    transactions.append((2 * history_id, user_id, book_id, 'return', 'pending',
+                                         min(self.end, borrowed + duration)))
+                yield (history_id, user_id, book_id, borrowed, returned), transactions
+
+    def open_loan_counts(self, start=1, end=None):
+        """Jumlah pinjaman terbuka (return_date NULL) per books_id di history [start, end)"""
+        counts = Counter()
+        for history, _ in self.history_rows(start, end):
+            if history[4] is None:
+                counts[history[2]] += 1
+        return counts
+
+    def shards(self, table, count):
+        """Bagi id 1..n menjadi maksimal count rentang [start, end) sejajar chunk"""
+        total = self.counts[table]
+        chunks = -(-total // CHUNK_ROWS)
+        per_shard = -(-chunks // max(1, count))
+        return [
+            (index * CHUNK_ROWS + 1, min(total, (index + per_shard) * CHUNK_ROWS) + 1)
+            for index in range(0, chunks, per_shard)
+        ]
+
+# ==================== OUTPUT ====================
+
+def csv_value(value):
+    if value is None:
+        return NULL
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+def write_csv(path, rows):
+    """Tulis baris ke CSV untuk LOAD DATA (NULL = \\N, tanpa header)"""
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        for row in rows:
+            writer.writerow([csv_value(value) for value in row])
+            count += 1
+    return count
+
+def load_data_statement(table, path):
+    """Statement MySQL untuk memuat satu file CSV hasil write_csv"""
+    columns = ", ".join(f"`{column}`" for column in TABLE_COLUMNS[table])
+    path = os.path.abspath(path).replace('\\', '/')
+    return (f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE `{table}` "
+            f"CHARACTER SET utf8mb4 FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+            f"LINES TERMINATED BY '\\n' ({columns});")
+
+def insert_rows(db, table, rows, batch_size=5000):
+    """Bulk insert lewat connector.execute_many, per batch"""
+    columns = TABLE_COLUMNS[table]
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    count = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            if db.execute_many(query, batch) is None:
+                raise RuntimeError(f"Bulk insert {table} gagal")
+            count += len(batch)
+            batch = []
+    if batch:
+        if db.execute_many(query, batch) is None:
+            raise RuntimeError(f"Bulk insert {table} gagal")
+        count += len(batch)
+    return count
+
+def _split_history(pairs, sink):
+    """Teruskan baris history, kumpulkan transaksinya ke sink"""
+    for history, transactions in pairs:
+        sink.extend(transactions)
+        yield history
+
+def _count_open_loans(generator, start, end):
+    """Hitung pinjaman terbuka satu shard history (dipanggil di worker process)"""
+    return generator.open_loan_counts(start, end)
+
+def _run_shard(generator, table, start, end, output_dir, backend, db_options):
+    """Kerjakan satu shard (dipanggil di worker process)"""
+    counts = {}
+    db = None
+    if output_dir is None:
+        from utils.database_connector import create_connector
+        from utils.query_stats import QueryStats
+        # Batch bulk insert selalu "lambat"; slow query log hanya jadi noise
+        db = create_connector(backend, stats=QueryStats(enabled=False), **db_options)
+        if not db.connect():
+            raise RuntimeError("Gagal terhubung ke database")
+
+    try:
+        if table == 'history':
+            transactions = []
+            history = _split_history(generator.history_rows(start, end), transactions)
+            if db:
+                counts['history'] = insert_rows(db, 'history', history)
+                counts['transactions'] = insert_rows(db, 'transactions', transactions)
+            else:
+                suffix = f"{start:010d}.csv"
+                counts['history'] = write_csv(os.path.join(output_dir, f"history.{suffix}"), history)
+                counts['transactions'] = write_csv(os.path.join(output_dir, f"transactions.{suffix}"), transactions)
+        else:
+            rows = generator.book_rows(start, end) if table == 'books' else generator.user_rows(start, end)
+            if db:
+                counts[table] = insert_rows(db, table, rows)
+            else:
+                counts[table] = write_csv(os.path.join(output_dir, f"{table}.{start:010d}.csv"), rows)
+    finally:
+        if db:
+            db.disconnect()
+    return counts
+
+def generate(generator, workers=None, shards=None, output_dir=None, backend='sqlite', db_options=None):
+    """
+    Hasilkan semua tabel secara paralel.
+    :param output_dir: Folder CSV; None = bulk insert ke database.
+    :param shards: Jumlah shard per tabel (default = workers).
+    :return: Jumlah baris per tabel.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = shards or workers
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    totals = {table: 0 for table in TABLE_COLUMNS}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Stock buku bergantung pada pinjaman terbuka di history: dihitung
+        # paralel per shard dulu lalu ikut dikirim ke worker books
+        if generator.open_loans is None:
+            open_loans = Counter()
+            futures = [
+                executor.submit(_count_open_loans, generator, start, end)
+                for start, end in generator.shards('history', shards)
+            ]
+            for future in futures:
+                open_loans.update(future.result())
+            generator.open_loans = open_loans
+
+        # books & users dulu: history/transactions punya foreign key ke keduanya
+        for tables in (('books', 'users'), ('history',)):
+            futures = [
+                executor.submit(_run_shard, generator, table, start, end, output_dir, backend, db_options or {})
+                for table in tables
+                for start, end in generator.shards(table, shards)
+            ]
+            for future in futures:
+                for table, count in future.result().items():
+                    totals[table] += count
+    return totals
+
+def main():
+    parser = argparse.ArgumentParser(description="Generator data sintetis perpustakaan_db")
+    parser.add_argument('--books', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--history', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=20251207)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--shards', type=int, default=None)
+    parser.add_argument('--out', default=None, help="Folder output CSV (untuk LOAD DATA)")
+    parser.add_argument('--backend', choices=('sqlite', 'mysql'), default='sqlite',
+                        help="Bulk insert langsung jika --out tidak diberikan")
+    parser.add_argument('--database', default='data/sintetis.db', help="File SQLite / nama database MySQL")
+    args = parser.parse_args()
+
+    generator = DataGenerator(books=args.books, users=args.users, history=args.history, seed=args.seed)
+    if args.backend == 'mysql':
+        db_options = {'host': "localhost", 'user': "root", 'password': "", 'database': args.database}
+    else:
+        db_options = {'database': args.database}
+
+    started = time.perf_counter()
+    totals = generate(generator, workers=args.workers, shards=args.shards, output_dir=args.out,
+                      backend=args.backend, db_options=db_options)
+    elapsed = time.perf_counter() - started
+
+    print("\n" + "="*60)
+    for table, count in totals.items():
+        print(f"{table:<14}: {count:>12,} baris")
+    print(f"Selesai dalam {elapsed:.1f} s ({sum(totals.values()) / elapsed:,.0f} baris/s)")
+    if args.out:
+        print("\nMuat ke MySQL (urut: books, users, history, transactions):")
+        for table in ('books', 'users', 'history', 'transactions'):
+            for name in sorted(os.listdir(args.out)):
+                if name.startswith(f"{table}."):
+                    print(load_data_statement(table, os.path.join(args.out, name)))
+    print("="*60 + "\n")
+
+if __name__ == "__main__":
+    main()
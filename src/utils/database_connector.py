@@ -1,10 +1,48 @@
-import mysql.connector
-from mysql.connector import Error
+from operator import itemgetter
+from datetime import datetime
+from functools import lru_cache
+import re
+import sqlite3
+import threading
+import time
+import uuid
+
+from utils.query_stats import QueryStats
+
+# mysql.connector baru diimport saat koneksi MySQL pertama: import-nya
+# mahal (memperlambat munculnya login window) dan tidak dibutuhkan backend
+# SQLite, yang tetap jalan tanpa mysql-connector-python
+mysql = None
+
+class Error(Exception):
+    """Pengganti mysql.connector.Error sebelum paket diimport / jika tidak terpasang"""
+
+def _load_mysql():
+    """Import mysql.connector (sekali); False jika paket tidak terpasang"""
+    global mysql, Error
+    if mysql is None:
+        try:
+            import mysql.connector
+            import mysql.connector.pooling
+        except ImportError:
+            return False
+        Error = mysql.connector.Error
+    return True
+
+class QueryError(Exception):
+    """Error saat streaming query (dilempar agar hasil tidak terpotong diam-diam)"""
 
 class DatabaseConnector:
     """Menangani koneksi dan operasi ke database MySQL."""
 
-    def __init__(self, host, user, password, database):
+    def __init__(self, host, user, password, database, pool_size=None, stats=None):
+        """
+        :param pool_size: None untuk satu koneksi bersama (diserialisasi lock),
+            atau ukuran connection pool agar banyak sesi/thread bisa query
+            bersamaan.
+        :param stats: QueryStats untuk instrumentasi (default: baru, slow
+            query >= 100 ms).
+        """
         self.config = {
             'host': host,
             'user': user,
@@ -12,10 +50,37 @@ class DatabaseConnector:
             'database': database
         }
         self.connection = None
+        self.pool_size = pool_size
+        self.pool = None
+        self._lock = threading.RLock()
+        # Koneksi khusus stream_query tanpa pool (dibuka sekali, dipakai ulang)
+        self._stream_connection = None
+        self._stream_lock = threading.Lock()
+        self.stats = stats or QueryStats()
+
+    def clone(self):
+        """Connector baru dengan konfigurasi sama (mis. untuk thread loader)"""
+        return DatabaseConnector(**self.config, stats=self.stats)
+
+    def _is_connected(self):
+        return self.connection is not None and self.connection.is_connected()
 
     def connect(self):
         """Membuat koneksi ke database."""
+        if not _load_mysql():
+            print("Error saat menghubungkan ke MySQL: paket mysql-connector-python tidak terpasang")
+            return False
         try:
+            if self.pool_size:
+                if self.pool is None:
+                    self.pool = mysql.connector.pooling.MySQLConnectionPool(
+                        pool_name=f"perpustakaan_{id(self)}", pool_size=self.pool_size, **self.config
+                    )
+                # Koneksi pengecekan langsung dikembalikan ke pool
+                self.pool.get_connection().close()
+                print(f"Berhasil terhubung ke database MySQL (pool {self.pool_size} koneksi)")
+                return True
+
             self.connection = mysql.connector.connect(**self.config)
             if self.connection.is_connected():
                 print("Berhasil terhubung ke database MySQL")
@@ -27,41 +92,258 @@ class DatabaseConnector:
 
     def disconnect(self):
         """Menutup koneksi database."""
+        # Stream yang masih berjalan melepas koneksinya sendiri saat selesai
+        if self._stream_lock.acquire(blocking=False):
+            try:
+                if self._stream_connection and self._stream_connection.is_connected():
+                    self._stream_connection.close()
+                self._stream_connection = None
+            finally:
+                self._stream_lock.release()
         if self.connection and self.connection.is_connected():
             self.connection.close()
             print("Koneksi MySQL ditutup")
 
-    def execute_query(self, query, params=None, fetch=None):
+    @staticmethod
+    def make_row_converter(description, row_factory):
+        """
+        Buat fungsi konversi baris tuple untuk row_factory.
+        Posisi kolom di-resolve sekali dari cursor.description, bukan per baris.
+        :return: None jika baris tuple dipakai apa adanya.
+        """
+        if row_factory is tuple:
+            return None
+
+        names = tuple(column[0] for column in description)
+        columns = row_factory.COLUMNS
+        if names == columns:
+            return row_factory.from_row
+
+        missing = [name for name in columns if name not in names]
+        if missing:
+            raise ValueError(f"Kolom {', '.join(missing)} tidak ada di hasil query untuk {row_factory.__name__}")
+
+        pick = itemgetter(*[names.index(name) for name in columns])
+        from_row = row_factory.from_row
+        return lambda row: from_row(pick(row))
+
+    def execute_query(self, query, params=None, fetch=None, row_factory=None):
         """
         Menjalankan query.
         :param query: String query SQL.
         :param params: Tuple parameter untuk query.
-        :param fetch: 'one', 'all', atau None (untuk INSERT, UPDATE, DELETE).
+        :param fetch: 'one', 'all', 'rowcount' (jumlah baris terdampak write),
+            atau None (untuk INSERT, UPDATE, DELETE).
+        :param row_factory: None (dictionary), tuple, atau model dengan COLUMNS & from_row.
         :return: Hasil query jika ada, atau lastrowid.
         """
-        if not self.connection or not self.connection.is_connected():
-            print("Tidak ada koneksi ke database.")
-            if not self.connect():
+        if self.pool_size:
+            if self.pool is None and not self.connect():
+                return None
+            try:
+                connection = self.pool.get_connection()
+            except Error as e:
+                print(f"Error saat mengambil koneksi dari pool: {e}")
                 return None
+            try:
+                return self._execute(connection, query, params, fetch, row_factory)
+            finally:
+                connection.close() # Kembali ke pool
 
-        cursor = self.connection.cursor(dictionary=True) # Menggunakan dictionary cursor
+        # Satu koneksi dipakai bersama oleh semua sesi/thread
+        with self._lock:
+            if not self._is_connected():
+                print("Tidak ada koneksi ke database.")
+                if not self.connect():
+                    return None
+            return self._execute(self.connection, query, params, fetch, row_factory)
+
+    def _execute(self, connection, query, params, fetch, row_factory):
+        """Jalankan satu query di koneksi yang diberikan"""
+        # Dictionary cursor hanya jika caller tidak meminta row_factory
+        cursor = connection.cursor(dictionary=row_factory is None)
         result = None
+        rows = 0
+        error = False
+        started = time.perf_counter()
         try:
             cursor.execute(query, params or ())
             if fetch == 'one':
                 result = cursor.fetchone()
+                rows = 1 if result else 0
+                if row_factory is not None and result:
+                    convert = self.make_row_converter(cursor.description, row_factory)
+                    result = convert(result) if convert else result
             elif fetch == 'all':
                 result = cursor.fetchall()
+                rows = len(result)
+                if row_factory is not None and result:
+                    convert = self.make_row_converter(cursor.description, row_factory)
+                    result = [convert(row) for row in result] if convert else result
+            elif fetch == 'rowcount':
+                connection.commit()
+                result = rows = cursor.rowcount # Berguna untuk UPDATE bersyarat (klaim, stock)
             else:
-                self.connection.commit()
+                connection.commit()
+                rows = cursor.rowcount
                 result = cursor.lastrowid # Berguna untuk mendapatkan ID setelah INSERT
         except Error as e:
+            error = True
+            print(f"Error saat menjalankan query: {e}")
+            connection.rollback()
+        finally:
+            cursor.close()
+            self.stats.record(query, time.perf_counter() - started, rows, error)
+        return result
+
+    def execute_many(self, query, rows):
+        """
+        Menjalankan satu query write untuk banyak baris (bulk insert).
+        :param rows: List tuple parameter, satu per baris.
+        :return: Jumlah baris terdampak, atau None jika gagal.
+        """
+        if self.pool_size:
+            if self.pool is None and not self.connect():
+                return None
+            try:
+                connection = self.pool.get_connection()
+            except Error as e:
+                print(f"Error saat mengambil koneksi dari pool: {e}")
+                return None
+            try:
+                return self._execute_many(connection, query, rows)
+            finally:
+                connection.close()
+
+        with self._lock:
+            if not self._is_connected() and not self.connect():
+                return None
+            return self._execute_many(self.connection, query, rows)
+
+    def _execute_many(self, connection, query, rows):
+        """executemany + commit; INSERT ditulis ulang jadi satu multi-row VALUES"""
+        cursor = connection.cursor()
+        result = None
+        error = False
+        started = time.perf_counter()
+        try:
+            cursor.executemany(query, rows)
+            connection.commit()
+            result = cursor.rowcount
+        except Error as e:
+            error = True
             print(f"Error saat menjalankan query: {e}")
-            self.connection.rollback()
+            connection.rollback()
         finally:
             cursor.close()
+            self.stats.record(query, time.perf_counter() - started, result or 0, error)
         return result
 
+    def _acquire_stream_connection(self):
+        """
+        Koneksi untuk stream_query tanpa handshake baru per panggilan: dari
+        pool jika pool_size diset, selain itu koneksi streaming khusus yang
+        dipakai ulang. Stream bersarang/bersamaan saat koneksi khusus sedang
+        dipakai mendapat koneksi sementara.
+        :return: (connection, mode) dengan mode 'pool', 'dedicated' atau 'temporary'.
+        """
+        if self.pool_size:
+            if self.pool is None and not self.connect():
+                raise Error("connection pool tidak tersedia")
+            try:
+                return self.pool.get_connection(), 'pool'
+            except Error:
+                # Pool sedang habis dipakai: jangan gagalkan stream
+                return mysql.connector.connect(**self.config), 'temporary'
+
+        if self._stream_lock.acquire(blocking=False):
+            try:
+                if self._stream_connection is None or not self._stream_connection.is_connected():
+                    self._stream_connection = mysql.connector.connect(**self.config)
+            except Error:
+                self._stream_connection = None
+                self._stream_lock.release()
+                raise
+            return self._stream_connection, 'dedicated'
+        return mysql.connector.connect(**self.config), 'temporary'
+
+    def _release_stream_connection(self, connection, mode):
+        """Kembalikan koneksi stream_query setelah sisa baris unbuffered dibuang"""
+        if mode != 'dedicated':
+            connection.close()  # Ditutup, atau kembali ke pool (sesi direset pool)
+            return
+
+        try:
+            # Akhiri transaksi baca agar stream berikutnya melihat data terbaru
+            connection.rollback()
+        except Error:
+            try:
+                connection.close()
+            except Error:
+                pass
+            self._stream_connection = None
+        finally:
+            self._stream_lock.release()
+
+    def stream_query(self, query, params=None, row_factory=None, batch_size=1000, batches=False):
+        """
+        Generator untuk result set besar tanpa fetchall().
+        Memakai koneksi terpisah dari koneksi utama (dari pool, atau koneksi
+        streaming yang dipakai ulang) dengan cursor unbuffered sehingga baris
+        dibaca dari server per batch (fetchmany) dan koneksi utama tetap bisa
+        dipakai selama iterasi berlangsung.
+        :param row_factory: None (dictionary), tuple, atau model dengan COLUMNS & from_row.
+        :param batch_size: Jumlah baris per fetchmany.
+        :param batches: True untuk yield list per batch, False untuk yield per baris.
+        :raises QueryError: Jika koneksi atau query gagal.
+        """
+        if not _load_mysql():
+            raise QueryError("Gagal membuka koneksi streaming: paket mysql-connector-python tidak terpasang")
+        try:
+            connection, mode = self._acquire_stream_connection()
+        except Error as e:
+            raise QueryError(f"Gagal membuka koneksi streaming: {e}") from e
+
+        cursor = connection.cursor(dictionary=row_factory is None, buffered=False)
+        # Waktu hanya dihitung selama menunggu database, bukan saat consumer memproses
+        elapsed = 0.0
+        count = 0
+        error = False
+        try:
+            started = time.perf_counter()
+            cursor.execute(query, params or ())
+            elapsed += time.perf_counter() - started
+            convert = None
+            if row_factory is not None:
+                convert = self.make_row_converter(cursor.description, row_factory)
+
+            while True:
+                started = time.perf_counter()
+                rows = cursor.fetchmany(batch_size)
+                elapsed += time.perf_counter() - started
+                if not rows:
+                    break
+                count += len(rows)
+                if convert:
+                    rows = [convert(row) for row in rows]
+                if batches:
+                    yield rows
+                else:
+                    yield from rows
+        except Error as e:
+            error = True
+            raise QueryError(f"Error saat streaming query: {e}") from e
+        finally:
+            # Consumer bisa berhenti di tengah jalan; sisa baris dibuang
+            # sebelum koneksi dipakai lagi
+            try:
+                connection.consume_results()
+                cursor.close()
+            except Error:
+                pass
+            self._release_stream_connection(connection, mode)
+            self.stats.record(query, elapsed, count, error)
+
     def test_connection(self):
         """Tes koneksi ke database."""
         if self.connect():
@@ -69,6 +351,311 @@ class DatabaseConnector:
             return True
         return False
 
+# ==================== SQLITE BACKEND ====================
+
+# Skema setara data/perpustakaan_db.sql (tipe, default, index, foreign key).
+# Kolom teks memakai NOCASE seperti collation utf8mb4_general_ci.
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+  books_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  isbn TEXT COLLATE NOCASE DEFAULT NULL,
+  title TEXT COLLATE NOCASE NOT NULL,
+  author TEXT COLLATE NOCASE DEFAULT NULL,
+  genre TEXT COLLATE NOCASE DEFAULT NULL,
+  year INTEGER DEFAULT NULL,
+  stock INTEGER DEFAULT 1,
+  description TEXT DEFAULT NULL,
+  reserved INTEGER NOT NULL DEFAULT 0
+);
+CREATE UNIQUE INDEX IF NOT EXISTS isbn ON books (isbn);
+CREATE INDEX IF NOT EXISTS idx_books_title ON books (title);
+CREATE INDEX IF NOT EXISTS idx_books_author ON books (author);
+CREATE INDEX IF NOT EXISTS idx_books_genre ON books (genre);
+
+CREATE TABLE IF NOT EXISTS users (
+  user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  username TEXT COLLATE NOCASE NOT NULL,
+  password_hash TEXT NOT NULL,
+  role TEXT NOT NULL DEFAULT 'member',
+  created_at DATETIME DEFAULT (datetime('now', 'localtime'))
+);
+CREATE UNIQUE INDEX IF NOT EXISTS username ON users (username);
+CREATE INDEX IF NOT EXISTS idx_users_username ON users (username);
+
+CREATE TABLE IF NOT EXISTS history (
+  history_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  user_id INTEGER NOT NULL REFERENCES users (user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+  book_id INTEGER NOT NULL REFERENCES books (books_id) ON DELETE CASCADE ON UPDATE CASCADE,
+  borrow_date DATETIME DEFAULT (datetime('now', 'localtime')),
+  return_date DATETIME DEFAULT NULL
+);
+CREATE INDEX IF NOT EXISTS fk_history_book ON history (book_id);
+CREATE INDEX IF NOT EXISTS idx_history_user ON history (user_id);
+
+CREATE TABLE IF NOT EXISTS transactions (
+  transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  user_id INTEGER NOT NULL REFERENCES users (user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+  book_id INTEGER NOT NULL REFERENCES books (books_id) ON DELETE CASCADE ON UPDATE CASCADE,
+  type TEXT NOT NULL CHECK (type IN ('borrow', 'return')),
+  status TEXT DEFAULT 'pending',
+  timestamp DATETIME DEFAULT (datetime('now', 'localtime')),
+  claimed_by TEXT DEFAULT NULL,
+  claim_expires DATETIME DEFAULT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_user ON transactions (user_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_book ON transactions (book_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_status ON transactions (status, transaction_id);
+
+CREATE TABLE IF NOT EXISTS change_log (
+  change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  entity TEXT NOT NULL,
+  entity_id INTEGER NOT NULL,
+  action TEXT NOT NULL,
+  origin TEXT DEFAULT NULL,
+  created_at DATETIME DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS idx_change_log_created ON change_log (created_at);
+"""
+
+# Kolom yang ditambahkan setelah skema awal: (tabel, kolom, definisi),
+# ditambahkan ke file database lama saat dibuka
+SQLITE_ADDED_COLUMNS = (
+    ('books', 'reserved', "INTEGER NOT NULL DEFAULT 0"),
+)
+
+# Pragma per koneksi: WAL (pembaca tidak diblok penulis), fsync lebih jarang,
+# cache & mmap besar untuk point read
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA busy_timeout = 5000",
+)
+
+# Adapter/converter sqlite3 berlaku untuk seluruh proses, jadi baru
+# didaftarkan saat SQLiteConnector membuka koneksi pertamanya (bukan saat
+# modul diimport oleh aplikasi yang hanya memakai MySQL)
+_sqlite_types_registered = False
+_sqlite_types_lock = threading.Lock()
+
+def _register_sqlite_types():
+    """Daftarkan konversi DATETIME (sekali per proses)
+
+    DATETIME disimpan sebagai teks 'YYYY-MM-DD HH:MM:SS' (bisa dibandingkan
+    leksikal) dan dikembalikan sebagai datetime seperti mysql.connector.
+    """
+    global _sqlite_types_registered
+    with _sqlite_types_lock:
+        if _sqlite_types_registered:
+            return
+        sqlite3.register_adapter(datetime, lambda value: value.isoformat(' ', 'seconds'))
+        sqlite3.register_converter('DATETIME', lambda value: datetime.fromisoformat(value.decode('utf-8')))
+        _sqlite_types_registered = True
+
+@lru_cache(maxsize=512)
+def translate_placeholders(query):
+    """Ubah placeholder gaya MySQL (%s, %%) ke gaya SQLite (?, %)"""
+    return re.sub(r"%([s%])", lambda m: '?' if m.group(1) == 's' else '%', query)
+
+class SQLiteConnector(DatabaseConnector):
+    """Backend SQLite dengan antarmuka sama seperti DatabaseConnector
+
+    Tidak butuh server: cocok untuk instalasi satu cabang dan test. Query
+    tetap ditulis dengan placeholder %s dan diterjemahkan otomatis.
+    """
+
+    def __init__(self, database='perpustakaan.db', create_schema=True, stats=None):
+        """
+        :param database: Path file database, atau ':memory:' (dibagi antar
+            koneksi connector ini lewat shared cache).
+        :param create_schema: Buat tabel & index jika belum ada.
+        :param stats: QueryStats untuk instrumentasi.
+        """
+        if database == ':memory:':
+            database = f"file:perpustakaan_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        self.config = {'database': database, 'create_schema': create_schema}
+        self.connection = None
+        self.pool_size = None
+        self.pool = None
+        self._lock = threading.RLock()
+        self.stats = stats or QueryStats()
+
+    def clone(self):
+        """Connector baru ke database yang sama"""
+        return SQLiteConnector(**self.config, stats=self.stats)
+
+    def _open(self):
+        _register_sqlite_types()
+        connection = sqlite3.connect(
+            self.config['database'], uri=True, check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES
+        )
+        for pragma in SQLITE_PRAGMAS:
+            connection.execute(pragma)
+        return connection
+
+    def _is_connected(self):
+        return self.connection is not None
+
+    def connect(self):
+        """Membuka database SQLite (dan membuat skema jika perlu)."""
+        with self._lock:
+            if self.connection is not None:
+                return True
+            try:
+                self.connection = self._open()
+                if self.config['create_schema']:
+                    self.connection.executescript(SQLITE_SCHEMA)
+                    self._add_missing_columns()
+                print(f"Berhasil membuka database SQLite {self.config['database']}")
+                return True
+            except sqlite3.Error as e:
+                print(f"Error saat membuka SQLite: {e}")
+                self.connection = None
+                return False
+
+    def _add_missing_columns(self):
+        """Setara migrasi MySQL di data/migrations untuk file SQLite lama"""
+        for table, column, definition in SQLITE_ADDED_COLUMNS:
+            existing = {row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")}
+            if column not in existing:
+                self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        self.connection.commit()
+
+    def disconnect(self):
+        """Menutup database."""
+        with self._lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+                print("Koneksi SQLite ditutup")
+
+    def execute_query(self, query, params=None, fetch=None, row_factory=None):
+        """Sama seperti DatabaseConnector.execute_query"""
+        with self._lock:
+            if not self._is_connected() and not self.connect():
+                return None
+            return self._execute(self.connection, query, params, fetch, row_factory)
+
+    def execute_many(self, query, rows):
+        """Sama seperti DatabaseConnector.execute_many"""
+        with self._lock:
+            if not self._is_connected() and not self.connect():
+                return None
+            return self._execute_many(self.connection, query, rows)
+
+    def _execute_many(self, connection, query, rows):
+        result = None
+        error = False
+        started = time.perf_counter()
+        try:
+            cursor = connection.executemany(translate_placeholders(query), rows)
+            connection.commit()
+            result = cursor.rowcount
+        except sqlite3.Error as e:
+            error = True
+            print(f"Error saat menjalankan query: {e}")
+            connection.rollback()
+        finally:
+            self.stats.record(query, time.perf_counter() - started, result or 0, error)
+        return result
+
+    @staticmethod
+    def _dict_converter(description):
+        names = tuple(column[0] for column in description)
+        return lambda row: dict(zip(names, row))
+
+    def _execute(self, connection, query, params, fetch, row_factory):
+        """Jalankan satu query dengan placeholder yang sudah diterjemahkan"""
+        cursor = connection.cursor()
+        result = None
+        count = 0
+        error = False
+        started = time.perf_counter()
+        try:
+            cursor.execute(translate_placeholders(query), params or ())
+            if fetch in ('one', 'all'):
+                rows = [cursor.fetchone()] if fetch == 'one' else cursor.fetchall()
+                count = sum(1 for row in rows if row is not None)
+                if row_factory is None:
+                    convert = self._dict_converter(cursor.description)
+                else:
+                    convert = self.make_row_converter(cursor.description, row_factory)
+                if convert:
+                    rows = [convert(row) if row is not None else None for row in rows]
+                result = rows[0] if fetch == 'one' else rows
+            elif fetch == 'rowcount':
+                connection.commit()
+                result = count = cursor.rowcount
+            else:
+                connection.commit()
+                count = cursor.rowcount
+                result = cursor.lastrowid
+        except sqlite3.Error as e:
+            error = True
+            print(f"Error saat menjalankan query: {e}")
+            connection.rollback()
+        finally:
+            cursor.close()
+            self.stats.record(query, time.perf_counter() - started, count, error)
+        return result
+
+    def stream_query(self, query, params=None, row_factory=None, batch_size=1000, batches=False):
+        """Versi SQLite stream_query (koneksi baca terpisah, fetchmany)"""
+        try:
+            connection = self._open()
+        except sqlite3.Error as e:
+            raise QueryError(f"Gagal membuka koneksi streaming: {e}") from e
+
+        cursor = connection.cursor()
+        elapsed = 0.0
+        count = 0
+        error = False
+        try:
+            started = time.perf_counter()
+            cursor.execute(translate_placeholders(query), params or ())
+            elapsed += time.perf_counter() - started
+            if row_factory is None:
+                convert = self._dict_converter(cursor.description)
+            else:
+                convert = self.make_row_converter(cursor.description, row_factory)
+
+            while True:
+                started = time.perf_counter()
+                rows = cursor.fetchmany(batch_size)
+                elapsed += time.perf_counter() - started
+                if not rows:
+                    break
+                count += len(rows)
+                if convert:
+                    rows = [convert(row) for row in rows]
+                if batches:
+                    yield rows
+                else:
+                    yield from rows
+        except sqlite3.Error as e:
+            error = True
+            raise QueryError(f"Error saat streaming query: {e}") from e
+        finally:
+            cursor.close()
+            connection.close()
+            self.stats.record(query, elapsed, count, error)
+
+def create_connector(backend='mysql', **options):
+    """
+    Buat connector sesuai backend.
+    :param backend: 'mysql' (host, user, password, database, pool_size, stats)
+        atau 'sqlite' (database, create_schema, stats).
+    """
+    if backend == 'mysql':
+        return DatabaseConnector(**options)
+    if backend == 'sqlite':
+        return SQLiteConnector(**options)
+    raise ValueError(f"Backend database tidak dikenal: {backend}")
+
 # Konfigurasi default untuk XAMPP
 db_config = {
     "host": "localhost",
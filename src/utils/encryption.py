@@ -1,9 +1,127 @@
 import hashlib
+import hmac
 import secrets
 import base64
+import binascii
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# numpy (opsional) baru diimport saat XOR pertama: import-nya mahal dan
+# tidak dibutuhkan untuk login/startup
+_numpy = None
+
+def _load_numpy():
+    """Modul numpy, atau False jika tidak terpasang"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy
+
+def _pbkdf2_sha256(password, salt, iterations):
+    """KDF PBKDF2-HMAC-SHA256"""
+    return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('utf-8'), iterations).hex()
+
+def _scrypt(password, salt, n, r, p):
+    """KDF scrypt (memory-hard)"""
+    return hashlib.scrypt(
+        password.encode('utf-8'), salt=salt.encode('utf-8'),
+        n=n, r=r, p=p, maxmem=128 * n * r * p + 1024 * 1024
+    ).hex()
+
+# Scheme KDF -> (fungsi, nama parameter cost berurutan)
+KDF_SCHEMES = {
+    'pbkdf2_sha256': (_pbkdf2_sha256, ('iterations',)),
+    'scrypt': (_scrypt, ('n', 'r', 'p')),
+}
 
 class PasswordEncryption:
-    """Password encryption menggunakan SHA-256 dengan salt"""
+    """Password hashing dengan KDF (PBKDF2/scrypt) dan salt
+
+    Format entry: ``scheme$cost1[$cost2...]$salt$hash``. Entry lama
+    ``hash$salt`` (SHA-256 tunggal) tetap bisa diverifikasi dan ditandai
+    ``needs_rehash`` agar di-upgrade saat login berikutnya.
+
+    KDF sengaja lambat (~100 ms), jadi perhitungannya dijalankan di pool
+    (``submit``) supaya login/registrasi bersamaan tidak saling menunggu.
+    """
+    
+    # Scheme dan cost default untuk entry baru (atur lewat configure)
+    scheme = 'pbkdf2_sha256'
+    cost = {
+        'pbkdf2_sha256': {'iterations': 200_000},
+        'scrypt': {'n': 2 ** 14, 'r': 8, 'p': 1},
+    }
+    pool_workers = 4
+    use_processes = False
+    start_method = None     # Start method worker proses (None = default platform)
+    
+    _executor = None
+    _executor_lock = threading.Lock()
+    
+    @classmethod
+    def configure(cls, scheme=None, pool_workers=None, use_processes=None, **cost):
+        """
+        Atur KDF default dan pool verifikasi.
+        :param scheme: 'pbkdf2_sha256' atau 'scrypt'.
+        :param cost: Parameter cost scheme (mis. iterations=300000 atau n=2**15).
+        :param use_processes: True untuk ProcessPoolExecutor (kelipatan core,
+            bukan hanya thread yang melepas GIL).
+        """
+        scheme = scheme or cls.scheme
+        if scheme not in KDF_SCHEMES:
+            raise ValueError(f"Scheme KDF tidak dikenal: {scheme}")
+        
+        unknown = set(cost) - set(KDF_SCHEMES[scheme][1])
+        if unknown:
+            raise ValueError(f"Parameter cost tidak dikenal untuk {scheme}: {', '.join(sorted(unknown))}")
+        
+        cls.scheme = scheme
+        cls.cost = {name: dict(params) for name, params in cls.cost.items()}
+        cls.cost[scheme].update(cost)
+        
+        with cls._executor_lock:
+            # Worker proses menyalin scheme & cost saat dibuat, jadi pool
+            # proses lama juga dibuang setiap kali KDF default berubah
+            restart = pool_workers is not None or use_processes is not None or cls.use_processes
+            if pool_workers is not None:
+                cls.pool_workers = pool_workers
+            if use_processes is not None:
+                cls.use_processes = use_processes
+            if restart and cls._executor:
+                cls._executor.shutdown(wait=False)
+                cls._executor = None
+    
+    @classmethod
+    def executor(cls):
+        """Pool bersama untuk perhitungan KDF (dibuat saat pertama dipakai)"""
+        with cls._executor_lock:
+            if cls._executor is None:
+                if cls.use_processes:
+                    import multiprocessing
+                    from concurrent.futures import ProcessPoolExecutor
+                    # Dengan spawn (Windows/macOS) worker mengimport ulang modul
+                    # ini; tanpa initializer entry baru memakai cost default
+                    cls._executor = ProcessPoolExecutor(
+                        max_workers=cls.pool_workers,
+                        mp_context=multiprocessing.get_context(cls.start_method),
+                        initializer=_init_kdf_worker,
+                        initargs=(cls.scheme, cls.cost)
+                    )
+                else:
+                    # hashlib melepas GIL selama pbkdf2_hmac/scrypt
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=cls.pool_workers, thread_name_prefix='kdf'
+                    )
+            return cls._executor
+    
+    @classmethod
+    def submit(cls, func, *args):
+        """Jalankan fungsi (mis. verify_password_entry) di pool, return Future"""
+        return cls.executor().submit(func, *args)
     
     @staticmethod
     def generate_salt(length=32):
@@ -12,7 +130,7 @@ class PasswordEncryption:
     
     @staticmethod
     def hash_password(password, salt=None):
-        """Hash password dengan salt"""
+        """Hash password dengan salt (SHA-256 lama, gunakan create_password_entry)"""
         if salt is None:
             salt = PasswordEncryption.generate_salt()
         
@@ -27,26 +145,79 @@ class PasswordEncryption:
     
     @staticmethod
     def verify_password(password, stored_hash, salt):
-        """Verify password dengan hash tersimpan"""
+        """Verify password dengan hash SHA-256 lama"""
         hash_obj = hashlib.sha256((password + salt).encode('utf-8'))
         password_hash = hash_obj.hexdigest()
         
-        return password_hash == stored_hash
+        return hmac.compare_digest(password_hash, stored_hash)
     
     @staticmethod
-    def create_password_entry(password):
-        """Buat entry password lengkap (hash + salt)"""
-        password_hash, salt = PasswordEncryption.hash_password(password)
-        return f"{password_hash}${salt}"
+    def create_password_entry(password, scheme=None, **cost):
+        """Buat entry password lengkap dengan KDF (scheme$cost$salt$hash)"""
+        scheme = scheme or PasswordEncryption.scheme
+        kdf, cost_names = KDF_SCHEMES[scheme]
+        params = dict(PasswordEncryption.cost[scheme], **cost)
+        values = [int(params[name]) for name in cost_names]
+        
+        salt = PasswordEncryption.generate_salt(16)
+        password_hash = kdf(password, salt, *values)
+        return '$'.join([scheme, *map(str, values), salt, password_hash])
     
     @staticmethod
     def parse_password_entry(entry):
-        """Parse entry password menjadi hash dan salt"""
+        """Parse entry password lama (hash$salt) menjadi hash dan salt"""
         parts = entry.split('$')
         if len(parts) == 2:
             return parts[0], parts[1]
         return None, None
     
+    @staticmethod
+    def _parse_kdf_entry(entry):
+        """Parse entry KDF menjadi (scheme, cost, salt, hash) atau None"""
+        parts = entry.split('$')
+        spec = KDF_SCHEMES.get(parts[0])
+        if not spec or len(parts) != len(spec[1]) + 3:
+            return None
+        try:
+            values = [int(value) for value in parts[1:-2]]
+        except ValueError:
+            return None
+        return parts[0], values, parts[-2], parts[-1]
+    
+    @staticmethod
+    def verify_password_entry(password, entry):
+        """Verify password terhadap entry tersimpan (format KDF atau lama)"""
+        if not entry:
+            return False
+        
+        parsed = PasswordEncryption._parse_kdf_entry(entry)
+        if parsed:
+            scheme, values, salt, stored_hash = parsed
+            password_hash = KDF_SCHEMES[scheme][0](password, salt, *values)
+            return hmac.compare_digest(password_hash, stored_hash)
+        
+        stored_hash, salt = PasswordEncryption.parse_password_entry(entry)
+        if stored_hash is None:
+            return False
+        return PasswordEncryption.verify_password(password, stored_hash, salt)
+    
+    @staticmethod
+    def needs_rehash(entry):
+        """
+        Cek apakah entry memakai hash lama, scheme lain, atau salah satu
+        parameter cost di bawah setting sekarang. Entry yang lebih kuat dari
+        setting tidak di-downgrade saat login.
+        """
+        parsed = PasswordEncryption._parse_kdf_entry(entry or '')
+        if not parsed:
+            return True
+        
+        scheme, values, _, _ = parsed
+        if scheme != PasswordEncryption.scheme:
+            return True
+        cost = PasswordEncryption.cost[scheme]
+        return any(value < int(cost[name]) for value, name in zip(values, KDF_SCHEMES[scheme][1]))
+    
     @staticmethod
     def validate_password_strength(password):
         """Validasi kekuatan password"""
@@ -62,19 +233,57 @@ class PasswordEncryption:
         
         return True, "Password valid"
 
+def _init_kdf_worker(scheme, cost):
+    """Initializer worker ProcessPoolExecutor: pakai KDF default proses induk"""
+    PasswordEncryption.scheme = scheme
+    PasswordEncryption.cost = cost
+
 class DataEncryption:
-    """Simple encryption untuk data sensitif"""
+    """Simple encryption untuk data sensitif
+
+    XOR dilakukan per blok (int.from_bytes, atau NumPy jika terpasang),
+    bukan per byte di loop Python. Untuk file besar gunakan xor_file /
+    xor_stream yang membaca per chunk.
+    """
+    
+    CHUNK_SIZE = 1024 * 1024
     
     @staticmethod
-    def xor_encrypt(data, key):
-        """XOR encryption sederhana"""
-        encrypted = bytearray()
-        key_bytes = key.encode('utf-8')
+    def _keystream(key_bytes, length, offset=0):
+        """Key yang diulang sepanjang length, dimulai dari posisi offset"""
         key_length = len(key_bytes)
+        start = offset % key_length
+        rotated = key_bytes[start:] + key_bytes[:start]
+        return (rotated * (length // key_length + 1))[:length]
+    
+    @staticmethod
+    def xor_bytes(data, key_bytes, offset=0):
+        """
+        XOR data dengan key berulang.
+        :param offset: Posisi data dalam stream (agar chunk lanjutan memakai
+            byte key yang benar).
+        """
+        if not data:
+            return b''
+        if not key_bytes:
+            raise ValueError("Key tidak boleh kosong")
         
-        for i, byte in enumerate(data.encode('utf-8')):
-            encrypted.append(byte ^ key_bytes[i % key_length])
+        stream = DataEncryption._keystream(key_bytes, len(data), offset)
+        numpy = _load_numpy()
+        if numpy:
+            return numpy.bitwise_xor(
+                numpy.frombuffer(data, dtype=numpy.uint8),
+                numpy.frombuffer(stream, dtype=numpy.uint8)
+            ).tobytes()
         
+        # Satu XOR integer besar (diproses di C) untuk seluruh blok
+        value = int.from_bytes(data, 'little') ^ int.from_bytes(stream, 'little')
+        return value.to_bytes(len(data), 'little')
+    
+    @staticmethod
+    def xor_encrypt(data, key):
+        """XOR encryption sederhana"""
+        encrypted = DataEncryption.xor_bytes(data.encode('utf-8'), key.encode('utf-8'))
         return base64.b64encode(encrypted).decode('utf-8')
     
     @staticmethod
@@ -82,13 +291,36 @@ class DataEncryption:
         """XOR decryption"""
         try:
             encrypted = base64.b64decode(encrypted_data.encode('utf-8'))
-            decrypted = bytearray()
-            key_bytes = key.encode('utf-8')
-            key_length = len(key_bytes)
-            
-            for i, byte in enumerate(encrypted):
-                decrypted.append(byte ^ key_bytes[i % key_length])
-            
-            return decrypted.decode('utf-8')
-        except:
-            return None
\ No newline at end of file
+            return DataEncryption.xor_bytes(encrypted, key.encode('utf-8')).decode('utf-8')
+        except (ValueError, UnicodeDecodeError, TypeError, AttributeError, binascii.Error):
+            # Input rusak/bukan string: caller mengharapkan None, bukan exception
+            return None
+    
+    @staticmethod
+    def xor_chunks(chunks, key):
+        """Generator XOR untuk iterable chunk bytes (enkripsi = dekripsi)"""
+        key_bytes = key.encode('utf-8') if isinstance(key, str) else key
+        offset = 0
+        for chunk in chunks:
+            yield DataEncryption.xor_bytes(chunk, key_bytes, offset)
+            offset += len(chunk)
+    
+    @staticmethod
+    def xor_stream(source, destination, key, chunk_size=None):
+        """
+        XOR dari file object source ke destination per chunk.
+        :return: Jumlah byte yang diproses.
+        """
+        chunk_size = chunk_size or DataEncryption.CHUNK_SIZE
+        chunks = iter(lambda: source.read(chunk_size), b'')
+        total = 0
+        for block in DataEncryption.xor_chunks(chunks, key):
+            destination.write(block)
+            total += len(block)
+        return total
+    
+    @staticmethod
+    def xor_file(source_path, destination_path, key, chunk_size=None):
+        """Enkripsi/dekripsi file tanpa memuat seluruh isi ke memori"""
+        with open(source_path, 'rb') as source, open(destination_path, 'wb') as destination:
+            return DataEncryption.xor_stream(source, destination, key, chunk_size)
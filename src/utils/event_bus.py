@@ -0,0 +1,96 @@
+import threading
+
+# Jenis event perubahan data yang dipublikasikan Library
+BOOK_ADDED = 'book_added'
+BOOK_UPDATED = 'book_updated'
+BOOK_DELETED = 'book_deleted'
+STOCK_CHANGED = 'stock_changed'
+TRANSACTION_ADDED = 'transaction_added'
+TRANSACTION_PROCESSED = 'transaction_processed'
+USER_ADDED = 'user_added'
+RELOADED = 'reloaded'       # Satu domain berubah tanpa detail per baris (key = nama domain)
+
+# Jenis event -> domain data (Library.data_version) yang ikut berubah
+EVENT_DOMAINS = {
+    BOOK_ADDED: ('books',),
+    BOOK_UPDATED: ('books',),
+    BOOK_DELETED: ('books',),
+    STOCK_CHANGED: ('books', 'history'),
+    TRANSACTION_ADDED: ('transactions',),
+    TRANSACTION_PROCESSED: ('transactions',),
+    USER_ADDED: ('users',),
+}
+
+class ChangeEvent:
+    """Satu perubahan data: jenis, key baris, objek terbaru & selisih stock"""
+
+    __slots__ = ('kind', 'key', 'item', 'delta', 'domains')
+
+    def __init__(self, kind, key, item=None, delta=0):
+        """
+        :param kind: Salah satu konstanta jenis event (BOOK_ADDED, ...).
+        :param key: books_id / transaction_id / user_id, atau nama domain untuk RELOADED.
+        :param item: Objek setelah perubahan (Book, Transaction, User);
+            untuk BOOK_DELETED objek sebelum dihapus.
+        :param delta: Perubahan stock buku (event buku), 0 jika tidak ada.
+        """
+        self.kind = kind
+        self.key = key
+        self.item = item
+        self.delta = delta
+        self.domains = EVENT_DOMAINS.get(kind) or (key,)
+
+    def __repr__(self):
+        return f"ChangeEvent({self.kind}, {self.key!r}, delta={self.delta})"
+
+class EventBus:
+    """
+    Event bus in-process sederhana (publish/subscribe).
+    Callback dipanggil di thread yang mempublikasikan event; subscriber GUI
+    memberikan dispatch untuk memindahkan callback ke thread Tk.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}      # token -> (kinds, callback, dispatch)
+        self._next_token = 1
+
+    def subscribe(self, callback, kinds=None, dispatch=None):
+        """
+        Daftarkan callback(event).
+        :param kinds: Iterable jenis event yang diminati (None = semua).
+        :param dispatch: Fungsi dispatch(callback, event) opsional, mis. untuk
+            menjadwalkan callback di event loop GUI.
+        :return: Token untuk unsubscribe.
+        """
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            self._subscribers[token] = (frozenset(kinds) if kinds else None, callback, dispatch)
+        return token
+
+    def unsubscribe(self, token):
+        """Hapus subscriber (aman dipanggil lebih dari sekali)"""
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def publish(self, event):
+        """Kirim event ke semua subscriber yang berminat"""
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+
+        for kinds, callback, dispatch in subscribers:
+            if kinds is not None and event.kind not in kinds:
+                continue
+            try:
+                if dispatch:
+                    dispatch(callback, event)
+                else:
+                    callback(event)
+            except Exception as e:
+                # Subscriber yang gagal tidak boleh menggagalkan write di Library
+                print(f"Error subscriber event {event.kind}: {e}")
+
+    def __len__(self):
+        with self._lock:
+            return len(self._subscribers)
@@ -1,6 +1,166 @@
+import csv
+import gzip
+import hashlib
+import io
 import json
+import mmap
 import os
+import shutil
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import islice
+
+# Format snapshot kolumnar (little endian):
+#   header 64 byte: magic, versi, jumlah tabel, sha256 fingerprint sumber,
+#                   panjang body, crc32 body
+#   body: direktori tabel/kolom, lalu data kolom (rata 8 byte)
+#     kolom 'i': int64 per baris (NULL = INT_NULL)
+#     kolom 's': offset uint64 (baris + 1), bitmap NULL, heap string UTF-8
+SNAPSHOT_MAGIC = b'PSNP'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct('<4sHH32sQI')
+SNAPSHOT_HEADER_SIZE = 64
+INT_NULL = -2 ** 63
+
+def _align8(size):
+    return (size + 7) & ~7
+
+def _fingerprint_digest(fingerprint):
+    return hashlib.sha256(str(fingerprint).encode('utf-8')).digest()
+
+class _StringColumnBuilder:
+    """Kumpulkan nilai string kolom ke heap + offset"""
+
+    def __init__(self):
+        self.offsets = array('Q', [0])
+        self.nulls = bytearray()
+        self.heap = bytearray()
+        self.count = 0
+
+    def append(self, value):
+        if self.count % 8 == 0:
+            self.nulls.append(0)
+        if value is None:
+            self.nulls[-1] |= 1 << (self.count % 8)
+        else:
+            self.heap += str(value).encode('utf-8')
+        self.offsets.append(len(self.heap))
+        self.count += 1
+
+    def parts(self):
+        return [self.offsets.tobytes(), bytes(self.nulls), bytes(self.heap)]
+
+class _IntColumnBuilder:
+    """Kumpulkan nilai integer kolom ke array int64"""
+
+    def __init__(self):
+        self.values = array('q')
+
+    def append(self, value):
+        self.values.append(INT_NULL if value is None else int(value))
+
+    def parts(self):
+        values = self.values
+        if sys.byteorder != 'little':
+            values = array('q', values)
+            values.byteswap()
+        return [values.tobytes()]
+
+class Snapshot:
+    """Snapshot kolumnar yang di-mmap (read only)
+
+    Kolom integer dibaca langsung dari mmap sebagai memoryview int64,
+    string di-decode per nilai saat diakses.
+    """
+
+    def __init__(self, path, file, mm, tables):
+        self.path = path
+        self._file = file
+        self._mm = mm
+        self._view = memoryview(mm)
+        self._views = []
+        self.tables = tables        # nama -> (jumlah_baris, {kolom: (tipe, offset...)}, urutan kolom)
+
+    def row_count(self, table):
+        """Jumlah baris tabel"""
+        return self.tables[table][0]
+
+    def columns(self, table):
+        """Urutan kolom tabel"""
+        return self.tables[table][2]
+
+    def int_column(self, table, column):
+        """memoryview int64 kolom integer (zero-copy, NULL = INT_NULL)"""
+        rows, columns, _ = self.tables[table]
+        kind, start = columns[column][:2]
+        if kind != 'i':
+            raise ValueError(f"Kolom {table}.{column} bukan integer")
+        raw = self._view[start:start + rows * 8]
+        if sys.byteorder != 'little':
+            values = array('q', raw.tobytes())
+            values.byteswap()
+            return values
+        view = raw.cast('q')
+        self._views.append(view)
+        return view
+
+    def _string_getter(self, rows, start, nulls_start, heap_start):
+        view = self._view
+        offsets = view[start:start + (rows + 1) * 8].cast('Q')
+        self._views.append(offsets)
+        if sys.byteorder != 'little':
+            offsets = array('Q', offsets.tobytes())
+            offsets.byteswap()
+
+        def get(i):
+            if view[nulls_start + (i >> 3)] & (1 << (i & 7)):
+                return None
+            return str(view[heap_start + offsets[i]:heap_start + offsets[i + 1]], 'utf-8')
+        return get
+
+    def string_column(self, table, column):
+        """Generator nilai kolom string"""
+        rows, columns, _ = self.tables[table]
+        kind, *positions = columns[column]
+        if kind != 's':
+            raise ValueError(f"Kolom {table}.{column} bukan string")
+        get = self._string_getter(rows, *positions)
+        return (get(i) for i in range(rows))
+
+    def rows(self, table, columns=None):
+        """Generator baris tuple (urutan kolom = columns atau urutan snapshot)"""
+        rows, spec, order = self.tables[table]
+        getters = []
+        for name in columns or order:
+            kind, *positions = spec[name]
+            if kind == 'i':
+                values = self.int_column(table, name)
+                getters.append(lambda i, values=values: None if values[i] == INT_NULL else values[i])
+            else:
+                getters.append(self._string_getter(rows, *positions))
+
+        for i in range(rows):
+            yield tuple(get(i) for get in getters)
+
+    def close(self):
+        """Lepas view dan tutup mmap"""
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._view.release()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
 class FileHandler:
     """Handler untuk persistensi data ke file JSON"""
@@ -14,16 +174,67 @@ class FileHandler:
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
     
-    def save_json(self, filename, data):
-        """Simpan data ke file JSON"""
+    @contextmanager
+    def _atomic_open(self, filename, mode='w', buffering=-1):
+        """
+        Tulis ke file sementara di folder yang sama lalu os.replace ke tujuan,
+        sehingga pembaca tidak pernah melihat file setengah tertulis.
+        """
         filepath = os.path.join(self.data_dir, filename)
+        fd, temp_path = tempfile.mkstemp(dir=self.data_dir, prefix=f".{filename}.", suffix='.tmp')
+        try:
+            encoding = None if 'b' in mode else 'utf-8'
+            with os.fdopen(fd, mode, buffering, encoding=encoding, newline='' if encoding else None) as f:
+                yield f
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, filepath)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def save_json(self, filename, data, indent=2):
+        """Simpan data ke file JSON (atomic: temp file + rename)"""
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with self._atomic_open(filename) as f:
+                json.dump(data, f, indent=indent, ensure_ascii=False, default=str)
             return True, f"Data berhasil disimpan ke {filename}"
         except Exception as e:
             return False, f"Gagal menyimpan data: {str(e)}"
     
+    def save_jsonl(self, filename, records):
+        """
+        Simpan records ke file JSON Lines (satu objek per baris, atomic).
+        records boleh generator sehingga memori tetap konstan.
+        """
+        count = 0
+        try:
+            with self._atomic_open(filename) as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False, default=str))
+                    f.write('\n')
+                    count += 1
+            return True, f"{count} data berhasil disimpan ke {filename}"
+        except Exception as e:
+            return False, f"Gagal menyimpan data: {str(e)}"
+    
+    def iter_jsonl(self, filename):
+        """Generator pembaca file JSON Lines (baris rusak dilewati)"""
+        filepath = os.path.join(self.data_dir, filename)
+        if not os.path.exists(filepath):
+            return
+        
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"Error loading {filename} baris {line_number}: {str(e)}")
+    
     def load_json(self, filename, default=None):
         """Load data dari file JSON"""
         filepath = os.path.join(self.data_dir, filename)
@@ -61,9 +272,8 @@ class FileHandler:
         backup_filepath = os.path.join(self.data_dir, backup_filename)
         
         try:
-            data = self.load_json(filename)
-            with open(backup_filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Salin byte apa adanya (os.sendfile di Linux), tanpa parse ulang
+            shutil.copyfile(filepath, backup_filepath)
             return True, f"Backup berhasil: {backup_filename}"
         except Exception as e:
             return False, f"Gagal membuat backup: {str(e)}"
@@ -92,7 +302,6 @@ class FileHandler:
     
     def export_to_csv(self, filename, data, headers):
         """Export data ke CSV"""
-        import csv
         filepath = os.path.join(self.data_dir, filename)
         
         try:
@@ -102,4 +311,186 @@ class FileHandler:
                 writer.writerows(data)
             return True, f"Data berhasil diexport ke {filename}"
         except Exception as e:
-            return False, f"Gagal export data: {str(e)}"
\ No newline at end of file
+            return False, f"Gagal export data: {str(e)}"
+    
+    def export_rows_csv(self, filename, rows, headers, compress=False, progress=None,
+                        batch_size=10000, buffer_size=1024 * 1024):
+        """
+        Export baris (tuple/list) ke CSV secara streaming, memori tetap kecil.
+        :param rows: Iterable baris, mis. DatabaseConnector.stream_query(row_factory=tuple).
+        :param compress: True untuk gzip (ekstensi .gz ditambahkan otomatis).
+        :param progress: Callback(jumlah_baris) dipanggil setiap batch_size baris.
+        :param buffer_size: Ukuran buffer file tujuan.
+        """
+        if compress and not filename.endswith('.gz'):
+            filename += '.gz'
+        
+        count = 0
+        try:
+            with self._atomic_open(filename, 'wb', buffering=buffer_size) as raw:
+                binary = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6) if compress else raw
+                text = io.TextIOWrapper(binary, encoding='utf-8', newline='')
+                writer = csv.writer(text)
+                writer.writerow(headers)
+                
+                rows = iter(rows)
+                while True:
+                    batch = list(islice(rows, batch_size))
+                    if not batch:
+                        break
+                    writer.writerows(batch)
+                    count += len(batch)
+                    if progress:
+                        progress(count)
+                
+                # Lepas wrapper tanpa menutup file mentah (ditutup _atomic_open)
+                text.flush()
+                text.detach()
+                if compress:
+                    binary.close()
+            return True, f"{count} baris berhasil diexport ke {filename}"
+        except Exception as e:
+            return False, f"Gagal export data: {str(e)}"
+    
+    # ==================== SNAPSHOT ====================
+    
+    def save_snapshot(self, filename, tables, fingerprint=''):
+        """
+        Tulis snapshot kolumnar biner (atomic).
+        :param tables: Dict nama_tabel -> (kolom, tipe, rows); tipe berisi
+            'i' (integer) atau 's' (string) per kolom, rows iterable tuple.
+        :param fingerprint: Penanda state sumber (mis. count/max id dari DB)
+            untuk mendeteksi snapshot basi saat load.
+        """
+        built = []
+        for name, (columns, types, rows) in tables.items():
+            builders = [_IntColumnBuilder() if kind == 'i' else _StringColumnBuilder() for kind in types]
+            count = 0
+            for row in rows:
+                for builder, value in zip(builders, row):
+                    builder.append(value)
+                count += 1
+            built.append((name, columns, types, count, [builder.parts() for builder in builders]))
+        
+        # Ukuran direktori tetap, jadi offset data bisa dihitung lebih dulu
+        directory_size = 0
+        for name, columns, _, _, _ in built:
+            directory_size += 2 + len(name.encode('utf-8')) + 10
+            for column in columns:
+                directory_size += 2 + len(column.encode('utf-8')) + 1 + 24
+        
+        directory = bytearray()
+        data_parts = []
+        position = _align8(directory_size)
+        for name, columns, types, count, parts in built:
+            encoded = name.encode('utf-8')
+            directory += struct.pack('<H', len(encoded)) + encoded + struct.pack('<QH', count, len(columns))
+            for column, kind, column_parts in zip(columns, types, parts):
+                offsets = []
+                for part in column_parts:
+                    offsets.append(position)
+                    data_parts.append((position, part))
+                    position = _align8(position + len(part))
+                offsets += [0] * (3 - len(offsets))
+                encoded = column.encode('utf-8')
+                directory += struct.pack('<H', len(encoded)) + encoded + kind.encode('ascii')
+                directory += struct.pack('<QQQ', *offsets)
+        body_length = position
+        
+        try:
+            with self._atomic_open(filename, 'wb') as f:
+                f.write(b'\0' * SNAPSHOT_HEADER_SIZE)
+                crc = 0
+                written = 0
+                for start, chunk in [(0, bytes(directory))] + data_parts:
+                    padding = b'\0' * (start - written)
+                    for piece in (padding, chunk):
+                        f.write(piece)
+                        crc = zlib.crc32(piece, crc)
+                    written = start + len(chunk)
+                padding = b'\0' * (body_length - written)
+                f.write(padding)
+                crc = zlib.crc32(padding, crc)
+                
+                f.seek(0)
+                f.write(SNAPSHOT_HEADER.pack(
+                    SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(built),
+                    _fingerprint_digest(fingerprint), body_length, crc
+                ))
+            rows = sum(item[3] for item in built)
+            return True, f"Snapshot {filename} disimpan ({rows} baris, {body_length} byte)"
+        except Exception as e:
+            return False, f"Gagal menyimpan snapshot: {str(e)}"
+    
+    def load_snapshot(self, filename, fingerprint=None):
+        """
+        Buka snapshot dengan mmap.
+        :param fingerprint: Jika diberikan, snapshot dengan fingerprint
+            berbeda dianggap basi.
+        :return: Snapshot, atau None jika tidak ada/rusak/basi/beda versi.
+        """
+        filepath = os.path.join(self.data_dir, filename)
+        if not os.path.exists(filepath):
+            return None
+        
+        f = open(filepath, 'rb')
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            f.close()
+            print(f"Snapshot {filename} kosong")
+            return None
+        
+        try:
+            reason = None
+            if len(mm) < SNAPSHOT_HEADER_SIZE:
+                reason = "terpotong"
+            else:
+                magic, version, table_count, digest, body_length, crc = SNAPSHOT_HEADER.unpack_from(mm, 0)
+                if magic != SNAPSHOT_MAGIC:
+                    reason = "bukan file snapshot"
+                elif version != SNAPSHOT_VERSION:
+                    reason = f"versi {version} tidak didukung"
+                elif fingerprint is not None and digest != _fingerprint_digest(fingerprint):
+                    reason = "basi (data sumber berubah)"
+                elif len(mm) != SNAPSHOT_HEADER_SIZE + body_length:
+                    reason = "terpotong"
+                else:
+                    with memoryview(mm)[SNAPSHOT_HEADER_SIZE:] as body:
+                        if zlib.crc32(body) != crc:
+                            reason = "checksum tidak cocok"
+            if reason:
+                print(f"Snapshot {filename} diabaikan: {reason}")
+                mm.close()
+                f.close()
+                return None
+            
+            tables = {}
+            position = SNAPSHOT_HEADER_SIZE
+            base = SNAPSHOT_HEADER_SIZE
+            for _ in range(table_count):
+                (length,) = struct.unpack_from('<H', mm, position)
+                name = mm[position + 2:position + 2 + length].decode('utf-8')
+                rows, column_count = struct.unpack_from('<QH', mm, position + 2 + length)
+                position += 2 + length + 10
+                
+                columns = {}
+                order = []
+                for _ in range(column_count):
+                    (length,) = struct.unpack_from('<H', mm, position)
+                    column = mm[position + 2:position + 2 + length].decode('utf-8')
+                    kind = chr(mm[position + 2 + length])
+                    offsets = struct.unpack_from('<QQQ', mm, position + 3 + length)
+                    position += 3 + length + 24
+                    
+                    positions = [base + offset for offset in offsets[:1 if kind == 'i' else 3]]
+                    columns[column] = (kind, *positions)
+                    order.append(column)
+                tables[name] = (rows, columns, tuple(order))
+            
+            return Snapshot(filepath, f, mm, tables)
+        except (struct.error, UnicodeDecodeError) as e:
+            print(f"Snapshot {filename} diabaikan: {e}")
+            mm.close()
+            f.close()
+            return None
@@ -0,0 +1,211 @@
+import re
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+
+class LatencyHistogram:
+    """Histogram latency gaya HDR (bucket log-linear, presisi relatif tetap)
+
+    Nilai dicatat dalam mikrodetik. Setiap rentang pangkat dua dibagi
+    SUB_BUCKETS bucket linear, sehingga error relatif percentile
+    maksimal ~1/SUB_BUCKETS berapa pun besarnya nilai.
+    """
+
+    SUB_BITS = 5
+    SUB_BUCKETS = 1 << SUB_BITS
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def bucket_index(cls, value):
+        """Index bucket untuk nilai (integer >= 0)"""
+        if value < cls.SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - cls.SUB_BITS - 1
+        return ((shift + 1) << cls.SUB_BITS) + ((value >> shift) - cls.SUB_BUCKETS)
+
+    @classmethod
+    def bucket_upper(cls, index):
+        """Batas atas (inklusif) bucket"""
+        if index < cls.SUB_BUCKETS:
+            return index
+        shift = (index >> cls.SUB_BITS) - 1
+        sub = (index & (cls.SUB_BUCKETS - 1)) + cls.SUB_BUCKETS
+        return ((sub + 1) << shift) - 1
+
+    def record(self, value):
+        """Catat satu nilai (mikrodetik)"""
+        value = max(0, int(value))
+        index = self.bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        """Nilai pada percentile tertentu (batas atas bucket, dibatasi max)"""
+        if not self.count:
+            return 0
+        target = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self.bucket_upper(index), self.max)
+        return self.max
+
+    def to_dict(self):
+        """Ringkasan + bucket tidak kosong (batas_atas_us -> jumlah)"""
+        return {
+            'count': self.count,
+            'min_us': self.min or 0,
+            'mean_us': self.total / self.count if self.count else 0,
+            'p50_us': self.percentile(50),
+            'p90_us': self.percentile(90),
+            'p99_us': self.percentile(99),
+            'max_us': self.max or 0,
+            'buckets': {str(self.bucket_upper(i)): self.counts[i] for i in sorted(self.counts)},
+        }
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+@lru_cache(maxsize=1024)
+def normalize_query(query):
+    """Samakan query yang hanya beda literal/whitespace (untuk agregasi)"""
+    query = _STRING_LITERAL.sub('?', query)
+    query = _NUMBER.sub('?', query)
+    query = _IN_LIST.sub('IN (...)', query)
+    return _WHITESPACE.sub(' ', query).strip()
+
+class QueryStats:
+    """Statistik query per teks ter-normalisasi + slow query log
+
+    Dipakai DatabaseConnector untuk setiap execute_query/stream_query.
+    Query yang melewati slow_query_ms dicatat bersama method Library
+    pemanggilnya, sehingga pola N+1 (satu method, ratusan query kecil)
+    terlihat dari jumlah call per method.
+    """
+
+    # Modul yang dianggap "pemanggil" untuk slow query log
+    CALLER_MODULES = ('models.library', 'library')
+
+    def __init__(self, slow_query_ms=100, slow_log_size=200, track_callers=False, enabled=True):
+        """
+        :param slow_query_ms: Ambang slow query log (milidetik).
+        :param track_callers: True untuk mencatat method pemanggil di setiap
+            query (bukan hanya yang lambat); lebih mahal, untuk berburu N+1.
+        """
+        self.slow_query_ms = slow_query_ms
+        self.track_callers = track_callers
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._local = threading.local()   # Total per thread untuk utils.tracing
+        self.queries = {}       # normalized -> {'calls', 'rows', 'errors', 'histogram', 'callers'}
+        self.slow_log = deque(maxlen=slow_log_size)
+
+    def reset(self):
+        """Kosongkan semua statistik"""
+        with self._lock:
+            self.queries = {}
+            self.slow_log.clear()
+
+    @classmethod
+    def find_caller(cls, depth=2):
+        """
+        Cari method Library terluar di call stack.
+        :return: (method, rantai method dalam -> luar), atau (None, []).
+        """
+        frame = sys._getframe(depth)
+        chain = []
+        while frame is not None:
+            if frame.f_globals.get('__name__') in cls.CALLER_MODULES:
+                code = frame.f_code
+                chain.append(getattr(code, 'co_qualname', code.co_name))
+            frame = frame.f_back
+        return (chain[-1] if chain else None), chain
+
+    def thread_totals(self):
+        """(jumlah query, total detik) thread ini sejak dibuat, untuk selisih per call"""
+        local = self._local
+        return getattr(local, 'queries', 0), getattr(local, 'seconds', 0.0)
+
+    def record(self, query, seconds, rows=0, error=False):
+        """Catat satu eksekusi query"""
+        local = self._local
+        local.queries = getattr(local, 'queries', 0) + 1
+        local.seconds = getattr(local, 'seconds', 0.0) + seconds
+        if not self.enabled:
+            return
+        normalized = normalize_query(query)
+        micros = seconds * 1_000_000
+
+        caller = None
+        slow = seconds * 1000 >= self.slow_query_ms
+        if slow or self.track_callers:
+            caller, chain = self.find_caller()
+        if slow:
+            self.slow_log.append({
+                'query': normalized,
+                'ms': round(seconds * 1000, 3),
+                'rows': rows,
+                'caller': caller,
+                'chain': chain,
+                'at': datetime.now().isoformat(timespec='seconds'),
+            })
+            print(f"[slow query] {seconds * 1000:.1f} ms {caller or '-'}: {normalized}")
+
+        with self._lock:
+            entry = self.queries.get(normalized)
+            if entry is None:
+                entry = self.queries[normalized] = {
+                    'calls': 0, 'rows': 0, 'errors': 0,
+                    'histogram': LatencyHistogram(), 'callers': {}
+                }
+            entry['calls'] += 1
+            entry['rows'] += rows or 0
+            entry['errors'] += 1 if error else 0
+            entry['histogram'].record(micros)
+            if caller:
+                entry['callers'][caller] = entry['callers'].get(caller, 0) + 1
+
+    def to_dict(self):
+        """Statistik siap di-serialize JSON, urut total waktu terbesar"""
+        with self._lock:
+            queries = []
+            for normalized, entry in self.queries.items():
+                histogram = entry['histogram']
+                queries.append({
+                    'query': normalized,
+                    'calls': entry['calls'],
+                    'rows': entry['rows'],
+                    'errors': entry['errors'],
+                    'total_ms': round(histogram.total / 1000, 3),
+                    'latency': histogram.to_dict(),
+                    'callers': dict(entry['callers']),
+                })
+            slow_log = list(self.slow_log)
+
+        queries.sort(key=lambda item: item['total_ms'], reverse=True)
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'slow_query_ms': self.slow_query_ms,
+            'queries': queries,
+            'slow_queries': slow_log,
+        }
+
+    def export_json(self, file_handler, filename='query_stats.json'):
+        """Simpan statistik lewat FileHandler (atomic)"""
+        return file_handler.save_json(filename, self.to_dict())
@@ -0,0 +1,176 @@
+import io
+import sys
+import threading
+import time
+from functools import wraps
+
+from utils.query_stats import LatencyHistogram
+
+class Tracer:
+    """Tracing per method yang bisa dinyalakan/dimatikan saat runtime
+
+    Per method dicatat wall time, waktu & jumlah query database (dari
+    QueryStats.thread_totals) dan selisih blok memori yang dialokasikan.
+    Angka bersifat inklusif: method yang memanggil method ter-trace lain
+    ikut menghitung waktu & query method tersebut.
+    """
+
+    CAPTURE_MODES = ('cprofile', 'tracemalloc')
+
+    def __init__(self, stats=None, enabled=False):
+        """
+        :param stats: QueryStats connector (sumber waktu & jumlah query DB).
+        :param enabled: Aktifkan tracing sejak awal.
+        """
+        self.stats = stats
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._armed = {}        # method -> mode capture untuk call berikutnya
+        self.methods = {}       # method -> agregat
+        self.captures = {}      # method -> laporan capture terakhir
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Kosongkan agregat & hasil capture"""
+        with self._lock:
+            self.methods = {}
+            self.captures = {}
+
+    def capture_next(self, method, mode='cprofile'):
+        """Profil call berikutnya dari method dengan cProfile atau tracemalloc"""
+        if mode not in self.CAPTURE_MODES:
+            raise ValueError(f"Mode capture tidak dikenal: {mode}")
+        with self._lock:
+            self._armed[method] = mode
+
+    def _db_totals(self):
+        return self.stats.thread_totals() if self.stats else (0, 0.0)
+
+    def call(self, name, func, *args, **kwargs):
+        """Jalankan func dan catat metriknya di bawah nama name"""
+        mode = self._armed.pop(name, None) if self._armed else None
+        if mode:
+            result, report = self.profile(func, *args, mode=mode, **kwargs)
+            with self._lock:
+                self.captures[name] = {'mode': mode, 'report': report,
+                                       'at': time.strftime('%H:%M:%S')}
+            return result
+
+        queries, db_seconds = self._db_totals()
+        blocks = sys.getallocatedblocks()
+        error = False
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            error = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            allocated = sys.getallocatedblocks() - blocks
+            end_queries, end_db_seconds = self._db_totals()
+            self._record(name, elapsed, end_db_seconds - db_seconds, end_queries - queries, allocated, error)
+
+    def _record(self, name, seconds, db_seconds, queries, allocated, error):
+        with self._lock:
+            entry = self.methods.get(name)
+            if entry is None:
+                entry = self.methods[name] = {
+                    'calls': 0, 'errors': 0, 'db_seconds': 0.0, 'queries': 0,
+                    'allocated': 0, 'histogram': LatencyHistogram()
+                }
+            entry['calls'] += 1
+            entry['errors'] += 1 if error else 0
+            entry['db_seconds'] += db_seconds
+            entry['queries'] += queries
+            entry['allocated'] += allocated
+            entry['histogram'].record(seconds * 1_000_000)
+
+    @staticmethod
+    def profile(func, *args, mode='cprofile', limit=25, **kwargs):
+        """
+        Jalankan satu call di bawah cProfile atau tracemalloc.
+        :return: (hasil func, laporan teks)
+        """
+        # Modul profiling diimport saat dipakai (tidak membebani startup)
+        if mode == 'cprofile':
+            import cProfile
+            import pstats
+            profiler = cProfile.Profile()
+            result = profiler.runcall(func, *args, **kwargs)
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(limit)
+            return result, output.getvalue()
+
+        if mode == 'tracemalloc':
+            import tracemalloc
+            already_tracing = tracemalloc.is_tracing()
+            if not already_tracing:
+                tracemalloc.start(10)
+            try:
+                before = tracemalloc.take_snapshot()
+                result = func(*args, **kwargs)
+                after = tracemalloc.take_snapshot()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                if not already_tracing:
+                    tracemalloc.stop()
+            lines = [f"Peak traced: {peak / 1024:.1f} KiB", ""]
+            lines += [str(stat) for stat in after.compare_to(before, 'lineno')[:limit]]
+            return result, "\n".join(lines)
+
+        raise ValueError(f"Mode capture tidak dikenal: {mode}")
+
+    def snapshot(self):
+        """Agregat per method (urut total waktu terbesar), untuk panel debug/JSON"""
+        with self._lock:
+            items = list(self.methods.items())
+        rows = []
+        for name, entry in items:
+            histogram = entry['histogram']
+            calls = entry['calls']
+            rows.append({
+                'method': name,
+                'calls': calls,
+                'errors': entry['errors'],
+                'total_ms': histogram.total / 1000,
+                'avg_ms': histogram.total / 1000 / calls,
+                'p95_ms': histogram.percentile(95) / 1000,
+                'max_ms': (histogram.max or 0) / 1000,
+                'db_ms': entry['db_seconds'] * 1000,
+                'queries_per_call': entry['queries'] / calls,
+                'allocated_per_call': entry['allocated'] / calls,
+            })
+        rows.sort(key=lambda row: row['total_ms'], reverse=True)
+        return rows
+
+def traced(method):
+    """Decorator method instance: dicatat oleh self.tracer jika aktif"""
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        tracer = self.tracer
+        if not tracer.enabled:
+            return method(self, *args, **kwargs)
+        return tracer.call(name, method, self, *args, **kwargs)
+
+    wrapper.__traced__ = True
+    return wrapper
+
+def trace_public_methods(exclude=()):
+    """Class decorator: bungkus semua method publik (tanpa awalan _) dengan traced"""
+    def decorate(cls):
+        for name, value in list(vars(cls).items()):
+            if name.startswith('_') or name in exclude or not callable(value):
+                continue
+            if isinstance(value, (staticmethod, classmethod)) or getattr(value, '__traced__', False):
+                continue
+            setattr(cls, name, traced(value))
+        return cls
+    return decorate